@@ -4,9 +4,13 @@ This module provides dependency injection functions for FastAPI endpoints.
 These dependencies are used to access core services like search, databases, and connectors.
 """
 
+import logging
+from dataclasses import dataclass
 from functools import lru_cache
 from typing import Annotated, Any
 
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.cosmos.aio import CosmosClient
 from azure.identity.aio import DefaultAzureCredential
 from azure.search.documents import SearchClient
@@ -25,6 +29,22 @@ from .services.resource_service import ResourceService
 from .services.terraform_service import TerraformService
 from .services.git_service import GitService
 
+logger = logging.getLogger(__name__)
+
+# Cosmos DB region names for the supported deployment regions
+_COSMOS_REGION_NAMES = {
+    "canadaeast": "Canada East",
+    "canadacentral": "Canada Central",
+}
+
+# Connection pool for the shared Cosmos DB client. aiohttp's defaults
+# (100 connections, 15s keep-alive) let idle connections drop between bursts
+# of tool calls, so the next request pays for a new TCP/TLS handshake.
+COSMOS_POOL_LIMIT = 200
+COSMOS_POOL_LIMIT_PER_HOST = 100
+COSMOS_KEEPALIVE_SECONDS = 120
+COSMOS_DNS_CACHE_SECONDS = 300
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -61,6 +81,10 @@ class Settings(BaseSettings):
     cosmos_db_container: str = Field(
         default="documents", description="Cosmos DB container name"
     )
+    cosmos_db_partition_key_path: str | None = Field(
+        default=None,
+        description="Partition key path of the documents container (e.g. /doc_type)",
+    )
     cosmos_db_gremlin_endpoint: str = Field(
         ..., description="Cosmos DB Gremlin endpoint URL (documents.azure.com format)"
     )
@@ -145,10 +169,18 @@ async def init_services(settings: Settings) -> None:
     # Initialize Azure credential
     credential = DefaultAzureCredential()
 
-    # Initialize Cosmos DB client
+    # Initialize Cosmos DB client, preferring the deployment region so the
+    # SDK routes requests there without probing other locations first
+    cosmos_options: dict[str, Any] = {}
+    if settings.azure_region in _COSMOS_REGION_NAMES:
+        cosmos_options["preferred_locations"] = [_COSMOS_REGION_NAMES[settings.azure_region]]
+    cosmos_session = _create_cosmos_session()
+    _services["cosmos_session"] = cosmos_session
     cosmos_client = CosmosClient(
         url=settings.cosmos_db_endpoint,
         credential=credential,
+        transport=AioHttpTransport(session=cosmos_session, session_owner=False),
+        **cosmos_options,
     )
     _services["cosmos_client"] = cosmos_client
 
@@ -196,6 +228,7 @@ async def init_services(settings: Settings) -> None:
         container_name=settings.cosmos_db_container,
         arg_connector=arg_connector,
         graph_builder=graph_builder,
+        partition_key_path=settings.cosmos_db_partition_key_path,
     )
     _services["resource_service"] = resource_service
 
@@ -204,6 +237,7 @@ async def init_services(settings: Settings) -> None:
         cosmos_client=cosmos_client,
         database_name=settings.cosmos_db_database,
         container_name=settings.cosmos_db_container,
+        partition_key_path=settings.cosmos_db_partition_key_path,
     )
     _services["terraform_service"] = terraform_service
 
@@ -212,9 +246,12 @@ async def init_services(settings: Settings) -> None:
         cosmos_client=cosmos_client,
         database_name=settings.cosmos_db_database,
         container_name=settings.cosmos_db_container,
+        partition_key_path=settings.cosmos_db_partition_key_path,
     )
     _services["git_service"] = git_service
 
+    await _prewarm_cosmos(cosmos_client, settings)
+
     # Initialize Application Insights (if configured)
     if settings.applicationinsights_connection_string:
         from .middleware.app_insights import init_app_insights
@@ -249,6 +286,37 @@ async def init_services(settings: Settings) -> None:
     _services["conversation_manager"] = conversation_manager
 
 
+def _create_cosmos_session() -> aiohttp.ClientSession:
+    """Create the HTTP session used by the Cosmos DB client.
+
+    The session outlives individual requests and is closed by
+    cleanup_services after the Cosmos DB client.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=COSMOS_POOL_LIMIT,
+        limit_per_host=COSMOS_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=COSMOS_KEEPALIVE_SECONDS,
+        ttl_dns_cache=COSMOS_DNS_CACHE_SECONDS,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _prewarm_cosmos(cosmos_client: CosmosClient, settings: Settings) -> None:
+    """Open the Cosmos DB connection before the first request needs it.
+
+    The first call through a new client pays for the AAD token fetch, account
+    metadata lookup and TCP/TLS handshake. Reading the documents container's
+    properties at startup moves that cost out of the first tool call.
+    """
+    try:
+        database = cosmos_client.get_database_client(settings.cosmos_db_database)
+        container = database.get_container_client(settings.cosmos_db_container)
+        await container.read()
+    except Exception as e:
+        # Not fatal: the first request will establish the connection instead
+        logger.warning("Cosmos DB prewarm failed: %s", e)
+
+
 async def cleanup_services() -> None:
     """Cleanup application services.
 
@@ -258,6 +326,10 @@ async def cleanup_services() -> None:
     if "memory_store" in _services:
         await _services["memory_store"].close()
 
+    # Close the shared Resource Graph session
+    if "resource_service" in _services:
+        await _services["resource_service"].close()
+
     # Close orchestration engine
     if "orchestration_engine" in _services:
         await _services["orchestration_engine"].close()
@@ -274,10 +346,13 @@ async def cleanup_services() -> None:
     if "graph_builder" in _services:
         _services["graph_builder"].close()
 
-    # Close Cosmos DB client
+    # Close Cosmos DB client, then the HTTP session it was given
     if "cosmos_client" in _services:
         await _services["cosmos_client"].close()
 
+    if "cosmos_session" in _services:
+        await _services["cosmos_session"].close()
+
     # Clear services
     _services.clear()
 
@@ -385,3 +460,31 @@ ConversationManagerDep = Annotated[ConversationManager, Depends(get_conversation
 OrchestrationEngineDep = Annotated[OrchestrationEngine, Depends(get_orchestration_engine)]
 MemoryStoreDep = Annotated[MemoryStore, Depends(get_memory_store)]
 SettingsDep = Annotated[Settings, Depends(get_settings)]
+
+
+@dataclass(slots=True)
+class Services:
+    """Bundle of the services used by tool execution."""
+
+    search_engine: HybridSearchEngine
+    resource_service: ResourceService
+    terraform_service: TerraformService
+    git_service: GitService
+
+
+def get_services(
+    search_engine: SearchEngineDep,
+    resource_service: ResourceServiceDep,
+    terraform_service: TerraformServiceDep,
+    git_service: GitServiceDep,
+) -> Services:
+    """Get the services bundle for tool execution."""
+    return Services(
+        search_engine=search_engine,
+        resource_service=resource_service,
+        terraform_service=terraform_service,
+        git_service=git_service,
+    )
+
+
+ServicesDep = Annotated[Services, Depends(get_services)]
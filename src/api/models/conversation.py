@@ -49,6 +49,13 @@ class MessageRequest(BaseModel):
         default=True,
         description="Whether to stream the response",
     )
+    conversation: CreateConversationRequest | None = Field(
+        default=None,
+        description=(
+            "Create the conversation under the requested ID if it does not exist yet, "
+            "saving a separate POST /conversations round-trip"
+        ),
+    )
 
 
 class ToolCallInfo(BaseModel):
@@ -23,6 +23,12 @@ class SearchRequest(BaseModel):
     )
     top: int = Field(default=10, ge=1, le=100, description="Maximum number of results to return")
     include_facets: bool = Field(default=False, description="Include facet counts in response")
+    snippet_length: int | None = Field(
+        default=None,
+        ge=1,
+        le=100_000,
+        description="Truncate each result's content to this many characters (followed by '...')",
+    )
 
 
 class SearchResult(BaseModel):
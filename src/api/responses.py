@@ -0,0 +1,99 @@
+"""Shared HTTP response helpers for API routers.
+
+Provides conditional GET support: responses carry a strong ETag derived
+from the serialized body, and requests whose If-None-Match matches get a
+bodyless 304 Not Modified.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+DEFAULT_CACHE_CONTROL = "private, max-age=30"
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute a strong ETag for a response body.
+
+    Args:
+        body: Serialized response body
+
+    Returns:
+        Quoted ETag value
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an If-None-Match header matches an ETag.
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current ETag (quoted)
+
+    Returns:
+        True if the client's cached representation is still current
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # Weak comparison is sufficient for GET revalidation
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: str | None = None,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response:
+    """Build a JSON response honoring If-None-Match.
+
+    Args:
+        request: Incoming request
+        body: Serialized JSON body
+        etag: Precomputed ETag (computed from body if omitted)
+        cache_control: Cache-Control header value
+
+    Returns:
+        304 response if the client's ETag matches, otherwise a 200 with the body
+    """
+    if etag is None:
+        etag = compute_etag(body)
+
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def model_response(
+    request: Request,
+    model: BaseModel,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response:
+    """Serialize a model and return it as a conditional JSON response.
+
+    Args:
+        request: Incoming request
+        model: Response model to serialize
+        cache_control: Cache-Control header value
+
+    Returns:
+        304 or 200 response with ETag and Cache-Control headers
+    """
+    return conditional_response(
+        request, model.model_dump_json().encode(), cache_control=cache_control
+    )
@@ -35,6 +35,22 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
 
+def _build_user_context(
+    user: dict[str, Any], metadata: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Build the user context a new conversation is initialized with."""
+    user_context: dict[str, Any] = {
+        "user_id": user.get("sub") or user.get("oid") or "anonymous",
+        "user_name": user.get("name") or user.get("preferred_username"),
+    }
+
+    # Add any metadata from request
+    if metadata:
+        user_context.update(metadata)
+
+    return user_context
+
+
 @router.post("", response_model=ConversationResponse, status_code=201)
 async def create_conversation(
     request: CreateConversationRequest | None = None,
@@ -51,15 +67,7 @@ async def create_conversation(
     Returns the conversation ID which should be used for subsequent
     message requests.
     """
-    # Build user context
-    user_context: dict[str, Any] = {
-        "user_id": user.get("sub") or user.get("oid") or "anonymous",
-        "user_name": user.get("name") or user.get("preferred_username"),
-    }
-
-    # Add any metadata from request
-    if request and request.metadata:
-        user_context.update(request.metadata)
+    user_context = _build_user_context(user, request.metadata if request else None)
 
     logger.info(f"Creating conversation for user {user_context.get('user_id')}")
 
@@ -251,6 +259,10 @@ async def send_message(
     By default, responses are streamed using Server-Sent Events (SSE).
     Set `stream=false` to receive the complete response at once.
 
+    Clients that generate their own conversation IDs can include a
+    `conversation` object to create the conversation with this first
+    message instead of calling `POST /conversations` beforehand.
+
     **Streaming Response Format:**
 
     The response is a stream of SSE events:
@@ -265,6 +277,16 @@ async def send_message(
     if not conversation:
         conversation = await manager.load_conversation(conversation_id)
 
+    if not conversation and request.conversation is not None:
+        user_context = _build_user_context(user, request.conversation.metadata)
+        logger.info(
+            f"Creating conversation {conversation_id} for user {user_context.get('user_id')}"
+        )
+        conversation = manager.create_conversation(
+            user_context=user_context,
+            conversation_id=conversation_id,
+        )
+
     if not conversation:
         raise HTTPException(
             status_code=404,
@@ -1,8 +1,11 @@
 """Resources API router."""
 
+import json
 import logging
+from collections.abc import AsyncIterator
 from urllib.parse import unquote
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from src.api.dependencies import get_resource_service, get_graph_builder
 from src.api.models.resources import (
@@ -12,20 +15,93 @@ from src.api.models.resources import (
     ResourceGraphQueryRequest,
     ResourceGraphQueryResponse,
 )
+from src.api.responses import model_response
 from src.api.services.resource_service import ResourceService
 from src.indexing.graph_builder import GraphBuilder
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/resources", tags=["resources"])
+# Routes are split across two routers so that the greedy /{resource_id:path}
+# route is always registered after every specific route. Otherwise the greedy
+# route would match everything and specific routes would never be reached.
+# Both are combined into `router` at the bottom of this module.
+specific_router = APIRouter(prefix="/resources", tags=["resources"])
+greedy_router = APIRouter(prefix="/resources", tags=["resources"])
 
 
-# IMPORTANT: Specific routes must come BEFORE the greedy /{resource_id:path} route
-# Otherwise the greedy route will match everything and specific routes will never be reached
+@specific_router.get("", response_model=AzureResource)
+async def get_resource_by_id(
+    request: Request,
+    resource_id: str = Query(..., alias="id", description="Full Azure resource ID"),
+    resource_service: ResourceService = Depends(get_resource_service),
+):
+    """
+    Get full details for an Azure resource, passing the ID as a query parameter.
+
+    Equivalent to `GET /resources/{resource_id}`, but avoids the greedy path
+    matcher and the URL-decoding step for the ID.
+
+    **Example:**
+    ```
+    GET /resources?id=/subscriptions/xxx/resourceGroups/yyy/providers/Microsoft.Compute/virtualMachines/zzz
+    ```
+    """
+    logger.info("Fetching resource: %s", resource_id)
+    return await _resource_response(request, resource_id, resource_service)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def _stream_resource_graph_rows(
+    request: ResourceGraphQueryRequest,
+    resource_service: ResourceService,
+) -> StreamingResponse:
+    """Stream Resource Graph query rows as newline-delimited JSON.
+
+    The first row is fetched before the response starts, so a query that
+    fails outright still gets a 500 status rather than a truncated 200. A
+    failure after that ends the stream with an `{"error": "..."}` line.
+
+    Args:
+        request: Validated query request
+        resource_service: Resource service
+
+    Returns:
+        Streaming NDJSON response
+    """
+    rows = resource_service.stream_resource_graph_query(
+        query=request.query,
+        subscriptions=request.subscriptions,
+    )
+    try:
+        first = await anext(rows, None)
+    except Exception as e:
+        logger.error("Resource Graph query failed: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Query execution failed: {str(e)}",
+        ) from e
+
+    async def generate() -> AsyncIterator[bytes]:
+        if first is None:
+            return
+        yield json.dumps(first, default=str).encode() + b"\n"
+        try:
+            async for row in rows:
+                yield json.dumps(row, default=str).encode() + b"\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in a trailing line
+            logger.error("Resource Graph query failed mid-stream: %s", e, exc_info=True)
+            yield json.dumps({"error": f"Query execution failed: {e}"}).encode() + b"\n"
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
 
-@router.post("/resource-graph/query", response_model=ResourceGraphQueryResponse)
+@specific_router.post("/resource-graph/query", response_model=ResourceGraphQueryResponse)
 async def resource_graph_query(
     request: ResourceGraphQueryRequest,
+    http_request: Request,
     resource_service: ResourceService = Depends(get_resource_service),
 ):
     """
@@ -49,8 +125,12 @@ async def resource_graph_query(
     - Custom resource queries not covered by other endpoints
     - Complex filtering and aggregations
     - Cross-subscription queries
+
+    **Streaming:**
+    Send `Accept: application/x-ndjson` to receive one JSON row per line as
+    results arrive, with no result cap, instead of a single capped JSON body.
     """
-    logger.info(f"Executing Resource Graph query (length={len(request.query)})")
+    logger.info("Executing Resource Graph query (length=%s)", len(request.query))
 
     # Validate query to prevent injection attacks
     if _is_query_unsafe(request.query):
@@ -60,6 +140,9 @@ async def resource_graph_query(
             "Avoid using semicolons (;) or SQL-style comments (--)",
         )
 
+    if NDJSON_MEDIA_TYPE in http_request.headers.get("accept", ""):
+        return await _stream_resource_graph_rows(request, resource_service)
+
     try:
         # Execute the query
         results = await resource_service.execute_resource_graph_query(
@@ -73,14 +156,14 @@ async def resource_graph_query(
         )
 
     except Exception as e:
-        logger.error(f"Resource Graph query failed: {e}", exc_info=True)
+        logger.error("Resource Graph query failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Query execution failed: {str(e)}",
         )
 
 
-@router.get("/{resource_id:path}/terraform", response_model=list[TerraformLink])
+@specific_router.get("/{resource_id:path}/terraform", response_model=list[TerraformLink])
 async def get_terraform_for_resource(
     resource_id: str,
     resource_service: ResourceService = Depends(get_resource_service),
@@ -96,8 +179,8 @@ async def get_terraform_for_resource(
     - "What Terraform code created this VM?"
     - "Show me the IaC definition for this resource"
     """
-    decoded_id = unquote(resource_id)
-    logger.info(f"Finding Terraform code for resource: {decoded_id}")
+    decoded_id = _decode_resource_id(resource_id)
+    logger.info("Finding Terraform code for resource: %s", decoded_id)
 
     try:
         # Query graph database for Terraform links (synchronous call)
@@ -105,34 +188,39 @@ async def get_terraform_for_resource(
 
         result: list[TerraformLink] = []
         for link in terraform_links:
-            # Fetch full Terraform resource details
-            tf_resource = await resource_service.get_terraform_resource(link.get("address", ""))
-            if tf_resource:
-                # Re-create the model to ensure proper serialization
+            # The graph projection carries the full link; only vertices indexed
+            # before source code was stored on them need a Cosmos DB lookup
+            if link.get("source_code"):
                 result.append(
                     TerraformLink(
-                        address=tf_resource.address,
-                        type=tf_resource.type,
-                        file_path=tf_resource.file_path,
-                        line_number=tf_resource.line_number,
-                        repo_url=tf_resource.repo_url,
-                        branch=tf_resource.branch,
-                        source_code=tf_resource.source_code,
+                        address=link.get("address", ""),
+                        type=link.get("type", ""),
+                        file_path=link.get("file_path", ""),
+                        line_number=link.get("line_number", 0),
+                        repo_url=link.get("repo_url", ""),
+                        branch=link.get("branch", "main"),
+                        source_code=link["source_code"],
                     )
                 )
+                continue
+
+            # get_terraform_resource already returns a TerraformLink
+            tf_resource = await resource_service.get_terraform_resource(link.get("address", ""))
+            if tf_resource:
+                result.append(tf_resource)
 
-        logger.info(f"Found {len(result)} Terraform resources for {decoded_id}")
+        logger.info("Found %s Terraform resources for %s", len(result), decoded_id)
         return result
 
     except Exception as e:
-        logger.error(f"Failed to fetch Terraform links: {e}", exc_info=True)
+        logger.error("Failed to fetch Terraform links: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to fetch Terraform links. Please try again later.",
         )
 
 
-@router.get("/{resource_id:path}/dependencies", response_model=list[ResourceDependency])
+@specific_router.get("/{resource_id:path}/dependencies", response_model=list[ResourceDependency])
 async def get_resource_dependencies(
     resource_id: str,
     direction: str = Query(default="both", pattern="^(in|out|both)$"),
@@ -154,40 +242,44 @@ async def get_resource_dependencies(
     - "Show me all dependencies for this VM"
     - "What will be affected if I delete this resource?"
     """
-    decoded_id = unquote(resource_id)
-    logger.info(f"Finding dependencies for resource: {decoded_id} (direction={direction}, depth={depth})")
+    decoded_id = _decode_resource_id(resource_id)
+    logger.info(
+        "Finding dependencies for resource: %s (direction=%s, depth=%s)",
+        decoded_id,
+        direction,
+        depth,
+    )
 
     try:
         # Query graph database for dependencies (synchronous call)
         dependencies = graph_builder.find_dependencies(decoded_id, direction, depth)
 
-        result = []
-        for dep in dependencies:
-            result.append(
-                ResourceDependency(
-                    id=dep.get("id", ""),
-                    name=dep.get("name", ""),
-                    type=dep.get("type", ""),
-                    relationship=dep.get("relationship", "related"),
-                    direction="upstream" if dep.get("direction") == "in" else "downstream",
-                )
+        result = [
+            ResourceDependency(
+                id=dep.get("id", ""),
+                name=dep.get("name", ""),
+                type=dep.get("type", ""),
+                relationship=dep.get("relationship", "related"),
+                direction="upstream" if dep.get("direction") == "in" else "downstream",
             )
+            for dep in dependencies
+        ]
 
-        logger.info(f"Found {len(result)} dependencies for {decoded_id}")
+        logger.info("Found %s dependencies for %s", len(result), decoded_id)
         return result
 
     except Exception as e:
-        logger.error(f"Failed to fetch dependencies: {e}", exc_info=True)
+        logger.error("Failed to fetch dependencies: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to fetch dependencies. Please try again later.",
         )
 
 
-# Greedy path route - MUST BE LAST to avoid matching specific routes above
-@router.get("/{resource_id:path}", response_model=AzureResource)
+@greedy_router.get("/{resource_id:path}", response_model=AzureResource)
 async def get_resource(
     resource_id: str,
+    request: Request,
     resource_service: ResourceService = Depends(get_resource_service),
 ):
     """
@@ -201,16 +293,55 @@ async def get_resource(
     ```
 
     Returns resource details including properties, tags, SKU, and location.
+    Responses carry an `ETag`; send it back as `If-None-Match` to get a
+    `304 Not Modified` when the resource is unchanged.
     """
-    decoded_id = unquote(resource_id)
-    logger.info(f"Fetching resource: {decoded_id}")
+    decoded_id = _decode_resource_id(resource_id)
+    logger.info("Fetching resource: %s", decoded_id)
+    return await _resource_response(request, decoded_id, resource_service)
+
 
-    resource = await resource_service.get_resource(decoded_id)
+async def _resource_response(
+    request: Request,
+    resource_id: str,
+    resource_service: ResourceService,
+):
+    """Fetch a resource and build its conditional response.
+
+    Args:
+        request: Incoming request
+        resource_id: Decoded Azure resource ID
+        resource_service: Resource service instance
+
+    Returns:
+        Response with ETag headers
+
+    Raises:
+        HTTPException: 404 if the resource does not exist
+    """
+    resource = await resource_service.get_resource(resource_id)
 
     if not resource:
-        raise HTTPException(status_code=404, detail=f"Resource not found: {decoded_id}")
+        raise HTTPException(status_code=404, detail=f"Resource not found: {resource_id}")
+
+    return model_response(request, resource)
 
-    return resource
+
+def _decode_resource_id(resource_id: str) -> str:
+    """URL-decode a resource ID path parameter.
+
+    Most Azure resource IDs contain no percent-escapes, so skip unquote()
+    (which re-encodes the string) unless there is something to decode.
+
+    Args:
+        resource_id: Resource ID as received in the request path
+
+    Returns:
+        Decoded resource ID
+    """
+    if "%" not in resource_id:
+        return resource_id
+    return unquote(resource_id)
 
 
 def _is_query_unsafe(query: str) -> bool:
@@ -234,3 +365,10 @@ def _is_query_unsafe(query: str) -> bool:
     # but KQL is generally safer than SQL
 
     return False
+
+
+# include_router copies routes as they are at call time, so this must follow
+# every route definition above
+router = APIRouter()
+router.include_router(specific_router)
+router.include_router(greedy_router)
@@ -1,21 +1,63 @@
 """Search API router."""
 
 import logging
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
 from src.api.dependencies import get_search_engine
 from src.api.models.search import (
     SearchRequest,
-    SearchResult,
     SearchResponse,
     GraphExpandRequest,
 )
 from src.search.hybrid_search import HybridSearchEngine
+from src.search.models import HybridSearchResults, SearchResult as SearchEngineResult
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Serializers for streaming the SearchResponse body piecewise. The engine's
+# SearchResult dataclass has the same fields as the API SearchResult model.
+_RESULT_ADAPTER = TypeAdapter(SearchEngineResult)
+_FACETS_ADAPTER = TypeAdapter(dict[str, Any] | None)
+
+
+def _stream_search_response(
+    results: HybridSearchResults, snippet_length: int | None = None
+) -> StreamingResponse:
+    """Stream search results as a SearchResponse JSON body.
+
+    Results are serialized one at a time so the full response body is never
+    held in memory, and transfer overlaps with serialization for large `top`.
+
+    Args:
+        results: Results from the search engine
+        snippet_length: Optional maximum content length per result
+
+    Returns:
+        Streaming JSON response
+    """
+
+    async def generate() -> AsyncIterator[bytes]:
+        yield b'{"results":['
+        for i, result in enumerate(results.results):
+            if i:
+                yield b","
+            if snippet_length is not None and len(result.content) > snippet_length:
+                # Results may be shared with the engine's cache; don't mutate them
+                result = replace(result, content=result.content[:snippet_length] + "...")
+            yield _RESULT_ADAPTER.dump_json(result)
+        yield b'],"total_count":%d,"facets":' % results.total_count
+        yield _FACETS_ADAPTER.dump_json(results.facets)
+        yield b"}"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
 
 @router.post("", response_model=SearchResponse)
 async def search(
@@ -40,8 +82,11 @@ async def search(
     """
     try:
         logger.info(
-            f"Search request: query='{request.query}', mode={request.mode}, "
-            f"doc_types={request.doc_types}, top={request.top}"
+            "Search request: query='%s', mode=%s, doc_types=%s, top=%s",
+            request.query,
+            request.mode,
+            request.doc_types,
+            request.top,
         )
 
         results = await search_engine.search(
@@ -53,28 +98,14 @@ async def search(
             include_facets=request.include_facets,
         )
 
-        return SearchResponse(
-            results=[
-                SearchResult(
-                    id=r.id,
-                    score=r.score,
-                    content=r.content,
-                    doc_type=r.doc_type,
-                    metadata=r.metadata,
-                    highlights=r.highlights,
-                )
-                for r in results.results
-            ],
-            total_count=results.total_count,
-            facets=results.facets,
-        )
+        return _stream_search_response(results, request.snippet_length)
     except ValueError as e:
         # Invalid search mode or parameters
-        logger.warning(f"Invalid search request: {e}")
+        logger.warning("Invalid search request: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Unexpected errors
-        logger.error(f"Search failed: {e}", exc_info=True)
+        logger.error("Search failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Search failed. Please try again later.")
 
 
@@ -103,8 +134,10 @@ async def search_with_expansion(
     """
     try:
         logger.info(
-            f"Graph-expanded search request: query='{request.query}', "
-            f"depth={request.expand_depth}, top={request.top}"
+            "Graph-expanded search request: query='%s', depth=%s, top=%s",
+            request.query,
+            request.expand_depth,
+            request.top,
         )
 
         results = await search_engine.search_with_graph_expansion(
@@ -114,23 +147,9 @@ async def search_with_expansion(
             doc_types=request.doc_types,
         )
 
-        return SearchResponse(
-            results=[
-                SearchResult(
-                    id=r.id,
-                    score=r.score,
-                    content=r.content,
-                    doc_type=r.doc_type,
-                    metadata=r.metadata,
-                    highlights=r.highlights,
-                )
-                for r in results.results
-            ],
-            total_count=results.total_count,
-            facets=results.facets,
-        )
+        return _stream_search_response(results)
     except Exception as e:
-        logger.error(f"Graph-expanded search failed: {e}", exc_info=True)
+        logger.error("Graph-expanded search failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Graph-expanded search failed. Please try again later.",
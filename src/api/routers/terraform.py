@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from src.api.dependencies import get_terraform_service
 from src.api.models.terraform import (
@@ -12,6 +12,7 @@ from src.api.models.terraform import (
     PlanAnalysis,
     ParsedPlan,
 )
+from src.api.responses import model_response
 from src.api.services.terraform_service import TerraformService
 
 logger = logging.getLogger(__name__)
@@ -42,7 +43,13 @@ async def list_terraform_resources(
     - "List resources in the compute.tf file"
     - "Find all resources in a specific repository"
     """
-    logger.info(f"Listing Terraform resources: repo_url={repo_url}, type={type}, file_path={file_path}, limit={limit}")
+    logger.info(
+        "Listing Terraform resources: repo_url=%s, type=%s, file_path=%s, limit=%s",
+        repo_url,
+        type,
+        file_path,
+        limit,
+    )
 
     try:
         resources = await terraform_service.list_resources(
@@ -52,11 +59,11 @@ async def list_terraform_resources(
             limit=limit,
         )
 
-        logger.info(f"Found {len(resources)} Terraform resources")
+        logger.info("Found %s Terraform resources", len(resources))
         return resources
 
     except Exception as e:
-        logger.error(f"Failed to list Terraform resources: {e}", exc_info=True)
+        logger.error("Failed to list Terraform resources: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to list Terraform resources. Please try again later.",
@@ -66,6 +73,7 @@ async def list_terraform_resources(
 @router.get("/resources/{address:path}", response_model=TerraformResource)
 async def get_terraform_resource(
     address: str,
+    request: Request,
     repo_url: str = Query(..., description="Repository URL"),
     terraform_service: TerraformService = Depends(get_terraform_service),
 ):
@@ -82,8 +90,10 @@ async def get_terraform_resource(
 
     **Query parameters:**
     - `repo_url`: Required - Git repository URL to scope the search
+
+    Responses carry an `ETag` for conditional requests via `If-None-Match`.
     """
-    logger.info(f"Fetching Terraform resource: {address} from {repo_url}")
+    logger.info("Fetching Terraform resource: %s from %s", address, repo_url)
 
     try:
         resource = await terraform_service.get_resource(address, repo_url)
@@ -94,12 +104,12 @@ async def get_terraform_resource(
                 detail=f"Terraform resource not found: {address} in {repo_url}",
             )
 
-        return resource
+        return model_response(request, resource)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to fetch Terraform resource: {e}", exc_info=True)
+        logger.error("Failed to fetch Terraform resource: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to fetch Terraform resource. Please try again later.",
@@ -127,7 +137,7 @@ async def list_terraform_plans(
     - "What changes are planned for the prod environment?"
     - "Show me all plans from the last week"
     """
-    logger.info(f"Listing Terraform plans: repo_url={repo_url}, since={since}, limit={limit}")
+    logger.info("Listing Terraform plans: repo_url=%s, since=%s, limit=%s", repo_url, since, limit)
 
     try:
         plans = await terraform_service.list_plans(
@@ -136,11 +146,11 @@ async def list_terraform_plans(
             limit=limit,
         )
 
-        logger.info(f"Found {len(plans)} Terraform plans")
+        logger.info("Found %s Terraform plans", len(plans))
         return plans
 
     except Exception as e:
-        logger.error(f"Failed to list Terraform plans: {e}", exc_info=True)
+        logger.error("Failed to list Terraform plans: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to list Terraform plans. Please try again later.",
@@ -150,6 +160,7 @@ async def list_terraform_plans(
 @router.get("/plans/{plan_id}", response_model=TerraformPlan)
 async def get_terraform_plan(
     plan_id: str,
+    request: Request,
     terraform_service: TerraformService = Depends(get_terraform_service),
 ):
     """
@@ -160,8 +171,10 @@ async def get_terraform_plan(
     **Use cases:**
     - "Show me the details of plan XYZ"
     - "What will change in this plan?"
+
+    Responses carry an `ETag` for conditional requests via `If-None-Match`.
     """
-    logger.info(f"Fetching Terraform plan: {plan_id}")
+    logger.info("Fetching Terraform plan: %s", plan_id)
 
     try:
         plan = await terraform_service.get_plan(plan_id)
@@ -169,12 +182,12 @@ async def get_terraform_plan(
         if not plan:
             raise HTTPException(status_code=404, detail=f"Plan not found: {plan_id}")
 
-        return plan
+        return model_response(request, plan)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to fetch Terraform plan: {e}", exc_info=True)
+        logger.error("Failed to fetch Terraform plan: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to fetch Terraform plan. Please try again later.",
@@ -203,23 +216,21 @@ async def analyze_terraform_plan(
     - "Should I be worried about this plan?"
     - "What are the main changes in this plan?"
     """
-    logger.info(f"Analyzing Terraform plan: {plan_id}")
+    logger.info("Analyzing Terraform plan: %s", plan_id)
 
     try:
-        plan = await terraform_service.get_plan(plan_id)
+        _, analysis = await terraform_service.get_and_analyze(plan_id)
 
-        if not plan:
+        if not analysis:
             raise HTTPException(status_code=404, detail=f"Plan not found: {plan_id}")
 
-        analysis = await terraform_service.analyze_plan(plan)
-
-        logger.info(f"Generated analysis for plan {plan_id}: risk_level={analysis.risk_level}")
+        logger.info("Generated analysis for plan %s: risk_level=%s", plan_id, analysis.risk_level)
         return analysis
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to analyze Terraform plan: {e}", exc_info=True)
+        logger.error("Failed to analyze Terraform plan: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to analyze Terraform plan. Please try again later.",
@@ -256,20 +267,23 @@ async def parse_terraform_plan(
     logger.info("Parsing uploaded Terraform plan JSON")
 
     try:
-        # parse_plan is synchronous, not async
-        parsed = terraform_service.parse_plan(plan_json)
+        # Large plans are parsed on the threadpool so they don't block the event loop
+        parsed = await terraform_service.parse_plan_async(plan_json)
 
         logger.info(
-            f"Parsed plan: add={parsed.add}, change={parsed.change}, destroy={parsed.destroy}"
+            "Parsed plan: add=%s, change=%s, destroy=%s",
+            parsed.add,
+            parsed.change,
+            parsed.destroy,
         )
         return parsed
 
     except ValueError as e:
         # Invalid plan JSON
-        logger.warning(f"Invalid Terraform plan JSON: {e}")
+        logger.warning("Invalid Terraform plan JSON: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Failed to parse Terraform plan: {e}", exc_info=True)
+        logger.error("Failed to parse Terraform plan: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Failed to parse Terraform plan. Please try again later.",
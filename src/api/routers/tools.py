@@ -8,27 +8,30 @@ Tools are executed by the LLM orchestration layer to interact with
 Azure infrastructure, Terraform IaC, and Git history.
 """
 
+import asyncio
+import json
 import logging
+from collections.abc import Awaitable, Callable
 from typing import Any
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel, Field
 
-from src.api.dependencies import (
-    get_search_engine,
-    get_resource_service,
-    get_terraform_service,
-    get_git_service,
-)
-from src.api.tools.definitions import TOOL_DEFINITIONS, validate_tool_call
-from src.search.hybrid_search import HybridSearchEngine
-from src.api.services.resource_service import ResourceService
-from src.api.services.terraform_service import TerraformService
-from src.api.services.git_service import GitService
+from src.api.dependencies import Services, get_services
+from src.api.responses import compute_etag, conditional_response
+from src.api.tools.definitions import get_tool_definitions_json, validate_tool_call
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tools", tags=["tools"])
 
+# Tool definitions are static; wrap the pre-serialized array once at import
+_TOOLS_PAYLOAD = b'{"tools":' + get_tool_definitions_json() + b"}"
+_TOOLS_ETAG = compute_etag(_TOOLS_PAYLOAD)
+_TOOLS_CACHE_CONTROL = "public, max-age=3600"
+
+# Maximum number of tool calls accepted by /tools/execute_batch
+MAX_BATCH_SIZE = 20
+
 
 class ToolCallRequest(BaseModel):
     """Request to execute a tool."""
@@ -47,8 +50,27 @@ class ToolCallResponse(BaseModel):
     error: str | None = Field(default=None, description="Error message if execution failed")
 
 
+class ToolBatchRequest(BaseModel):
+    """Request to execute several tools at once."""
+
+    calls: list[ToolCallRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="Tool calls to execute",
+    )
+
+
+class ToolBatchResponse(BaseModel):
+    """Responses from a batch of tool executions."""
+
+    results: list[ToolCallResponse] = Field(
+        ..., description="Tool responses, in the same order as the calls"
+    )
+
+
 @router.get("")
-async def list_tools():
+async def list_tools(request: Request) -> Response:
     """
     List all available tools with their definitions.
 
@@ -58,21 +80,23 @@ async def list_tools():
     **Returns:**
     - `tools`: List of tool definitions with name, description, and parameters
 
+    Responses carry an `ETag`; send it back in `If-None-Match` to get a
+    304 Not Modified while the definitions are unchanged.
+
     **Use cases:**
     - "What tools are available?"
     - "Show me all available functions"
     """
     logger.info("Listing available tools")
-    return {"tools": TOOL_DEFINITIONS}
+    return conditional_response(
+        request, _TOOLS_PAYLOAD, etag=_TOOLS_ETAG, cache_control=_TOOLS_CACHE_CONTROL
+    )
 
 
 @router.post("/execute", response_model=ToolCallResponse)
 async def execute_tool(
     request: ToolCallRequest,
-    search_engine: HybridSearchEngine = Depends(get_search_engine),
-    resource_service: ResourceService = Depends(get_resource_service),
-    terraform_service: TerraformService = Depends(get_terraform_service),
-    git_service: GitService = Depends(get_git_service),
+    services: Services = Depends(get_services),
 ):
     """
     Execute a tool by name with given arguments.
@@ -94,177 +118,427 @@ async def execute_tool(
     - Returns error in response rather than HTTP error
     - Allows LLM to handle errors gracefully
     """
-    logger.info(f"Executing tool: {request.name} with arguments: {request.arguments}")
+    return await _run_tool_call(request, services)
+
+
+@router.post("/execute_batch", response_model=ToolBatchResponse)
+async def execute_tool_batch(
+    request: ToolBatchRequest,
+    services: Services = Depends(get_services),
+):
+    """
+    Execute several tool calls concurrently.
+
+    LLMs often issue multiple tool calls in one turn. This endpoint runs
+    them concurrently in a single HTTP round trip. Identical calls in the
+    batch are executed once and share the result, and bursts of
+    `get_resource_details` or `get_commit_details` calls are coalesced into
+    one Cosmos DB query per group.
+
+    **Request:**
+    - `calls`: List of tool calls (`name`, `arguments`), up to 20
+
+    **Response:**
+    - `results`: One tool response per call, in request order
+
+    **Error Handling:**
+    - Each call succeeds or fails independently, reported in its `error` field
+    """
+    calls = request.calls
+    logger.info(f"Executing batch of {len(calls)} tool calls")
+
+    results: list[ToolCallResponse | None] = [None] * len(calls)
+
+    # Identical calls (same name and arguments) share one execution
+    first_index: dict[tuple[str, str], int] = {}
+    duplicate_of: dict[int, int] = {}
+    for i, call in enumerate(calls):
+        key = (call.name, json.dumps(call.arguments, sort_keys=True, default=str))
+        if key in first_index:
+            duplicate_of[i] = first_index[key]
+        else:
+            first_index[key] = i
+    unique = list(first_index.values())
+
+    # Group valid point lookups that one query can serve
+    groups: dict[str, list[int]] = {}
+    for i in unique:
+        call = calls[i]
+        if call.name in _COALESCERS and validate_tool_call(call.name, call.arguments)[0]:
+            groups.setdefault(call.name, []).append(i)
+    groups = {name: indices for name, indices in groups.items() if len(indices) > 1}
+    coalesced = {i for indices in groups.values() for i in indices}
+
+    async def _run_single(i: int) -> None:
+        results[i] = await _run_tool_call(calls[i], services)
+
+    async def _run_group(name: str, indices: list[int]) -> None:
+        responses = await _COALESCERS[name]([calls[i] for i in indices], services)
+        for i, response in zip(indices, responses, strict=True):
+            results[i] = response
+
+    await asyncio.gather(
+        *(_run_group(name, indices) for name, indices in groups.items()),
+        *(_run_single(i) for i in unique if i not in coalesced),
+    )
+
+    for i, original in duplicate_of.items():
+        results[i] = results[original]
+
+    return ToolBatchResponse(results=results)
+
+
+async def _run_tool_call(call: ToolCallRequest, services: Services) -> ToolCallResponse:
+    """Validate and execute a single tool call, capturing errors in the response.
+
+    Args:
+        call: Tool call to execute
+        services: Services available to tool handlers
+
+    Returns:
+        Tool response with either a result or an error
+    """
+    logger.info(f"Executing tool: {call.name} with arguments: {call.arguments}")
 
     # Validate tool call
-    is_valid, error_msg = validate_tool_call(request.name, request.arguments)
+    is_valid, error_msg = validate_tool_call(call.name, call.arguments)
     if not is_valid:
         logger.warning(f"Invalid tool call: {error_msg}")
-        return ToolCallResponse(name=request.name, result=None, error=error_msg)
+        return ToolCallResponse(name=call.name, result=None, error=error_msg)
 
     try:
-        result = await _execute_tool(
-            name=request.name,
-            arguments=request.arguments,
-            search_engine=search_engine,
-            resource_service=resource_service,
-            terraform_service=terraform_service,
-            git_service=git_service,
-        )
+        result = await _execute_tool(call.name, call.arguments, services)
 
-        logger.info(f"Tool execution successful: {request.name}")
-        return ToolCallResponse(name=request.name, result=result)
+        logger.info(f"Tool execution successful: {call.name}")
+        return ToolCallResponse(name=call.name, result=result)
 
     except ValueError as e:
         # Expected errors (e.g., resource not found)
         logger.warning(f"Tool execution failed with ValueError: {e}")
-        return ToolCallResponse(name=request.name, result=None, error=str(e))
+        return ToolCallResponse(name=call.name, result=None, error=str(e))
 
     except Exception as e:
         # Unexpected errors
         logger.error(f"Tool execution failed with exception: {e}", exc_info=True)
         return ToolCallResponse(
-            name=request.name, result=None, error=f"Tool execution failed: {e}"
+            name=call.name, result=None, error=f"Tool execution failed: {e}"
         )
 
 
 async def _execute_tool(
-    name: str,
-    arguments: dict[str, Any],
-    search_engine: HybridSearchEngine,
-    resource_service: ResourceService,
-    terraform_service: TerraformService,
-    git_service: GitService,
+    name: str, arguments: dict[str, Any], services: Services
 ) -> Any:
     """Execute a tool and return results.
 
     Args:
         name: Tool name
         arguments: Tool arguments
-        search_engine: Search engine instance
-        resource_service: Resource service instance
-        terraform_service: Terraform service instance
-        git_service: Git service instance
+        services: Services available to tool handlers
 
     Returns:
-        Tool execution result
+        Tool execution result. Handlers return Pydantic models as-is; they are
+        serialized straight to JSON bytes through the ToolCallResponse model.
 
     Raises:
         ValueError: If tool execution fails due to invalid input or missing data
         Exception: If tool execution fails unexpectedly
     """
-    if name == "search_infrastructure":
-        results = await search_engine.search(
-            query=arguments["query"],
-            mode="hybrid",
-            doc_types=arguments.get("doc_types"),
-            filters=arguments.get("filters"),
-            top=arguments.get("top", 10),
-        )
-        return {
-            "results": [
-                {
-                    "id": r.id,
-                    "content": r.content[:500],  # Truncate for LLM context
-                    "doc_type": r.doc_type,
-                    "score": r.score,
-                    "metadata": r.metadata,
-                }
-                for r in results.results
-            ],
-            "total_count": results.total_count,
-        }
-
-    elif name == "get_resource_details":
-        resource = await resource_service.get_resource(arguments["resource_id"])
-        if not resource:
-            raise ValueError(f"Resource not found: {arguments['resource_id']}")
-        return resource.model_dump()
-
-    elif name == "get_resource_terraform":
-        terraform_links = await resource_service.get_terraform_for_resource(
-            arguments["resource_id"]
-        )
-        return [t.model_dump() for t in terraform_links]
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments, services)
+
+
+async def _handle_search_infrastructure(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    results = await services.search_engine.search(
+        query=arguments["query"],
+        mode="hybrid",
+        doc_types=arguments.get("doc_types"),
+        filters=arguments.get("filters"),
+        top=arguments.get("top", 10),
+    )
+    return {
+        "results": [
+            {
+                "id": r.id,
+                "content": r.content[:500],  # Truncate for LLM context
+                "doc_type": r.doc_type,
+                "score": r.score,
+                "metadata": r.metadata,
+            }
+            for r in results.results
+        ],
+        "total_count": results.total_count,
+    }
+
+
+async def _handle_get_resource_details(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    resource = await services.resource_service.get_resource(arguments["resource_id"])
+    if not resource:
+        raise ValueError(f"Resource not found: {arguments['resource_id']}")
+    return resource
+
+
+async def _handle_get_resource_terraform(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    terraform_links = await services.resource_service.get_terraform_for_resource(
+        arguments["resource_id"]
+    )
+    return terraform_links
+
+
+async def _handle_get_resource_dependencies(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    deps = await services.resource_service.get_dependencies(
+        arguments["resource_id"],
+        direction=arguments.get("direction", "both"),
+        depth=arguments.get("depth", 2),
+    )
+    return deps
 
-    elif name == "get_resource_dependencies":
-        deps = await resource_service.get_dependencies(
-            arguments["resource_id"],
-            direction=arguments.get("direction", "both"),
-            depth=arguments.get("depth", 2),
-        )
-        return [d.model_dump() for d in deps]
 
-    elif name == "query_resource_graph":
-        results = await resource_service.execute_resource_graph_query(
-            query=arguments["query"],
-            subscriptions=arguments.get("subscriptions"),
+async def _handle_query_resource_graph(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    results = await services.resource_service.execute_resource_graph_query(
+        query=arguments["query"],
+        subscriptions=arguments.get("subscriptions"),
+    )
+    return {"results": results}
+
+
+async def _handle_list_terraform_resources(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    resources = await services.terraform_service.list_resources(
+        repo_url=arguments.get("repo_url"),
+        resource_type=arguments.get("type"),
+        file_path=arguments.get("file_path"),
+        limit=arguments.get("limit", 50),
+    )
+    return resources
+
+
+async def _handle_get_terraform_resource(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    resource = await services.terraform_service.get_resource(
+        arguments["address"], arguments["repo_url"]
+    )
+    if not resource:
+        raise ValueError(
+            f"Terraform resource not found: {arguments['address']} in {arguments['repo_url']}"
         )
-        return {"results": results}
-
-    elif name == "list_terraform_resources":
-        resources = await terraform_service.list_resources(
-            repo_url=arguments.get("repo_url"),
-            resource_type=arguments.get("type"),
-            file_path=arguments.get("file_path"),
-            limit=arguments.get("limit", 50),
+    return resource
+
+
+async def _handle_get_terraform_plan(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    plan = await services.terraform_service.get_plan(arguments["plan_id"])
+    if not plan:
+        raise ValueError(f"Plan not found: {arguments['plan_id']}")
+    return plan
+
+
+async def _handle_analyze_terraform_plan(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    _, analysis = await services.terraform_service.get_and_analyze(arguments["plan_id"])
+    if not analysis:
+        raise ValueError(f"Plan not found: {arguments['plan_id']}")
+    return analysis
+
+
+async def _handle_get_git_history(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    commits = await services.git_service.list_commits(
+        repo_url=arguments.get("repo_url"),
+        author=arguments.get("author"),
+        since=arguments.get("since"),
+        until=arguments.get("until"),
+        terraform_only=arguments.get("terraform_only", False),
+        limit=arguments.get("limit", 20),
+    )
+    return commits
+
+
+async def _handle_get_commit_details(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    commit = await services.git_service.get_commit(
+        arguments["sha"],
+        arguments["repo_url"],
+    )
+    if not commit:
+        raise ValueError(
+            f"Commit not found: {arguments['sha']} in {arguments['repo_url']}"
         )
-        return [r.model_dump() for r in resources]
+    return commit
+
 
-    elif name == "get_terraform_resource":
-        resource = await terraform_service.get_resource(
-            arguments["address"], arguments["repo_url"]
+async def _handle_list_subscriptions(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    subs = await services.resource_service.list_subscriptions()
+    return {"subscriptions": subs}
+
+
+async def _handle_get_resource_types_summary(
+    arguments: dict[str, Any], services: Services
+) -> Any:
+    summary = await services.resource_service.get_resource_types_summary(
+        subscription_id=arguments.get("subscription_id")
+    )
+    return {"resource_types": summary}
+
+
+ToolHandler = Callable[[dict[str, Any], Services], Awaitable[Any]]
+
+# Tool name -> handler, built once at import time
+_HANDLERS: dict[str, ToolHandler] = {
+    "search_infrastructure": _handle_search_infrastructure,
+    "get_resource_details": _handle_get_resource_details,
+    "get_resource_terraform": _handle_get_resource_terraform,
+    "get_resource_dependencies": _handle_get_resource_dependencies,
+    "query_resource_graph": _handle_query_resource_graph,
+    "list_terraform_resources": _handle_list_terraform_resources,
+    "get_terraform_resource": _handle_get_terraform_resource,
+    "get_terraform_plan": _handle_get_terraform_plan,
+    "analyze_terraform_plan": _handle_analyze_terraform_plan,
+    "get_git_history": _handle_get_git_history,
+    "get_commit_details": _handle_get_commit_details,
+    "list_subscriptions": _handle_list_subscriptions,
+    "get_resource_types_summary": _handle_get_resource_types_summary,
+}
+
+
+async def _coalesce_resource_details(
+    calls: list[ToolCallRequest], services: Services
+) -> list[ToolCallResponse]:
+    """Serve several get_resource_details calls with one query."""
+    resource_ids = [call.arguments["resource_id"] for call in calls]
+
+    try:
+        found = await services.resource_service.get_resources(resource_ids)
+    except Exception as e:
+        logger.error(f"Batched resource lookup failed: {e}", exc_info=True)
+        return [
+            ToolCallResponse(name=call.name, error=f"Tool execution failed: {e}")
+            for call in calls
+        ]
+
+    return [
+        ToolCallResponse(name=call.name, result=found[resource_id])
+        if resource_id in found
+        else ToolCallResponse(name=call.name, error=f"Resource not found: {resource_id}")
+        for call, resource_id in zip(calls, resource_ids, strict=True)
+    ]
+
+
+async def _coalesce_resource_terraform(
+    calls: list[ToolCallRequest], services: Services
+) -> list[ToolCallResponse]:
+    """Serve several get_resource_terraform calls with one batched lookup."""
+    resource_ids = [call.arguments["resource_id"] for call in calls]
+
+    try:
+        found = await services.resource_service.get_terraform_for_resources(resource_ids)
+    except Exception as e:
+        logger.error(f"Batched Terraform lookup failed: {e}", exc_info=True)
+        return [
+            ToolCallResponse(name=call.name, error=f"Tool execution failed: {e}")
+            for call in calls
+        ]
+
+    return [
+        ToolCallResponse(name=call.name, result=found.get(resource_id, []))
+        for call, resource_id in zip(calls, resource_ids, strict=True)
+    ]
+
+
+async def _coalesce_resource_types_summary(
+    calls: list[ToolCallRequest], services: Services
+) -> list[ToolCallResponse]:
+    """Serve several get_resource_types_summary calls with concurrent fetches."""
+    subscription_ids = [call.arguments.get("subscription_id") for call in calls]
+
+    try:
+        summaries = await services.resource_service.get_resource_types_summaries(
+            subscription_ids
         )
-        if not resource:
-            raise ValueError(
-                f"Terraform resource not found: {arguments['address']} in {arguments['repo_url']}"
-            )
-        return resource.model_dump()
-
-    elif name == "get_terraform_plan":
-        plan = await terraform_service.get_plan(arguments["plan_id"])
-        if not plan:
-            raise ValueError(f"Plan not found: {arguments['plan_id']}")
-        return plan.model_dump()
-
-    elif name == "analyze_terraform_plan":
-        plan = await terraform_service.get_plan(arguments["plan_id"])
-        if not plan:
-            raise ValueError(f"Plan not found: {arguments['plan_id']}")
-        analysis = await terraform_service.analyze_plan(plan)
-        return analysis.model_dump()
-
-    elif name == "get_git_history":
-        commits = await git_service.list_commits(
-            repo_url=arguments.get("repo_url"),
-            author=arguments.get("author"),
-            since=arguments.get("since"),
-            until=arguments.get("until"),
-            terraform_only=arguments.get("terraform_only", False),
-            limit=arguments.get("limit", 20),
+    except Exception as e:
+        logger.error(f"Batched resource types summary failed: {e}", exc_info=True)
+        return [
+            ToolCallResponse(name=call.name, error=f"Tool execution failed: {e}")
+            for call in calls
+        ]
+
+    return [
+        ToolCallResponse(
+            name=call.name,
+            result={"resource_types": summaries.get(subscription_id, [])},
         )
-        return [c.model_dump() for c in commits]
+        for call, subscription_id in zip(calls, subscription_ids, strict=True)
+    ]
 
-    elif name == "get_commit_details":
-        commit = await git_service.get_commit(
-            arguments["sha"],
-            arguments["repo_url"],
-        )
-        if not commit:
-            raise ValueError(
-                f"Commit not found: {arguments['sha']} in {arguments['repo_url']}"
-            )
-        return commit.model_dump()
 
-    elif name == "list_subscriptions":
-        subs = await resource_service.list_subscriptions()
-        return {"subscriptions": subs}
+async def _coalesce_commit_details(
+    calls: list[ToolCallRequest], services: Services
+) -> list[ToolCallResponse]:
+    """Serve several get_commit_details calls with one query per repository."""
+    shas_by_repo: dict[str, list[str]] = {}
+    for call in calls:
+        shas_by_repo.setdefault(call.arguments["repo_url"], []).append(call.arguments["sha"])
 
-    elif name == "get_resource_types_summary":
-        summary = await resource_service.get_resource_types_summary(
-            subscription_id=arguments.get("subscription_id")
+    try:
+        lookups = await asyncio.gather(
+            *(
+                services.git_service.get_commits(shas, repo_url)
+                for repo_url, shas in shas_by_repo.items()
+            )
         )
-        return {"resource_types": summary}
-
-    else:
-        raise ValueError(f"Unknown tool: {name}")
+    except Exception as e:
+        logger.error(f"Batched commit lookup failed: {e}", exc_info=True)
+        return [
+            ToolCallResponse(name=call.name, error=f"Tool execution failed: {e}")
+            for call in calls
+        ]
+
+    found = {
+        (repo_url, sha): commit
+        for repo_url, commits in zip(shas_by_repo, lookups, strict=True)
+        for sha, commit in commits.items()
+    }
+
+    responses = []
+    for call in calls:
+        sha, repo_url = call.arguments["sha"], call.arguments["repo_url"]
+        commit = found.get((repo_url, sha))
+        if commit is None:
+            responses.append(
+                ToolCallResponse(name=call.name, error=f"Commit not found: {sha} in {repo_url}")
+            )
+        else:
+            responses.append(ToolCallResponse(name=call.name, result=commit))
+    return responses
+
+
+ToolCoalescer = Callable[
+    [list[ToolCallRequest], Services], Awaitable[list[ToolCallResponse]]
+]
+
+# Tool name -> batch loader for point lookups that can share one query
+_COALESCERS: dict[str, ToolCoalescer] = {
+    "get_resource_details": _coalesce_resource_details,
+    "get_resource_terraform": _coalesce_resource_terraform,
+    "get_commit_details": _coalesce_commit_details,
+    "get_resource_types_summary": _coalesce_resource_types_summary,
+}
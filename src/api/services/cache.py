@@ -0,0 +1,79 @@
+"""In-process caching helpers for API services."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from copy import deepcopy
+from typing import Any
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live.
+
+    Entries are evicted least-recently-used first once `maxsize` is reached,
+    and lazily dropped on access once older than `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, copy: bool = False):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Entry lifetime in seconds
+            copy: Store and return deep copies, so callers never share a
+                mutable value with the cache
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.copy = copy
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Value to return on a miss
+
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return deepcopy(value) if self.copy else value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.copy:
+            value = deepcopy(value)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
@@ -0,0 +1,85 @@
+"""Cosmos DB query helpers shared by API services."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from azure.cosmos.aio import ContainerProxy
+
+
+def partition_query_options(
+    partition_key_path: str | None, known_fields: dict[str, Any]
+) -> dict[str, Any]:
+    """Build query_items options that scope a query to a single partition.
+
+    When the container's partition key is one of the fields the caller is
+    filtering on, the query can target that partition directly instead of
+    fanning out to every physical partition.
+
+    Args:
+        partition_key_path: Container partition key path (e.g. "/doc_type"),
+            or None if unknown
+        known_fields: Document fields whose values the query pins exactly
+
+    Returns:
+        Keyword arguments for ContainerProxy.query_items
+    """
+    if partition_key_path:
+        value = known_fields.get(partition_key_path.lstrip("/"))
+        if value is not None:
+            return {"partition_key": value}
+
+    return {"enable_cross_partition_query": True}
+
+
+def query_documents(
+    container: ContainerProxy,
+    query: str,
+    parameters: list[dict[str, Any]],
+    partition_key_path: str | None,
+    known_fields: dict[str, Any],
+    max_item_count: int | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Run a parameterized query, scoped to one partition when possible.
+
+    Args:
+        container: Container to query
+        query: Parameterized SQL query; keep the text fixed per filter
+            combination so the gateway can reuse its query plan
+        parameters: Query parameters
+        partition_key_path: Container partition key path, or None if unknown
+        known_fields: Document fields whose values the query pins exactly
+        max_item_count: Optional page size hint
+
+    Returns:
+        Async iterator over matching documents
+    """
+    options = partition_query_options(partition_key_path, known_fields)
+    if max_item_count is not None:
+        options["max_item_count"] = max_item_count
+    return container.query_items(query=query, parameters=parameters, **options)
+
+
+async def query_first(
+    container: ContainerProxy,
+    query: str,
+    parameters: list[dict[str, Any]],
+    partition_key_path: str | None,
+    known_fields: dict[str, Any],
+) -> dict[str, Any] | None:
+    """Return the first document matched by a query, or None.
+
+    Args:
+        container: Container to query
+        query: Parameterized SQL query
+        parameters: Query parameters
+        partition_key_path: Container partition key path, or None if unknown
+        known_fields: Document fields whose values the query pins exactly
+
+    Returns:
+        First matching document, or None if nothing matched
+    """
+    async for doc in query_documents(
+        container, query, parameters, partition_key_path, known_fields, max_item_count=1
+    ):
+        return doc
+    return None
@@ -2,33 +2,147 @@
 
 import logging
 from datetime import datetime
+from functools import lru_cache
 from azure.cosmos.aio import CosmosClient
 from azure.cosmos.exceptions import CosmosHttpResponseError
 
 from src.api.models.git import FileChange, GitCommit
+from src.api.services.cosmos import partition_query_options
 
 logger = logging.getLogger(__name__)
 
+# Fields read by _map_to_commit; the large diff field is only fetched by get_diff
+_COMMIT_PROJECTION = ", ".join(
+    f"c.{field}"
+    for field in (
+        "sha",
+        "short_sha",
+        "repo_url",
+        "branch",
+        "message",
+        "author_name",
+        "author_email",
+        "commit_date",
+        "files_changed",
+        "terraform_files",
+        "has_terraform_changes",
+    )
+)
+
+# list_commits filter clauses, indexed by their bit in the filter mask
+_COMMIT_FILTER_CLAUSES = (
+    " AND c.repo_url = @repo_url",
+    " AND (c.author_name = @author OR c.author_email = @author)",
+    " AND c.commit_date >= @since",
+    " AND c.commit_date <= @until",
+    " AND c.has_terraform_changes = true",
+)
+
+
+# Start of each per-file section in a unified diff
+_DIFF_HEADER = "diff --git "
+
+
+def _diff_section_starts(diff: str) -> list[int]:
+    """Find the offset of every per-file header in a unified diff."""
+    starts = [0] if diff.startswith(_DIFF_HEADER) else []
+    needle = "\n" + _DIFF_HEADER
+
+    pos = diff.find(needle)
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = diff.find(needle, pos + 1)
+
+    return starts
+
+
+def _filter_diff(diff: str, file_path: str) -> str:
+    """Extract the sections of a unified diff that touch a file.
+
+    Args:
+        diff: Full unified diff
+        file_path: File path to keep
+
+    Returns:
+        Concatenated matching file sections, or "" if none match
+    """
+    starts = _diff_section_starts(diff)
+    ends = starts[1:] + [len(diff)]
+    sections = []
+
+    for start, end in zip(starts, ends, strict=True):
+        header_end = diff.find("\n", start, end)
+        if header_end == -1:
+            header_end = end
+        # Only the header line names the file; don't match paths in hunk bodies
+        if diff.find(file_path, start, header_end) != -1:
+            sections.append(diff[start:end])
+
+    return "".join(sections)
+
+
+def _commit_key_fields(sha: str, repo_url: str) -> dict[str, str]:
+    """Fields a single-commit lookup pins exactly, for partition scoping."""
+    known_fields = {"doc_type": "git_commit", "repo_url": repo_url}
+    if len(sha) == 40:
+        # Document IDs are "{repo_url}:{sha}" for full SHAs
+        known_fields["id"] = f"{repo_url}:{sha}"
+        known_fields["sha"] = sha
+    return known_fields
+
+
+@lru_cache(maxsize=1 << len(_COMMIT_FILTER_CLAUSES))
+def _build_commits_query(filter_mask: int) -> str:
+    """Build the list_commits SQL for a combination of filters.
+
+    Args:
+        filter_mask: Bitmask of active filters (bit i enables clause i)
+
+    Returns:
+        Parameterized SQL query
+    """
+    clauses = "".join(
+        clause
+        for bit, clause in enumerate(_COMMIT_FILTER_CLAUSES)
+        if filter_mask & (1 << bit)
+    )
+    return (
+        f"SELECT {_COMMIT_PROJECTION} FROM c WHERE c.doc_type = 'git_commit'{clauses} "
+        "ORDER BY c.commit_date DESC"
+    )
+
 
 class GitService:
     """Service for Git commit operations."""
 
-    def __init__(self, cosmos_client: CosmosClient, database_name: str, container_name: str):
+    def __init__(
+        self,
+        cosmos_client: CosmosClient,
+        database_name: str,
+        container_name: str,
+        partition_key_path: str | None = None,
+    ):
         """Initialize Git service.
 
         Args:
             cosmos_client: Azure Cosmos DB async client
             database_name: Database name
             container_name: Container name for documents
+            partition_key_path: Partition key path of the documents container,
+                used to scope single-commit lookups to one partition
         """
         self.cosmos_client = cosmos_client
         self.database_name = database_name
         self.container_name = container_name
+        self.partition_key_path = partition_key_path
+        self._container = None
 
     def _get_container(self):
-        """Get Cosmos DB container."""
-        database = self.cosmos_client.get_database_client(self.database_name)
-        return database.get_container_client(self.container_name)
+        """Get the Cosmos DB container proxy, creating it on first use."""
+        if self._container is None:
+            database = self.cosmos_client.get_database_client(self.database_name)
+            self._container = database.get_container_client(self.container_name)
+        return self._container
 
     async def list_commits(
         self,
@@ -55,48 +169,43 @@ class GitService:
         try:
             container = self._get_container()
 
-            # Build query
-            query = "SELECT * FROM c WHERE c.doc_type = 'git_commit'"
+            # Query text depends only on which filters are set; bind values per call
+            filter_mask = (
+                bool(repo_url)
+                | bool(author) << 1
+                | bool(since) << 2
+                | bool(until) << 3
+                | bool(terraform_only) << 4
+            )
+            query = _build_commits_query(filter_mask)
             params = []
 
             if repo_url:
-                query += " AND c.repo_url = @repo_url"
                 params.append({"name": "@repo_url", "value": repo_url})
 
             if author:
-                query += " AND (c.author_name = @author OR c.author_email = @author)"
                 params.append({"name": "@author", "value": author})
 
             if since:
-                query += " AND c.commit_date >= @since"
                 params.append({"name": "@since", "value": since.isoformat()})
 
             if until:
-                query += " AND c.commit_date <= @until"
                 params.append({"name": "@until", "value": until.isoformat()})
 
-            if terraform_only:
-                query += " AND c.has_terraform_changes = true"
-
-            query += " ORDER BY c.commit_date DESC"
-
-            # Execute query with async iteration
-            items = []
-            count = 0
+            # Map rows as they stream in and stop once the limit is reached
+            commits = []
             async for item in container.query_items(
                 query=query,
                 parameters=params,
-                enable_cross_partition_query=True,
+                max_item_count=limit,
+                **partition_query_options(
+                    self.partition_key_path,
+                    {"doc_type": "git_commit", "repo_url": repo_url},
+                ),
             ):
-                items.append(item)
-                count += 1
-                if count >= limit:
-                    break
-
-            # Map to GitCommit models
-            commits = []
-            for item in items:
                 commits.append(self._map_to_commit(item))
+                if len(commits) >= limit:
+                    break
 
             return commits
 
@@ -118,8 +227,8 @@ class GitService:
             container = self._get_container()
 
             # Query by SHA (support both full and short SHA)
-            query = """
-                SELECT * FROM c
+            query = f"""
+                SELECT {_COMMIT_PROJECTION} FROM c
                 WHERE c.doc_type = 'git_commit'
                 AND c.repo_url = @repo_url
                 AND (c.sha = @sha OR c.short_sha = @sha)
@@ -130,23 +239,72 @@ class GitService:
                 {"name": "@sha", "value": sha},
             ]
 
-            items = []
+            known_fields = _commit_key_fields(sha, repo_url)
+
             async for item in container.query_items(
                 query=query,
                 parameters=params,
-                enable_cross_partition_query=True,
+                max_item_count=1,
+                **partition_query_options(self.partition_key_path, known_fields),
             ):
-                items.append(item)
-
-            if not items:
-                return None
+                return self._map_to_commit(item)
 
-            return self._map_to_commit(items[0])
+            return None
 
         except CosmosHttpResponseError as e:
             logger.error(f"Failed to get commit: {e}")
             raise
 
+    async def get_commits(self, shas: list[str], repo_url: str) -> dict[str, GitCommit]:
+        """Get several commits from one repository in a single query.
+
+        Args:
+            shas: Commit SHAs (full or short)
+            repo_url: Repository URL
+
+        Returns:
+            Found commits keyed by the requested SHA (missing SHAs are omitted)
+        """
+        commits: dict[str, GitCommit] = {}
+        if not shas:
+            return commits
+
+        requested = set(shas)
+
+        try:
+            container = self._get_container()
+
+            query = f"""
+                SELECT {_COMMIT_PROJECTION} FROM c
+                WHERE c.doc_type = 'git_commit'
+                AND c.repo_url = @repo_url
+                AND (ARRAY_CONTAINS(@shas, c.sha) OR ARRAY_CONTAINS(@shas, c.short_sha))
+            """
+
+            params = [
+                {"name": "@repo_url", "value": repo_url},
+                {"name": "@shas", "value": list(requested)},
+            ]
+
+            async for item in container.query_items(
+                query=query,
+                parameters=params,
+                **partition_query_options(
+                    self.partition_key_path,
+                    {"doc_type": "git_commit", "repo_url": repo_url},
+                ),
+            ):
+                commit = self._map_to_commit(item)
+                for key in (commit.sha, commit.short_sha):
+                    if key in requested:
+                        commits[key] = commit
+
+            return commits
+
+        except CosmosHttpResponseError as e:
+            logger.error(f"Failed to get commits: {e}")
+            raise
+
     async def get_diff(
         self, sha: str, repo_url: str, file_path: str | None = None
     ) -> str | None:
@@ -160,14 +318,11 @@ class GitService:
         Returns:
             Unified diff string or None if commit not found
         """
-        commit = await self.get_commit(sha, repo_url)
-        if not commit:
-            return None
-
         try:
             container = self._get_container()
 
-            # Get the full document which may have diff data
+            # A matching row means the commit exists, even if no diff is stored,
+            # so one query answers both "found?" and "what diff?"
             query = """
                 SELECT c.diff FROM c
                 WHERE c.doc_type = 'git_commit'
@@ -180,37 +335,24 @@ class GitService:
                 {"name": "@sha", "value": sha},
             ]
 
-            items = []
             async for item in container.query_items(
                 query=query,
                 parameters=params,
-                enable_cross_partition_query=True,
+                max_item_count=1,
+                **partition_query_options(
+                    self.partition_key_path, _commit_key_fields(sha, repo_url)
+                ),
             ):
-                items.append(item)
-
-            if not items or "diff" not in items[0]:
                 # If no diff stored, return empty string
-                return ""
+                diff = item.get("diff", "")
 
-            diff = items[0]["diff"]
+                # Filter by file path if requested
+                if file_path and diff:
+                    return _filter_diff(diff, file_path)
 
-            # Filter by file path if requested
-            if file_path and diff:
-                # Simple filter: look for the file in the diff
-                lines = diff.split("\n")
-                filtered_lines = []
-                in_file = False
+                return diff
 
-                for line in lines:
-                    if line.startswith("diff --git"):
-                        # Check if this is the file we want
-                        in_file = file_path in line
-                    if in_file:
-                        filtered_lines.append(line)
-
-                return "\n".join(filtered_lines) if filtered_lines else ""
-
-            return diff
+            return None
 
         except CosmosHttpResponseError as e:
             logger.error(f"Failed to get diff: {e}")
@@ -225,20 +367,19 @@ class GitService:
         Returns:
             GitCommit instance
         """
-        # Extract file changes
-        files_changed = []
-        if "files_changed" in item:
-            for fc in item["files_changed"]:
-                files_changed.append(
-                    FileChange(
-                        path=fc["path"],
-                        change_type=fc["change_type"],
-                        additions=fc.get("additions", 0),
-                        deletions=fc.get("deletions", 0),
-                    )
-                )
-
-        return GitCommit(
+        # Documents are written by our own ingestion pipeline, so skip
+        # re-validation and build the models directly
+        files_changed = [
+            FileChange.model_construct(
+                path=fc["path"],
+                change_type=fc["change_type"],
+                additions=fc.get("additions", 0),
+                deletions=fc.get("deletions", 0),
+            )
+            for fc in item.get("files_changed", ())
+        ]
+
+        return GitCommit.model_construct(
             sha=item["sha"],
             short_sha=item.get("short_sha", item["sha"][:7]),
             repo_url=item["repo_url"],
@@ -246,7 +387,8 @@ class GitService:
             message=item.get("message", ""),
             author_name=item.get("author_name", "Unknown"),
             author_email=item.get("author_email", ""),
-            commit_date=datetime.fromisoformat(item["commit_date"].replace("Z", "+00:00")),
+            # Python 3.11+ fromisoformat accepts a trailing "Z" directly
+            commit_date=datetime.fromisoformat(item["commit_date"]),
             files_changed=files_changed,
             terraform_files=item.get("terraform_files", []),
             has_terraform_changes=item.get("has_terraform_changes", False),
@@ -1,17 +1,120 @@
 """Resource service for fetching and querying Azure resources."""
 
+import asyncio
 import logging
+import re
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
 from azure.cosmos.aio import CosmosClient
 from azure.cosmos import exceptions as cosmos_exceptions
 
 from src.api.models.resources import AzureResource, TerraformLink, ResourceDependency
+from src.api.services.cache import TTLCache
+from src.api.services.cosmos import partition_query_options, query_documents, query_first
 from src.ingestion.connectors.azure_resource_graph import AzureResourceGraphConnector
 from src.indexing.graph_builder import GraphBuilder
 
 logger = logging.getLogger(__name__)
 
+# Fields read by _map_to_resource and the TerraformLink mappers
+_RESOURCE_PROJECTION = (
+    "c.id, c.name, c.type, c.resource_group, c.subscription_id, c.subscription_name, "
+    "c.location, c.tags, c.sku, c.kind, c.properties"
+)
+_TERRAFORM_LINK_PROJECTION = (
+    "c.address, c.type, c.file_path, c.line_number, c.repo_url, c.branch, c.source_code"
+)
+
+_GET_RESOURCE_QUERY = (
+    f"SELECT TOP 1 {_RESOURCE_PROJECTION} FROM c "
+    "WHERE c.id = @resource_id AND c.doc_type = 'azure_resource'"
+)
+_GET_RESOURCES_QUERY = (
+    f"SELECT {_RESOURCE_PROJECTION} FROM c WHERE c.doc_type = 'azure_resource' "
+    "AND ARRAY_CONTAINS(@resource_ids, c.id)"
+)
+_GET_TERRAFORM_LINK_QUERY = (
+    f"SELECT TOP 1 {_TERRAFORM_LINK_PROJECTION} FROM c "
+    "WHERE c.address = @address AND c.doc_type = 'terraform_resource'"
+)
+_TERRAFORM_FOR_RESOURCES_QUERY = (
+    f"SELECT c.azure_resource_id, {_TERRAFORM_LINK_PROJECTION} FROM c "
+    "WHERE c.doc_type = 'terraform_resource' "
+    "AND ARRAY_CONTAINS(@resource_ids, c.azure_resource_id)"
+)
+
+# Subscriptions and resource type counts change slowly; cache them briefly
+INVENTORY_CACHE_SIZE = 64
+INVENTORY_CACHE_TTL_SECONDS = 300
+
+# Concurrent Resource Graph requests when fanning out across subscriptions
+ARG_MAX_CONCURRENCY = 8
+
+# Graph traversals (dependencies, Terraform links) are repeated by agent
+# tool loops; keep results briefly. Nothing invalidates these on writes, so
+# re-ingested relationships show up after at most the TTL
+GRAPH_CACHE_SIZE = 1024
+GRAPH_CACHE_TTL_SECONDS = 60
+
+# Ad-hoc Resource Graph query results, keyed by normalized KQL + subscriptions
+KQL_CACHE_SIZE = 128
+KQL_CACHE_TTL_SECONDS = 60
+
+# Hard cap on rows collected by execute_resource_graph_query
+MAX_KQL_RESULTS = 10_000
+
+# KQL string literals (kept verbatim), // line comments (dropped) or runs of
+# whitespace (collapsed)
+_KQL_TOKEN_PATTERN = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|\s*//[^\n]*|\s+""")
+
+# IDs per ARRAY_CONTAINS query when resolving Terraform for many resources
+TERRAFORM_LOOKUP_BATCH_SIZE = 100
+
+# Point lookups by resource ID / Terraform address. Documents are written by
+# the indexer in another process, so cached lookups may be up to
+# LOOKUP_CACHE_TTL_SECONDS stale after re-ingestion
+LOOKUP_CACHE_SIZE = 1024
+LOOKUP_CACHE_TTL_SECONDS = 300
+
+
+def _normalize_kql(query: str) -> str:
+    """Canonicalize a KQL query for use as a cache key.
+
+    Line comments are dropped before whitespace runs collapse to a single
+    space, since a comment ends at the line break that collapsing removes.
+    Leading/trailing whitespace is dropped; string literals are left
+    untouched. Clause order is preserved since it changes KQL results.
+    """
+    return _KQL_TOKEN_PATTERN.sub(_normalize_kql_token, query).strip()
+
+
+def _normalize_kql_token(match: re.Match[str]) -> str:
+    """Replace one _KQL_TOKEN_PATTERN match for _normalize_kql."""
+    token = match.group()
+    if token[0] in "'\"":
+        return token
+    # A comment takes the whitespace before it; the line break after it
+    # collapses like any other whitespace
+    return "" if "//" in token else " "
+
+
+def _iter_path_vertices(
+    paths: list[Any], direction: str
+) -> Iterator[tuple[Any, str]]:
+    """Flatten graph traversal paths into (vertex, dependency direction) pairs.
+
+    A path is either a list of vertices/edges or a single vertex. Vertices on
+    a path are labelled by traversal direction; bare vertices as "both".
+    """
+    path_direction = "upstream" if direction == "out" else "downstream"
+    for path in paths:
+        if isinstance(path, (list, tuple)):
+            for vertex in path:
+                yield vertex, path_direction
+        else:
+            yield path, "both"
+
 
 class ResourceService:
     """Service for managing Azure resources and Terraform links.
@@ -29,6 +132,7 @@ class ResourceService:
         container_name: str,
         arg_connector: AzureResourceGraphConnector,
         graph_builder: GraphBuilder | None = None,
+        partition_key_path: str | None = None,
     ):
         """Initialize the resource service.
 
@@ -38,58 +142,101 @@ class ResourceService:
             container_name: Container name for documents
             arg_connector: Azure Resource Graph connector
             graph_builder: Graph builder for dependency queries
+            partition_key_path: Partition key path of the documents container,
+                used to scope single-document lookups to one partition
         """
         self.cosmos_client = cosmos_client
         self.database_name = database_name
         self.container_name = container_name
         self.arg_connector = arg_connector
         self.graph_builder = graph_builder
+        self.partition_key_path = partition_key_path
+        self._container = None
+        self._subscriptions_cache = TTLCache(
+            maxsize=1, ttl=INVENTORY_CACHE_TTL_SECONDS
+        )
+        self._resource_types_cache = TTLCache(
+            maxsize=INVENTORY_CACHE_SIZE, ttl=INVENTORY_CACHE_TTL_SECONDS
+        )
+        self._subscriptions_lock = asyncio.Lock()
+        self._resource_types_lock = asyncio.Lock()
+        self._lookup_cache = TTLCache(
+            maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL_SECONDS, copy=True
+        )
+        self._graph_cache = TTLCache(
+            maxsize=GRAPH_CACHE_SIZE, ttl=GRAPH_CACHE_TTL_SECONDS, copy=True
+        )
+        self._kql_cache = TTLCache(
+            maxsize=KQL_CACHE_SIZE, ttl=KQL_CACHE_TTL_SECONDS, copy=True
+        )
+        self._arg_session_open = False
+        self._arg_session_lock = asyncio.Lock()
+
+    def _get_container(self):
+        """Get the Cosmos DB container proxy, creating it on first use."""
+        if self._container is None:
+            database = self.cosmos_client.get_database_client(self.database_name)
+            self._container = database.get_container_client(self.container_name)
+        return self._container
+
+    async def _get_arg_connector(self) -> AzureResourceGraphConnector:
+        """Get the Resource Graph connector, opening its session on first use.
+
+        The session (and its HTTP connection pool) is shared by all requests
+        and stays open until close().
+        """
+        if not self._arg_session_open:
+            async with self._arg_session_lock:
+                if not self._arg_session_open:
+                    await self.arg_connector.__aenter__()
+                    self._arg_session_open = True
+        return self.arg_connector
+
+    async def close(self) -> None:
+        """Close the shared Resource Graph session, if open."""
+        if self._arg_session_open:
+            self._arg_session_open = False
+            await self.arg_connector.__aexit__(None, None, None)
 
     async def get_resource(self, resource_id: str) -> AzureResource | None:
         """Get an Azure resource by ID from Cosmos DB.
 
+        Found resources are cached for LOOKUP_CACHE_TTL_SECONDS.
+
         Args:
             resource_id: Full Azure resource ID
 
         Returns:
             AzureResource if found, None otherwise
         """
+        cache_key = ("resource", resource_id)
+        cached = self._lookup_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
+            container = self._get_container()
 
             # Query for the resource document
-            query = "SELECT * FROM c WHERE c.id = @resource_id AND c.doc_type = 'azure_resource'"
+            query = _GET_RESOURCE_QUERY
             parameters = [{"name": "@resource_id", "value": resource_id}]
 
-            items = []
-            async for item in container.query_items(
+            # Only the first match is used, so stop streaming after one row
+            async for doc in container.query_items(
                 query=query,
                 parameters=parameters,
-                enable_cross_partition_query=True,
+                max_item_count=1,
+                **partition_query_options(
+                    self.partition_key_path,
+                    {"id": resource_id, "doc_type": "azure_resource"},
+                ),
             ):
-                items.append(item)
+                resource = self._map_to_resource(doc)
+                self._lookup_cache.set(cache_key, resource)
+                return resource
 
-            if not items:
-                logger.info(f"Resource not found in Cosmos DB: {resource_id}")
-                return None
-
-            doc = items[0]
-
-            # Map document to AzureResource model
-            return AzureResource(
-                id=doc.get("id", ""),
-                name=doc.get("name", ""),
-                type=doc.get("type", ""),
-                resource_group=doc.get("resource_group", ""),
-                subscription_id=doc.get("subscription_id", ""),
-                subscription_name=doc.get("subscription_name", ""),
-                location=doc.get("location", ""),
-                tags=doc.get("tags", {}),
-                sku=doc.get("sku"),
-                kind=doc.get("kind"),
-                properties=doc.get("properties", {}),
-            )
+            logger.info(f"Resource not found in Cosmos DB: {resource_id}")
+            return None
 
         except cosmos_exceptions.CosmosHttpResponseError as e:
             logger.error(f"Cosmos DB error fetching resource: {e}")
@@ -98,47 +245,105 @@ class ResourceService:
             logger.error(f"Unexpected error fetching resource: {e}", exc_info=True)
             return None
 
-    async def get_terraform_resource(self, address: str) -> TerraformLink | None:
-        """Get a Terraform resource by address from Cosmos DB.
+    async def get_resources(self, resource_ids: list[str]) -> dict[str, AzureResource]:
+        """Get several Azure resources by ID in a single Cosmos DB query.
+
+        Shares the lookup cache with get_resource: cached IDs are served
+        without a query and found resources are cached for
+        LOOKUP_CACHE_TTL_SECONDS.
 
         Args:
-            address: Terraform resource address (e.g., "azurerm_virtual_machine.example")
+            resource_ids: Full Azure resource IDs
 
         Returns:
-            TerraformLink if found, None otherwise
+            Found resources keyed by resource ID (missing IDs are omitted)
+
+        Raises:
+            Exception: If the Cosmos DB query fails, so callers can tell an
+                outage apart from resources that don't exist
         """
+        resources: dict[str, AzureResource] = {}
+        missing = []
+        for resource_id in dict.fromkeys(resource_ids):
+            cached = self._lookup_cache.get(("resource", resource_id))
+            if cached is not None:
+                resources[resource_id] = cached
+            else:
+                missing.append(resource_id)
+
+        if not missing:
+            return resources
+
         try:
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
+            container = self._get_container()
 
-            # Query for the Terraform resource document
-            query = "SELECT * FROM c WHERE c.address = @address AND c.doc_type = 'terraform_resource'"
-            parameters = [{"name": "@address", "value": address}]
+            query = _GET_RESOURCES_QUERY
+            parameters = [{"name": "@resource_ids", "value": missing}]
 
-            items = []
-            async for item in container.query_items(
+            async for doc in container.query_items(
                 query=query,
                 parameters=parameters,
-                enable_cross_partition_query=True,
+                **partition_query_options(
+                    self.partition_key_path, {"doc_type": "azure_resource"}
+                ),
             ):
-                items.append(item)
+                resource = self._map_to_resource(doc)
+                self._lookup_cache.set(("resource", resource.id), resource)
+                resources[resource.id] = resource
 
-            if not items:
+            return resources
+
+        except Exception as e:
+            logger.error(f"Error fetching resources: {e}", exc_info=True)
+            raise
+
+    def _map_to_resource(self, doc: dict[str, Any]) -> AzureResource:
+        """Map Cosmos DB document to AzureResource model."""
+        return AzureResource(
+            id=doc.get("id", ""),
+            name=doc.get("name", ""),
+            type=doc.get("type", ""),
+            resource_group=doc.get("resource_group", ""),
+            subscription_id=doc.get("subscription_id", ""),
+            subscription_name=doc.get("subscription_name", ""),
+            location=doc.get("location", ""),
+            tags=doc.get("tags", {}),
+            sku=doc.get("sku"),
+            kind=doc.get("kind"),
+            properties=doc.get("properties", {}),
+        )
+
+    async def get_terraform_resource(self, address: str) -> TerraformLink | None:
+        """Get a Terraform resource by address from Cosmos DB.
+
+        Found links are cached for LOOKUP_CACHE_TTL_SECONDS.
+
+        Args:
+            address: Terraform resource address (e.g., "azurerm_virtual_machine.example")
+
+        Returns:
+            TerraformLink if found, None otherwise
+        """
+        cache_key = ("terraform", address)
+        cached = self._lookup_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            doc = await query_first(
+                self._get_container(),
+                _GET_TERRAFORM_LINK_QUERY,
+                [{"name": "@address", "value": address}],
+                self.partition_key_path,
+                {"address": address, "doc_type": "terraform_resource"},
+            )
+            if doc is None:
                 logger.info(f"Terraform resource not found: {address}")
                 return None
 
-            doc = items[0]
-
-            # Map document to TerraformLink model
-            return TerraformLink(
-                address=doc.get("address", ""),
-                type=doc.get("type", ""),
-                file_path=doc.get("file_path", ""),
-                line_number=doc.get("line_number", 0),
-                repo_url=doc.get("repo_url", ""),
-                branch=doc.get("branch", "main"),
-                source_code=doc.get("source_code", ""),
-            )
+            link = self._map_to_terraform_link(doc)
+            self._lookup_cache.set(cache_key, link)
+            return link
 
         except cosmos_exceptions.CosmosHttpResponseError as e:
             logger.error(f"Cosmos DB error fetching Terraform resource: {e}")
@@ -147,16 +352,49 @@ class ResourceService:
             logger.error(f"Unexpected error fetching Terraform resource: {e}", exc_info=True)
             return None
 
+    async def stream_resource_graph_query(
+        self,
+        query: str,
+        subscriptions: list[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream the rows of a raw Azure Resource Graph query.
+
+        Rows are yielded as they arrive rather than accumulated, so callers
+        that count or aggregate run in constant memory. Results are not cached.
+
+        Args:
+            query: KQL query string
+            subscriptions: Optional list of subscription IDs to query
+
+        Yields:
+            Query result rows
+        """
+        logger.info(f"Streaming Resource Graph query (subscriptions={subscriptions})")
+
+        # Subscriptions are passed per call; the connector is shared
+        # across concurrent requests and must not be mutated
+        connector = await self._get_arg_connector()
+        async for result in connector.fetch_all_resources(
+            query=query, subscription_ids=subscriptions or None
+        ):
+            yield result
+
     async def execute_resource_graph_query(
         self,
         query: str,
         subscriptions: list[str] | None = None,
+        max_results: int = MAX_KQL_RESULTS,
     ) -> list[dict[str, Any]]:
         """Execute a raw Azure Resource Graph query.
 
+        Results are cached for KQL_CACHE_TTL_SECONDS, keyed by the query with
+        whitespace normalized and the set of subscriptions. At most max_results
+        rows are returned; use stream_resource_graph_query for larger scans.
+
         Args:
             query: KQL query string
             subscriptions: Optional list of subscription IDs to query
+            max_results: Maximum number of rows to collect
 
         Returns:
             List of query results
@@ -164,19 +402,31 @@ class ResourceService:
         Raises:
             Exception: If query execution fails
         """
-        try:
-            logger.info(f"Executing Resource Graph query (subscriptions={subscriptions})")
-
-            # The connector requires async with initialization
-            if subscriptions:
-                self.arg_connector.subscription_ids = subscriptions
+        cache_key = (
+            _normalize_kql(query),
+            tuple(sorted(set(subscriptions or ()))),
+            max_results,
+        )
+        cached = self._kql_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
+        try:
             results = []
-            async with self.arg_connector:
-                async for result in self.arg_connector.fetch_all_resources(query=query):
+            rows = self.stream_resource_graph_query(query, subscriptions)
+            try:
+                async for result in rows:
+                    if len(results) >= max_results:
+                        logger.warning(
+                            f"Resource Graph query truncated at {max_results} results"
+                        )
+                        break
                     results.append(result)
+            finally:
+                await rows.aclose()
 
             logger.info(f"Resource Graph query returned {len(results)} results")
+            self._kql_cache.set(cache_key, results)
             return results
 
         except Exception as e:
@@ -195,57 +445,95 @@ class ResourceService:
         Returns:
             List of TerraformLink objects
         """
+        links = await self.get_terraform_for_resources([resource_id])
+        return links.get(resource_id, [])
+
+    async def get_terraform_for_resources(
+        self,
+        resource_ids: list[str],
+    ) -> dict[str, list[TerraformLink]]:
+        """Get Terraform resources that manage several Azure resources.
+
+        With a graph builder, uncached IDs are resolved in one traversal and
+        cached for GRAPH_CACHE_TTL_SECONDS. Without one, IDs are looked up in
+        chunks of TERRAFORM_LOOKUP_BATCH_SIZE with one Cosmos DB query per chunk.
+
+        Args:
+            resource_ids: Full Azure resource IDs
+
+        Returns:
+            TerraformLink lists keyed by resource ID (unmanaged IDs are omitted)
+        """
+        links: dict[str, list[TerraformLink]] = {}
+        if not resource_ids:
+            return links
+
         try:
             # Use graph builder if available
             if self.graph_builder:
-                tf_resources = self.graph_builder.find_terraform_for_resource(resource_id)
-                return [
-                    TerraformLink(
-                        address=tf.get("address", ""),
-                        type=tf.get("type", ""),
-                        file_path=tf.get("file_path", ""),
-                        line_number=tf.get("line_number", 0),
-                        repo_url=tf.get("repo_url", ""),
-                        branch=tf.get("branch", "main"),
-                        source_code=tf.get("source_code", ""),
-                    )
-                    for tf in tf_resources
-                ]
+                missing = []
+                for resource_id in dict.fromkeys(resource_ids):
+                    cached = self._graph_cache.get(("terraform", resource_id))
+                    if cached is None:
+                        missing.append(resource_id)
+                    elif cached:
+                        links[resource_id] = cached
+
+                # One traversal for all uncached IDs
+                if len(missing) == 1:
+                    found = {
+                        missing[0]: self.graph_builder.find_terraform_for_resource(missing[0])
+                    }
+                elif missing:
+                    found = self.graph_builder.find_terraform_for_resources(missing)
+                else:
+                    found = {}
+
+                for resource_id in missing:
+                    resource_links = [
+                        self._map_to_terraform_link(tf) for tf in found.get(resource_id, ())
+                    ]
+                    self._graph_cache.set(("terraform", resource_id), resource_links)
+                    if resource_links:
+                        links[resource_id] = resource_links
+                return links
 
             # Fall back to Cosmos DB query
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
-
-            query = """
-                SELECT * FROM c
-                WHERE c.doc_type = 'terraform_resource'
-                AND c.azure_resource_id = @resource_id
-            """
-            parameters = [{"name": "@resource_id", "value": resource_id}]
-
-            items = []
-            async for item in container.query_items(
-                query=query,
-                parameters=parameters,
-                enable_cross_partition_query=True,
-            ):
-                items.append(
-                    TerraformLink(
-                        address=item.get("address", ""),
-                        type=item.get("type", ""),
-                        file_path=item.get("file_path", ""),
-                        line_number=item.get("line_number", 0),
-                        repo_url=item.get("repo_url", ""),
-                        branch=item.get("branch", "main"),
-                        source_code=item.get("source_code", ""),
+            container = self._get_container()
+
+            unique_ids = list(dict.fromkeys(resource_ids))
+
+            for i in range(0, len(unique_ids), TERRAFORM_LOOKUP_BATCH_SIZE):
+                chunk = unique_ids[i : i + TERRAFORM_LOOKUP_BATCH_SIZE]
+                async for item in query_documents(
+                    container,
+                    _TERRAFORM_FOR_RESOURCES_QUERY,
+                    [{"name": "@resource_ids", "value": chunk}],
+                    self.partition_key_path,
+                    {"doc_type": "terraform_resource"},
+                ):
+                    links.setdefault(item.get("azure_resource_id", ""), []).append(
+                        self._map_to_terraform_link(item)
                     )
-                )
 
-            return items
+            return links
 
         except Exception as e:
-            logger.error(f"Error fetching Terraform for resource: {e}", exc_info=True)
-            return []
+            logger.error(f"Error fetching Terraform for resources: {e}", exc_info=True)
+            return links
+
+    @staticmethod
+    def _map_to_terraform_link(doc: dict[str, Any]) -> TerraformLink:
+        """Map a Terraform resource document or graph vertex to TerraformLink."""
+        return TerraformLink(
+            address=doc.get("address", ""),
+            type=doc.get("type", ""),
+            file_path=doc.get("file_path", ""),
+            line_number=doc.get("line_number", 0),
+            repo_url=doc.get("repo_url", ""),
+            branch=doc.get("branch", "main"),
+            source_code=doc.get("source_code", ""),
+        )
 
     async def get_dependencies(
         self,
@@ -255,6 +543,8 @@ class ResourceService:
     ) -> list[ResourceDependency]:
         """Get dependencies for an Azure resource.
 
+        Results are cached for GRAPH_CACHE_TTL_SECONDS.
+
         Args:
             resource_id: Full Azure resource ID
             direction: Traversal direction - "in", "out", or "both"
@@ -268,46 +558,39 @@ class ResourceService:
                 logger.warning("Graph builder not configured, returning empty dependencies")
                 return []
 
+            cache_key = ("dependencies", resource_id, direction, depth)
+            cached = self._graph_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             paths = self.graph_builder.find_dependencies(
                 resource_id=resource_id,
                 direction=direction,
                 depth=depth,
             )
 
+            # Paths overlap heavily at higher depths; emit each vertex once
             dependencies = []
-            seen_ids = set()
-
-            for path in paths:
-                # Path can be a list of vertices/edges
-                if isinstance(path, (list, tuple)):
-                    for vertex in path:
-                        if isinstance(vertex, dict) and "id" in vertex:
-                            vid = vertex["id"]
-                            if vid not in seen_ids and vid != resource_id:
-                                seen_ids.add(vid)
-                                dependencies.append(
-                                    ResourceDependency(
-                                        id=vid,
-                                        name=vertex.get("name", ""),
-                                        type=vertex.get("type", ""),
-                                        relationship="depends_on",
-                                        direction="upstream" if direction == "out" else "downstream",
-                                    )
-                                )
-                elif isinstance(path, dict) and "id" in path:
-                    vid = path["id"]
-                    if vid not in seen_ids and vid != resource_id:
-                        seen_ids.add(vid)
-                        dependencies.append(
-                            ResourceDependency(
-                                id=vid,
-                                name=path.get("name", ""),
-                                type=path.get("type", ""),
-                                relationship="depends_on",
-                                direction="both",
-                            )
-                        )
+            seen_ids = {resource_id}
+
+            for vertex, vertex_direction in _iter_path_vertices(paths, direction):
+                if not isinstance(vertex, dict) or "id" not in vertex:
+                    continue
+                vid = vertex["id"]
+                if vid in seen_ids:
+                    continue
+                seen_ids.add(vid)
+                dependencies.append(
+                    ResourceDependency(
+                        id=vid,
+                        name=vertex.get("name", ""),
+                        type=vertex.get("type", ""),
+                        relationship="depends_on",
+                        direction=vertex_direction,
+                    )
+                )
 
+            self._graph_cache.set(cache_key, dependencies)
             return dependencies
 
         except Exception as e:
@@ -317,15 +600,30 @@ class ResourceService:
     async def list_subscriptions(self) -> list[dict[str, Any]]:
         """List all accessible Azure subscriptions.
 
+        Results are cached for INVENTORY_CACHE_TTL_SECONDS.
+
         Returns:
             List of subscription dictionaries with id, name, and state
         """
-        try:
-            async with self.arg_connector:
-                return await self.arg_connector.enumerate_subscriptions()
-        except Exception as e:
-            logger.error(f"Error listing subscriptions: {e}", exc_info=True)
-            return []
+        cached = self._subscriptions_cache.get("subscriptions")
+        if cached is not None:
+            return cached
+
+        # Only one caller refreshes on a miss; the rest wait for its result
+        async with self._subscriptions_lock:
+            cached = self._subscriptions_cache.get("subscriptions")
+            if cached is not None:
+                return cached
+
+            try:
+                connector = await self._get_arg_connector()
+                subscriptions = await connector.enumerate_subscriptions()
+            except Exception as e:
+                logger.error(f"Error listing subscriptions: {e}", exc_info=True)
+                return []
+
+            self._subscriptions_cache.set("subscriptions", subscriptions)
+            return subscriptions
 
     async def get_resource_types_summary(
         self,
@@ -333,20 +631,85 @@ class ResourceService:
     ) -> list[dict[str, Any]]:
         """Get summary of resource types with counts.
 
+        Results are cached per subscription for INVENTORY_CACHE_TTL_SECONDS.
+
         Args:
             subscription_id: Optional subscription ID to filter
 
         Returns:
             List of dictionaries with 'type' and 'count' keys
         """
-        try:
-            if subscription_id:
-                self.arg_connector.subscription_ids = [subscription_id]
+        cached = self._resource_types_cache.get(subscription_id)
+        if cached is not None:
+            return cached
+
+        async with self._resource_types_lock:
+            cached = self._resource_types_cache.get(subscription_id)
+            if cached is not None:
+                return cached
+
+            try:
+                connector = await self._get_arg_connector()
+                summary = await connector.fetch_resource_types(
+                    subscription_ids=[subscription_id] if subscription_id else []
+                )
+            except Exception as e:
+                logger.error(f"Error getting resource types summary: {e}", exc_info=True)
+                return []
+
+            self._resource_types_cache.set(subscription_id, summary)
+            return summary
+
+    async def get_resource_types_summaries(
+        self,
+        subscription_ids: list[str | None],
+    ) -> dict[str | None, list[dict[str, Any]]]:
+        """Get resource type summaries for several subscriptions concurrently.
+
+        Cache misses are fetched in parallel, at most ARG_MAX_CONCURRENCY at
+        a time. A None entry summarizes all
+        accessible subscriptions, as in get_resource_types_summary.
+
+        Args:
+            subscription_ids: Subscription IDs to summarize
+
+        Returns:
+            Summaries keyed by subscription ID (empty list on failure)
+        """
+        summaries: dict[str | None, list[dict[str, Any]]] = {}
+        missing = []
+        for subscription_id in dict.fromkeys(subscription_ids):
+            cached = self._resource_types_cache.get(subscription_id)
+            if cached is not None:
+                summaries[subscription_id] = cached
             else:
-                self.arg_connector.subscription_ids = []
+                missing.append(subscription_id)
 
-            async with self.arg_connector:
-                return await self.arg_connector.fetch_resource_types()
-        except Exception as e:
-            logger.error(f"Error getting resource types summary: {e}", exc_info=True)
-            return []
+        if not missing:
+            return summaries
+
+        semaphore = asyncio.Semaphore(ARG_MAX_CONCURRENCY)
+
+        async def _fetch(subscription_id: str | None) -> list[dict[str, Any]]:
+            async with semaphore:
+                connector = await self._get_arg_connector()
+                return await connector.fetch_resource_types(
+                    subscription_ids=[subscription_id] if subscription_id else []
+                )
+
+        results = await asyncio.gather(
+            *(_fetch(subscription_id) for subscription_id in missing),
+            return_exceptions=True,
+        )
+
+        for subscription_id, result in zip(missing, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error getting resource types summary for {subscription_id}: {result}"
+                )
+                summaries[subscription_id] = []
+            else:
+                self._resource_types_cache.set(subscription_id, result)
+                summaries[subscription_id] = result
+
+        return summaries
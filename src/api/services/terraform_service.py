@@ -1,7 +1,10 @@
 """Terraform service for fetching and analyzing Terraform resources and plans."""
 
+import asyncio
 import logging
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from typing import Any
 
 from azure.cosmos.aio import CosmosClient
@@ -14,9 +17,159 @@ from src.api.models.terraform import (
     PlanAnalysis,
     ParsedPlan,
 )
+from src.api.services.cache import TTLCache
+from src.api.services.cosmos import partition_query_options, query_documents, query_first
 
 logger = logging.getLogger(__name__)
 
+# Server-side clamp for list queries, mirroring the router's Query(le=...) bounds
+MAX_RESOURCE_LIMIT = 200
+MAX_PLAN_LIMIT = 50
+
+# Plans are immutable once stored, but keep the TTL short so deletions and
+# re-ingested plans show up; nothing invalidates the cache on writes
+PLAN_CACHE_SIZE = 256
+PLAN_CACHE_TTL_SECONDS = 300
+
+# Plans with at least this many resource changes are parsed on the threadpool;
+# smaller ones finish faster inline than the thread hand-off costs
+PARSE_PLAN_THREAD_THRESHOLD = 50
+
+# Fields read by _map_to_terraform_resource / _map_to_terraform_plan
+_RESOURCE_PROJECTION = ", ".join(
+    f"c.{field}"
+    for field in (
+        "address",
+        "type",
+        "name",
+        "module_path",
+        "file_path",
+        "line_number",
+        "repo_url",
+        "branch",
+        "provider",
+        "source_code",
+        "dependencies",
+        "azure_resource_id",
+    )
+)
+_PLAN_PROJECTION = ", ".join(
+    f"c.{field}"
+    for field in (
+        "id",
+        "repo_url",
+        "branch",
+        "commit_sha",
+        "timestamp",
+        "add",
+        "change",
+        "destroy",
+        "changes",
+    )
+)
+
+_GET_RESOURCE_QUERY = (
+    f"SELECT TOP 1 {_RESOURCE_PROJECTION} FROM c WHERE c.doc_type = 'terraform_resource' "
+    "AND c.address = @address AND c.repo_url = @repo_url"
+)
+_GET_PLAN_QUERY = (
+    f"SELECT TOP 1 {_PLAN_PROJECTION} FROM c "
+    "WHERE c.id = @plan_id AND c.doc_type = 'terraform_plan'"
+)
+
+# list_resources filter clauses, indexed by their bit in the filter mask.
+# Predicates are ordered to match the (repo_url, type, file_path) composite index.
+_RESOURCE_FILTER_CLAUSES = (
+    " AND c.repo_url = @repo_url",
+    " AND c.type = @resource_type",
+    " AND c.file_path = @file_path",
+)
+
+# list_plans filter clauses, indexed by their bit in the filter mask
+_PLAN_FILTER_CLAUSES = (
+    " AND c.repo_url = @repo_url",
+    " AND c.timestamp >= @since",
+)
+
+
+def _join_filter_clauses(clauses: tuple[str, ...], filter_mask: int) -> str:
+    """Concatenate the filter clauses whose bit is set in the mask."""
+    return "".join(
+        clause for bit, clause in enumerate(clauses) if filter_mask & (1 << bit)
+    )
+
+
+# Terraform change actions -> (action, add, change, destroy) increments.
+# Replacements are ["delete", "create"] or ["create", "delete"] and count as
+# both a create and a destroy.
+_PLAN_ACTIONS: dict[frozenset[str], tuple[str, int, int, int]] = {
+    frozenset(("delete", "create")): ("replace", 1, 0, 1),
+    frozenset(("create",)): ("create", 1, 0, 0),
+    frozenset(("delete",)): ("delete", 0, 0, 1),
+    frozenset(("update",)): ("update", 0, 1, 0),
+}
+
+# Plan analysis recommendations
+_RECOMMEND_REVIEW_DESTROYS = "Review all resources marked for destruction carefully"
+_RECOMMEND_SMALLER_PLANS = "Consider breaking this plan into smaller, incremental changes"
+_RECOMMEND_TAGS_AND_NAMING = "Verify that new resources have appropriate tags and naming conventions"
+
+# Action -> (summary label, key-change label)
+_ACTION_LABELS: dict[str, tuple[str, str]] = {
+    action: (action.capitalize(), action.upper())
+    for action in ("create", "update", "delete", "replace")
+}
+
+
+def _changed_attributes(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    """List attributes whose value differs between a change's before and after.
+
+    A key missing on one side compares as None. Keys are returned in
+    after-then-before order, without building the union of both key sets.
+    """
+    before_get = before.get
+    changed = [key for key, value in after.items() if before_get(key) != value]
+    changed.extend(
+        key for key, value in before.items() if value is not None and key not in after
+    )
+    return changed
+
+
+@lru_cache(maxsize=1 << len(_RESOURCE_FILTER_CLAUSES))
+def _build_resources_query(filter_mask: int) -> str:
+    """Build the list_resources SQL for a combination of filters.
+
+    Args:
+        filter_mask: Bitmask of active filters (bit i enables clause i)
+
+    Returns:
+        Parameterized SQL query
+    """
+    clauses = _join_filter_clauses(_RESOURCE_FILTER_CLAUSES, filter_mask)
+    return (
+        f"SELECT TOP @limit {_RESOURCE_PROJECTION} FROM c "
+        f"WHERE c.doc_type = 'terraform_resource'{clauses} "
+        "ORDER BY c.file_path"
+    )
+
+
+@lru_cache(maxsize=1 << len(_PLAN_FILTER_CLAUSES))
+def _build_plans_query(filter_mask: int) -> str:
+    """Build the list_plans SQL for a combination of filters.
+
+    Args:
+        filter_mask: Bitmask of active filters (bit i enables clause i)
+
+    Returns:
+        Parameterized SQL query
+    """
+    clauses = _join_filter_clauses(_PLAN_FILTER_CLAUSES, filter_mask)
+    return (
+        f"SELECT TOP @limit {_PLAN_PROJECTION} FROM c "
+        f"WHERE c.doc_type = 'terraform_plan'{clauses} "
+        "ORDER BY c.timestamp DESC"
+    )
+
 
 class TerraformService:
     """Service for managing Terraform resources and plans.
@@ -32,6 +185,7 @@ class TerraformService:
         cosmos_client: CosmosClient,
         database_name: str,
         container_name: str,
+        partition_key_path: str | None = None,
     ):
         """Initialize the Terraform service.
 
@@ -39,10 +193,24 @@ class TerraformService:
             cosmos_client: Cosmos DB client
             database_name: Database name
             container_name: Container name for documents
+            partition_key_path: Partition key path of the documents container,
+                used to turn plan lookups into point reads
         """
         self.cosmos_client = cosmos_client
         self.database_name = database_name
         self.container_name = container_name
+        self.partition_key_path = partition_key_path
+        self._container = None
+        self._plan_cache = TTLCache(
+            maxsize=PLAN_CACHE_SIZE, ttl=PLAN_CACHE_TTL_SECONDS, copy=True
+        )
+
+    def _get_container(self):
+        """Get the Cosmos DB container proxy, creating it on first use."""
+        if self._container is None:
+            database = self.cosmos_client.get_database_client(self.database_name)
+            self._container = database.get_container_client(self.container_name)
+        return self._container
 
     async def list_resources(
         self,
@@ -63,34 +231,40 @@ class TerraformService:
             List of Terraform resources
         """
         try:
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
+            container = self._get_container()
+
+            limit = max(1, min(limit, MAX_RESOURCE_LIMIT))
 
-            # Build query with filters
-            query = "SELECT * FROM c WHERE c.doc_type = 'terraform_resource'"
-            parameters = []
+            # Query text depends only on which filters are set; bind values
+            # per call. TOP lets the engine stop once `limit` rows are produced.
+            filter_mask = bool(repo_url) | bool(resource_type) << 1 | bool(file_path) << 2
+            query = _build_resources_query(filter_mask)
+            parameters = [{"name": "@limit", "value": limit}]
 
             if repo_url:
-                query += " AND c.repo_url = @repo_url"
                 parameters.append({"name": "@repo_url", "value": repo_url})
 
             if resource_type:
-                query += " AND c.type = @resource_type"
                 parameters.append({"name": "@resource_type", "value": resource_type})
 
             if file_path:
-                query += " AND c.file_path = @file_path"
                 parameters.append({"name": "@file_path", "value": file_path})
 
-            query += f" ORDER BY c.file_path OFFSET 0 LIMIT {limit}"
-
             logger.info(f"Querying Terraform resources with filters: repo_url={repo_url}, type={resource_type}, file_path={file_path}")
 
             items = []
-            async for item in container.query_items(
-                query=query,
-                parameters=parameters,
-                enable_cross_partition_query=True,
+            async for item in query_documents(
+                container,
+                query,
+                parameters,
+                self.partition_key_path,
+                {
+                    "doc_type": "terraform_resource",
+                    "repo_url": repo_url,
+                    "type": resource_type,
+                    "file_path": file_path,
+                },
+                max_item_count=limit,
             ):
                 items.append(self._map_to_terraform_resource(item))
 
@@ -115,33 +289,21 @@ class TerraformService:
             TerraformResource if found, None otherwise
         """
         try:
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
-
-            query = """
-                SELECT * FROM c
-                WHERE c.doc_type = 'terraform_resource'
-                AND c.address = @address
-                AND c.repo_url = @repo_url
-            """
-            parameters = [
-                {"name": "@address", "value": address},
-                {"name": "@repo_url", "value": repo_url},
-            ]
-
-            items = []
-            async for item in container.query_items(
-                query=query,
-                parameters=parameters,
-                enable_cross_partition_query=True,
-            ):
-                items.append(item)
-
-            if not items:
+            item = await query_first(
+                self._get_container(),
+                _GET_RESOURCE_QUERY,
+                [
+                    {"name": "@address", "value": address},
+                    {"name": "@repo_url", "value": repo_url},
+                ],
+                self.partition_key_path,
+                {"doc_type": "terraform_resource", "address": address, "repo_url": repo_url},
+            )
+            if item is None:
                 logger.info(f"Terraform resource not found: {address} in {repo_url}")
                 return None
 
-            return self._map_to_terraform_resource(items[0])
+            return self._map_to_terraform_resource(item)
 
         except cosmos_exceptions.CosmosHttpResponseError as e:
             logger.error(f"Cosmos DB error fetching Terraform resource: {e}")
@@ -167,29 +329,30 @@ class TerraformService:
             List of Terraform plans
         """
         try:
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
+            container = self._get_container()
+
+            limit = max(1, min(limit, MAX_PLAN_LIMIT))
 
-            query = "SELECT * FROM c WHERE c.doc_type = 'terraform_plan'"
-            parameters = []
+            query = _build_plans_query(bool(repo_url) | bool(since) << 1)
+            parameters = [{"name": "@limit", "value": limit}]
 
             if repo_url:
-                query += " AND c.repo_url = @repo_url"
                 parameters.append({"name": "@repo_url", "value": repo_url})
 
             if since:
-                query += " AND c.timestamp >= @since"
                 parameters.append({"name": "@since", "value": since.isoformat()})
 
-            query += f" ORDER BY c.timestamp DESC OFFSET 0 LIMIT {limit}"
-
             logger.info(f"Querying Terraform plans with filters: repo_url={repo_url}, since={since}")
 
             items = []
             async for item in container.query_items(
                 query=query,
                 parameters=parameters,
-                enable_cross_partition_query=True,
+                max_item_count=limit,
+                **partition_query_options(
+                    self.partition_key_path,
+                    {"doc_type": "terraform_plan", "repo_url": repo_url},
+                ),
             ):
                 items.append(self._map_to_terraform_plan(item))
 
@@ -206,32 +369,56 @@ class TerraformService:
     async def get_plan(self, plan_id: str) -> TerraformPlan | None:
         """Get a specific Terraform plan by ID.
 
+        When the partition key is derivable from the plan ID, the plan is
+        fetched with a point read instead of a query. Found plans are cached
+        for PLAN_CACHE_TTL_SECONDS.
+
         Args:
             plan_id: Plan ID
 
         Returns:
             TerraformPlan if found, None otherwise
         """
-        try:
-            database = self.cosmos_client.get_database_client(self.database_name)
-            container = database.get_container_client(self.container_name)
-
-            query = "SELECT * FROM c WHERE c.id = @plan_id AND c.doc_type = 'terraform_plan'"
-            parameters = [{"name": "@plan_id", "value": plan_id}]
+        cached = self._plan_cache.get(plan_id)
+        if cached is not None:
+            return cached
 
-            items = []
-            async for item in container.query_items(
-                query=query,
-                parameters=parameters,
-                enable_cross_partition_query=True,
-            ):
-                items.append(item)
+        try:
+            container = self._get_container()
+            options = partition_query_options(
+                self.partition_key_path, {"id": plan_id, "doc_type": "terraform_plan"}
+            )
 
-            if not items:
+            doc = None
+            if "partition_key" in options:
+                try:
+                    doc = await container.read_item(
+                        item=plan_id, partition_key=options["partition_key"]
+                    )
+                except cosmos_exceptions.CosmosResourceNotFoundError:
+                    pass
+                if doc is not None and doc.get("doc_type") != "terraform_plan":
+                    doc = None
+            else:
+                query = _GET_PLAN_QUERY
+                parameters = [{"name": "@plan_id", "value": plan_id}]
+
+                async for item in container.query_items(
+                    query=query,
+                    parameters=parameters,
+                    max_item_count=1,
+                    **options,
+                ):
+                    doc = item
+                    break
+
+            if doc is None:
                 logger.info(f"Terraform plan not found: {plan_id}")
                 return None
 
-            return self._map_to_terraform_plan(items[0])
+            plan = self._map_to_terraform_plan(doc)
+            self._plan_cache.set(plan_id, plan)
+            return plan
 
         except cosmos_exceptions.CosmosHttpResponseError as e:
             logger.error(f"Cosmos DB error fetching Terraform plan: {e}")
@@ -254,6 +441,13 @@ class TerraformService:
 
         total_changes = plan.add + plan.change + plan.destroy
 
+        # Empty plans have nothing to list or recommend
+        if total_changes == 0 and not plan.changes:
+            return PlanAnalysis(
+                summary="Plan will add 0, change 0, and destroy 0 resources.",
+                risk_level="low",
+            )
+
         # Determine risk level based on changes
         if plan.destroy > 0 or total_changes > 20:
             risk_level = "high"
@@ -267,17 +461,19 @@ class TerraformService:
 
         # Extract key changes
         key_changes = []
-        for change in plan.changes[:5]:  # Top 5 changes
-            key_changes.append(f"{change.action.upper()}: {change.address}")
+        for change in islice(plan.changes, 5):  # Top 5 changes
+            labels = _ACTION_LABELS.get(change.action)
+            action_label = labels[1] if labels else change.action.upper()
+            key_changes.append(f"{action_label}: {change.address}")
 
         # Generate recommendations
         recommendations = []
         if plan.destroy > 0:
-            recommendations.append("Review all resources marked for destruction carefully")
+            recommendations.append(_RECOMMEND_REVIEW_DESTROYS)
         if total_changes > 10:
-            recommendations.append("Consider breaking this plan into smaller, incremental changes")
+            recommendations.append(_RECOMMEND_SMALLER_PLANS)
         if plan.add > 0:
-            recommendations.append("Verify that new resources have appropriate tags and naming conventions")
+            recommendations.append(_RECOMMEND_TAGS_AND_NAMING)
 
         return PlanAnalysis(
             summary=summary,
@@ -286,6 +482,23 @@ class TerraformService:
             recommendations=recommendations,
         )
 
+    async def get_and_analyze(
+        self, plan_id: str
+    ) -> tuple[TerraformPlan | None, PlanAnalysis | None]:
+        """Fetch a Terraform plan and analyze it in one service call.
+
+        Args:
+            plan_id: Plan ID
+
+        Returns:
+            Tuple of (plan, analysis), or (None, None) if the plan was not found
+        """
+        plan = await self.get_plan(plan_id)
+        if not plan:
+            return None, None
+
+        return plan, await self.analyze_plan(plan)
+
     def parse_plan(self, plan_json: dict[str, Any]) -> ParsedPlan:
         """Parse a Terraform plan JSON.
 
@@ -311,42 +524,26 @@ class TerraformService:
                 change = rc.get("change", {})
                 actions = change.get("actions", [])
 
-                # Determine action type
-                # Check for replace first - Terraform represents this as ["delete", "create"]
-                if "delete" in actions and "create" in actions:
-                    # Replacements count as both a destroy and a create
-                    destroy_count += 1
-                    add_count += 1
-                    action = "replace"
-                elif "create" in actions:
-                    add_count += 1
-                    action = "create"
-                elif "delete" in actions:
-                    destroy_count += 1
-                    action = "delete"
-                elif "update" in actions:
-                    change_count += 1
-                    action = "update"
-                else:
+                # Determine action type; no-op and read changes are skipped
+                entry = _PLAN_ACTIONS.get(frozenset(actions))
+                if entry is None:
                     continue
+                action, adds, updates, destroys = entry
+                add_count += adds
+                change_count += updates
+                destroy_count += destroys
 
-                # Extract changed attributes
-                changed_attrs = []
+                # Extract changed attributes (creates and deletes have no
+                # before/after pair to compare)
                 before = change.get("before", {})
                 after = change.get("after", {})
-
-                if before and after:
-                    # Find attributes that changed
-                    all_keys = set(before.keys()) | set(after.keys())
-                    for key in all_keys:
-                        if before.get(key) != after.get(key):
-                            changed_attrs.append(key)
+                changed_attrs = _changed_attributes(before, after) if before and after else []
 
                 # Create PlannedChange
                 address = rc.get("address", "")
                 resource_type = rc.get("type", "")
 
-                summary = f"{action.capitalize()} {resource_type} resource"
+                summary = f"{_ACTION_LABELS[action][0]} {resource_type} resource"
                 if changed_attrs:
                     summary += f" (changing: {', '.join(changed_attrs[:3])})"
 
@@ -371,9 +568,30 @@ class TerraformService:
             logger.error(f"Failed to parse Terraform plan: {e}", exc_info=True)
             raise ValueError(f"Invalid Terraform plan JSON: {e}")
 
+    async def parse_plan_async(self, plan_json: dict[str, Any]) -> ParsedPlan:
+        """Parse a Terraform plan JSON without blocking the event loop.
+
+        Large plans are parsed on the threadpool; small plans are parsed inline.
+
+        Args:
+            plan_json: Terraform plan JSON (output of `terraform show -json plan.tfplan`)
+
+        Returns:
+            ParsedPlan with structured changes
+
+        Raises:
+            ValueError: If plan JSON is invalid
+        """
+        resource_changes = plan_json.get("resource_changes")
+        if isinstance(resource_changes, list) and len(resource_changes) >= PARSE_PLAN_THREAD_THRESHOLD:
+            return await asyncio.to_thread(self.parse_plan, plan_json)
+        return self.parse_plan(plan_json)
+
     def _map_to_terraform_resource(self, doc: dict[str, Any]) -> TerraformResource:
         """Map Cosmos DB document to TerraformResource model."""
-        return TerraformResource(
+        # Documents are written by our own ingestion pipeline, so skip
+        # re-validation and build the model directly
+        return TerraformResource.model_construct(
             address=doc.get("address", ""),
             type=doc.get("type", ""),
             name=doc.get("name", ""),
@@ -393,24 +611,24 @@ class TerraformService:
         # Parse timestamp
         timestamp_str = doc.get("timestamp", "")
         if isinstance(timestamp_str, str):
-            timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+            timestamp = datetime.fromisoformat(timestamp_str)
         else:
             timestamp = datetime.now()
 
-        # Parse changes
-        changes = []
-        for change_data in doc.get("changes", []):
-            changes.append(
-                PlannedChange(
-                    address=change_data.get("address", ""),
-                    action=change_data.get("action", ""),
-                    resource_type=change_data.get("resource_type", ""),
-                    changed_attributes=change_data.get("changed_attributes", []),
-                    summary=change_data.get("summary", ""),
-                )
+        # Parse changes; like resources, plans come from our own pipeline
+        # and are built without re-validation
+        changes = [
+            PlannedChange.model_construct(
+                address=change_data.get("address", ""),
+                action=change_data.get("action", ""),
+                resource_type=change_data.get("resource_type", ""),
+                changed_attributes=change_data.get("changed_attributes", []),
+                summary=change_data.get("summary", ""),
             )
+            for change_data in doc.get("changes", ())
+        ]
 
-        return TerraformPlan(
+        return TerraformPlan.model_construct(
             id=doc.get("id", ""),
             repo_url=doc.get("repo_url", ""),
             branch=doc.get("branch", "main"),
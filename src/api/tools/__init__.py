@@ -1,5 +1,15 @@
 """LLM tool definitions and utilities."""
 
-from .definitions import TOOL_DEFINITIONS, get_tool_definitions, get_tool_by_name
+from .definitions import (
+    TOOL_DEFINITIONS,
+    get_tool_by_name,
+    get_tool_definitions,
+    get_tool_definitions_json,
+)
 
-__all__ = ["TOOL_DEFINITIONS", "get_tool_definitions", "get_tool_by_name"]
+__all__ = [
+    "TOOL_DEFINITIONS",
+    "get_tool_definitions",
+    "get_tool_definitions_json",
+    "get_tool_by_name",
+]
@@ -9,8 +9,16 @@ Each tool definition includes:
 - parameters: JSON Schema for tool parameters
 """
 
+import json
+from collections.abc import Callable
 from typing import Any
 
+# Parameter schemas repeated verbatim across tools share one object
+_REPO_URL_PARAMETER: dict[str, Any] = {
+    "type": "string",
+    "description": "Repository URL",
+}
+
 # All tool definitions in OpenAI/Anthropic function calling format
 TOOL_DEFINITIONS: list[dict[str, Any]] = [
     {
@@ -154,10 +162,7 @@ TOOL_DEFINITIONS: list[dict[str, Any]] = [
                     "type": "string",
                     "description": "The Terraform resource address (e.g., 'azurerm_virtual_machine.example')",
                 },
-                "repo_url": {
-                    "type": "string",
-                    "description": "Repository URL",
-                },
+                "repo_url": _REPO_URL_PARAMETER,
             },
             "required": ["address", "repo_url"],
         },
@@ -236,10 +241,7 @@ TOOL_DEFINITIONS: list[dict[str, Any]] = [
                     "type": "string",
                     "description": "The commit SHA",
                 },
-                "repo_url": {
-                    "type": "string",
-                    "description": "Repository URL",
-                },
+                "repo_url": _REPO_URL_PARAMETER,
             },
             "required": ["sha", "repo_url"],
         },
@@ -270,16 +272,146 @@ TOOL_DEFINITIONS: list[dict[str, Any]] = [
 ]
 
 
+# Lookup tables built once at import
+_TOOLS_BY_NAME: dict[str, dict[str, Any]] = {tool["name"]: tool for tool in TOOL_DEFINITIONS}
+_TOOL_NAMES: tuple[str, ...] = tuple(_TOOLS_BY_NAME)
+
+# Compact, byte-stable serialization for HTTP responses and prompt caching
+_TOOL_DEFINITIONS_JSON: bytes = json.dumps(TOOL_DEFINITIONS, separators=(",", ":")).encode()
+
+_ToolValidator = Callable[[dict[str, Any]], tuple[bool, str | None]]
+_ValueCheck = Callable[[Any], str | None]
+
+# JSON Schema "type" -> Python type of the decoded JSON value
+_JSON_TYPES: dict[str, type] = {
+    "string": str,
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+def _is_json_type(value: Any, python_type: type | None) -> bool:
+    """Check a decoded JSON value against a schema type (bools are not integers)."""
+    if python_type is None:
+        return True
+    if python_type is int and isinstance(value, bool):
+        return False
+    return isinstance(value, python_type)
+
+
+def _build_value_check(param: str, schema: dict[str, Any]) -> _ValueCheck:
+    """Build a check for one parameter's type, enum and array item constraints.
+
+    Args:
+        param: Parameter name, used in error messages
+        schema: The parameter's JSON Schema
+
+    Returns:
+        Function returning an error message for an invalid value, None otherwise
+    """
+    expected = schema.get("type")
+    python_type = _JSON_TYPES.get(expected)
+    allowed_values = tuple(schema.get("enum", ()))
+    expected_item = schema.get("items", {}).get("type") if expected == "array" else None
+    item_type = _JSON_TYPES.get(expected_item)
+
+    type_error = f"Invalid type for parameter {param}: expected {expected}"
+    enum_error = (
+        f"Invalid value for parameter {param}: "
+        f"must be one of {', '.join(map(str, allowed_values))}"
+    )
+    item_error = f"Invalid item in parameter {param}: expected {expected_item}"
+
+    def _check(value: Any) -> str | None:
+        if not _is_json_type(value, python_type):
+            return type_error
+        if allowed_values and value not in allowed_values:
+            return enum_error
+        if item_type is not None and not all(_is_json_type(item, item_type) for item in value):
+            return item_error
+        return None
+
+    return _check
+
+
+def _build_validator(tool: dict[str, Any]) -> _ToolValidator:
+    """Build an argument validator specialized to one tool's parameter schema.
+
+    Args:
+        tool: Tool definition
+
+    Returns:
+        Function mapping tool arguments to (is_valid, error_message)
+    """
+    properties = tool["parameters"]["properties"]
+    required_order = tuple(tool["parameters"].get("required", ()))
+    required = frozenset(required_order)
+    allowed = frozenset(properties)
+    value_checks = {
+        param: _build_value_check(param, schema) for param, schema in properties.items()
+    }
+
+    def _check_values(arguments: dict[str, Any]) -> tuple[bool, str | None]:
+        for param, value in arguments.items():
+            error = value_checks[param](value)
+            if error is not None:
+                return False, error
+        return True, None
+
+    if not required:
+
+        def _validate(arguments: dict[str, Any]) -> tuple[bool, str | None]:
+            unexpected = arguments.keys() - allowed
+            if unexpected:
+                return False, f"Unexpected parameters: {', '.join(unexpected)}"
+            return _check_values(arguments)
+
+        return _validate
+
+    def _validate_with_required(arguments: dict[str, Any]) -> tuple[bool, str | None]:
+        # Report the first missing parameter in schema order
+        if not required <= arguments.keys():
+            missing = next(param for param in required_order if param not in arguments)
+            return False, f"Missing required parameter: {missing}"
+
+        unexpected = arguments.keys() - allowed
+        if unexpected:
+            return False, f"Unexpected parameters: {', '.join(unexpected)}"
+        return _check_values(arguments)
+
+    return _validate_with_required
+
+
+_TOOL_VALIDATORS: dict[str, _ToolValidator] = {
+    tool["name"]: _build_validator(tool) for tool in TOOL_DEFINITIONS
+}
+
+
 def get_tool_definitions() -> list[dict[str, Any]]:
     """Get all tool definitions.
 
     Returns:
         List of tool definitions in OpenAI/Anthropic function calling format.
         Each definition includes name, description, and parameter schema.
+        The list is shared and must be treated as read-only.
     """
     return TOOL_DEFINITIONS
 
 
+def get_tool_definitions_json() -> bytes:
+    """Get all tool definitions serialized as compact JSON.
+
+    The bytes are produced once at import, so repeated calls return an
+    identical payload.
+
+    Returns:
+        JSON array of tool definitions, UTF-8 encoded.
+    """
+    return _TOOL_DEFINITIONS_JSON
+
+
 def get_tool_by_name(name: str) -> dict[str, Any] | None:
     """Get a specific tool definition by name.
 
@@ -289,10 +421,7 @@ def get_tool_by_name(name: str) -> dict[str, Any] | None:
     Returns:
         Tool definition dict if found, None otherwise.
     """
-    for tool in TOOL_DEFINITIONS:
-        if tool["name"] == name:
-            return tool
-    return None
+    return _TOOLS_BY_NAME.get(name)
 
 
 def list_tool_names() -> list[str]:
@@ -301,7 +430,8 @@ def list_tool_names() -> list[str]:
     Returns:
         List of tool names.
     """
-    return [tool["name"] for tool in TOOL_DEFINITIONS]
+    # Copy so callers can't mutate the shared name table
+    return list(_TOOL_NAMES)
 
 
 def validate_tool_call(name: str, arguments: dict[str, Any]) -> tuple[bool, str | None]:
@@ -316,21 +446,8 @@ def validate_tool_call(name: str, arguments: dict[str, Any]) -> tuple[bool, str
         - is_valid: True if tool call is valid
         - error_message: None if valid, error description if invalid
     """
-    tool = get_tool_by_name(name)
-    if not tool:
+    validator = _TOOL_VALIDATORS.get(name)
+    if validator is None:
         return False, f"Unknown tool: {name}"
 
-    # Check required parameters
-    required_params = tool["parameters"].get("required", [])
-    for param in required_params:
-        if param not in arguments:
-            return False, f"Missing required parameter: {param}"
-
-    # Check for unexpected parameters
-    allowed_params = set(tool["parameters"]["properties"].keys())
-    provided_params = set(arguments.keys())
-    unexpected = provided_params - allowed_params
-    if unexpected:
-        return False, f"Unexpected parameters: {', '.join(unexpected)}"
-
-    return True, None
+    return validator(arguments)
@@ -10,6 +10,17 @@ Usage:
     python -m src.cli query "Resources | limit 10"  # KQL query
 """
 
-from src.cli.main import app
+from typing import Any
 
 __all__ = ["app"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the Typer app on first access so importing the package doesn't
+    # pull in Typer, Rich and the HTTP client
+    if name == "app":
+        from src.cli.main import app
+
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,8 +10,13 @@ Infra-Aware RAG system, allowing users to:
 import asyncio
 import json
 import os
-import subprocess
 import sys
+import tempfile
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 import httpx
@@ -21,6 +26,7 @@ from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.spinner import Spinner
+from rich.style import Style
 from rich.syntax import Syntax
 from rich.table import Table
 from rich.text import Text
@@ -41,35 +47,163 @@ def get_api_base_url() -> str:
     return os.getenv("INFRA_RAG_API_URL", DEFAULT_API_BASE_URL)
 
 
+# Azure CLI access tokens are cached on disk between CLI invocations
+TOKEN_RESOURCE = "https://management.azure.com/"
+TOKEN_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "infra-rag" / "token.json"
+)
+# Refresh cached tokens this long before they expire
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+# Azure CLI rewrites its profile on login, logout and account/tenant switches;
+# a cached token is only reused while the profile is unchanged
+AZURE_PROFILE_PATH = (
+    Path(os.getenv("AZURE_CONFIG_DIR") or Path.home() / ".azure") / "azureProfile.json"
+)
+
+
+def _azure_profile_version() -> int | None:
+    """Get the modification time of the Azure CLI profile, or None if it is missing."""
+    try:
+        return AZURE_PROFILE_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_cached_token() -> str | None:
+    """Return the cached access token if it is still valid for long enough.
+
+    Tokens cached under a different Azure CLI profile (another user, tenant
+    or subscription, or a logout since) are ignored.
+    """
+    try:
+        cached = json.loads(TOKEN_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get("resource") != TOKEN_RESOURCE:
+        return None
+    if cached.get("profile") != _azure_profile_version():
+        return None
+    expires_on = cached.get("expires_on")
+    if not isinstance(expires_on, (int, float)):
+        return None
+    if expires_on - time.time() <= TOKEN_EXPIRY_MARGIN_SECONDS:
+        return None
+    return cached.get("token") or None
+
+
+def _write_cached_token(token: str, expires_on: float, profile: int | None) -> None:
+    """Atomically write the access token cache, readable only by the current user."""
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=TOKEN_CACHE_PATH.parent, prefix=".token-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "resource": TOKEN_RESOURCE,
+                        "token": token,
+                        "expires_on": expires_on,
+                        "profile": profile,
+                    },
+                    f,
+                )
+            os.replace(tmp_path, TOKEN_CACHE_PATH)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # Caching is best-effort; the next invocation will ask Azure CLI again
+        pass
+
+
+def _parse_token_expiry(payload: dict[str, Any]) -> float | None:
+    """Get a token's expiry as a Unix timestamp from `az account get-access-token` output.
+
+    Newer Azure CLI versions include `expires_on` (epoch seconds); older ones
+    only have `expiresOn`, a naive local-time timestamp.
+    """
+    expires_on = payload.get("expires_on")
+    if expires_on is not None:
+        try:
+            return float(expires_on)
+        except (TypeError, ValueError):
+            return None
+
+    try:
+        return datetime.fromisoformat(payload["expiresOn"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def _az(*args: str, timeout: float = 10) -> tuple[int, str]:
+    """Run an Azure CLI command without blocking the event loop.
+
+    Args:
+        *args: Arguments passed to ``az``
+        timeout: Seconds to wait before killing the process
+
+    Returns:
+        Tuple of (return code, decoded stdout)
+
+    Raises:
+        FileNotFoundError: If Azure CLI is not installed
+        TimeoutError: If the command does not finish in time
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "az",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout.decode()
+
+
 async def get_token() -> str:
     """Get authentication token using Azure CLI.
 
+    Tokens are cached in TOKEN_CACHE_PATH until shortly before they expire
+    or the Azure CLI profile changes, so most invocations don't need to run
+    Azure CLI at all.
+
     Falls back to returning an empty string if Azure CLI is not available
     or not logged in, which allows local development without auth.
 
     Returns:
         Bearer token string, or empty string if not available
     """
+    cached = _read_cached_token()
+    if cached:
+        return cached
+
+    # Read before asking for the token, so a concurrent login invalidates it
+    profile = _azure_profile_version()
     try:
-        result = subprocess.run(
-            [
-                "az",
-                "account",
-                "get-access-token",
-                "--resource",
-                "https://management.azure.com/",
-                "--query",
-                "accessToken",
-                "-o",
-                "tsv",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
+        returncode, stdout = await _az(
+            "account", "get-access-token", "--resource", TOKEN_RESOURCE, "-o", "json", timeout=30
         )
 
-        if result.returncode == 0:
-            return result.stdout.strip()
+        if returncode == 0:
+            try:
+                payload = json.loads(stdout)
+                token = payload["accessToken"]
+            except (ValueError, KeyError, TypeError):
+                console.print(
+                    "[yellow]Warning: Could not parse Azure CLI token. "
+                    "Running without authentication.[/yellow]"
+                )
+                return ""
+
+            expires_on = _parse_token_expiry(payload)
+            if expires_on is not None:
+                _write_cached_token(token, expires_on, profile)
+            return token
         else:
             console.print(
                 "[yellow]Warning: Could not get Azure CLI token. "
@@ -83,7 +217,7 @@ async def get_token() -> str:
             "Running without authentication.[/yellow]"
         )
         return ""
-    except subprocess.TimeoutExpired:
+    except TimeoutError:
         console.print(
             "[yellow]Warning: Azure CLI timed out. "
             "Running without authentication.[/yellow]"
@@ -91,6 +225,56 @@ async def get_token() -> str:
         return ""
 
 
+# Chat turns can run several tool calls server-side; other requests are quick
+CHAT_TIMEOUT_SECONDS = 120.0
+REQUEST_TIMEOUT_SECONDS = 60.0
+
+# Frame rate of the single-query live Markdown view
+LIVE_REFRESH_PER_SECOND = 10
+
+# Resource Graph rows are streamed as newline-delimited JSON
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows shown in Resource Graph table output
+TABLE_MAX_ROWS = 50
+# Longer table cell values are truncated with "..."
+TABLE_CELL_MAX_LENGTH = 50
+# Characters of content shown per search result
+SEARCH_SNIPPET_LENGTH = 500
+
+# Search result panels are built from Text with these prebuilt styles so that
+# result content is never run through Rich's markup parser
+_SEARCH_BORDER_STYLE = Style(color="green")
+_SEARCH_SCORE_STYLE = Style(dim=True)
+
+# Styles for printing server-supplied text (error messages, tool names), which
+# is passed with markup=False so brackets in it are neither parsed nor mangled
+_ERROR_STYLE = Style(color="red")
+_TOOL_STYLE = Style(color="yellow")
+
+# Prefix of the SSE lines that carry a JSON payload
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DATA_PREFIX_LEN = len(_SSE_DATA_PREFIX)
+
+# Interactive chat writes buffered tokens once this much text or time accumulates
+TOKEN_FLUSH_CHARS = 512
+TOKEN_FLUSH_SECONDS = 0.05
+
+# Connections stay open between requests within a command (e.g. across
+# interactive chat turns)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60.0)
+
+
+def _create_client(timeout: float, headers: dict[str, str] | None = None) -> httpx.AsyncClient:
+    """Create the HTTP client used for API requests within one command.
+
+    Args:
+        timeout: Default request timeout in seconds
+        headers: Headers sent with every request (see get_headers), set once
+            here rather than passed to each call
+    """
+    return httpx.AsyncClient(timeout=timeout, limits=HTTP_LIMITS, headers=headers)
+
+
 def get_headers(token: str) -> dict[str, str]:
     """Get request headers including authorization if token is available."""
     headers = {"Content-Type": "application/json"}
@@ -99,6 +283,109 @@ def get_headers(token: str) -> dict[str, str]:
     return headers
 
 
+class _TokenWriter:
+    """Batch streamed answer tokens into fewer console writes.
+
+    Tokens are written as plain text: model output is not Rich markup, and
+    parsing it as markup would mangle text like "[bold]" or "[1]".
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        max_chars: int = TOKEN_FLUSH_CHARS,
+        max_delay: float = TOKEN_FLUSH_SECONDS,
+    ):
+        self.console = console
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        """Buffer a token, flushing once enough text or time has accumulated."""
+        if not text:
+            return
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if (
+            self._pending_chars >= self.max_chars
+            or time.monotonic() - self._last_flush >= self.max_delay
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any buffered tokens to the console."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        self.console.print("".join(self._pending), end="", markup=False, highlight=False)
+        self._pending.clear()
+        self._pending_chars = 0
+
+
+async def _iter_response_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield the lines of a streamed response body as bytes, without line endings.
+
+    The stream is split on raw bytes so no intermediate str is built per line.
+    A final line without a trailing newline is still yielded.
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            yield bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+        del buffer[:start]
+
+    if buffer:
+        yield bytes(buffer).rstrip(b"\r")
+
+
+async def _iter_sse_events(response: httpx.Response) -> AsyncIterator[dict[str, Any]]:
+    """Yield the decoded JSON payload of each `data:` frame in an SSE stream.
+
+    Payloads are decoded straight from bytes. Blank separator lines, other
+    SSE fields and malformed payloads are skipped.
+    """
+    async for line in _iter_response_lines(response):
+        data = _decode_sse_line(line)
+        if data is not None:
+            yield data
+
+
+async def _iter_ndjson_rows(response: httpx.Response) -> AsyncIterator[dict[str, Any]]:
+    """Yield each row of a newline-delimited JSON response as it arrives.
+
+    Raises:
+        ValueError: If a line is not valid JSON, or the server ends the stream
+            with an `{"error": ...}` line because the query failed partway
+    """
+    async for line in _iter_response_lines(response):
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise ValueError("Malformed response from API") from e
+        if isinstance(row, dict) and row.keys() == {"error"}:
+            raise ValueError(str(row["error"]))
+        yield row
+
+
+def _decode_sse_line(line: bytes) -> dict[str, Any] | None:
+    """Decode one SSE line's `data:` payload, or None if there is nothing to yield."""
+    # Most non-data lines are the blank frame separators
+    if not line or line[:_SSE_DATA_PREFIX_LEN] != _SSE_DATA_PREFIX:
+        return None
+    try:
+        return json.loads(line[_SSE_DATA_PREFIX_LEN:])
+    except ValueError:
+        return None
+
+
 @app.command()
 def chat(
     query: str = typer.Argument(
@@ -118,6 +405,12 @@ def chat(
         help="API base URL (overrides INFRA_RAG_API_URL env var)",
         envvar="INFRA_RAG_API_URL",
     ),
+    stream: bool = typer.Option(
+        True,
+        "--stream/--no-stream",
+        help="Render the answer live, or print the raw response once it completes "
+        "(single query only)",
+    ),
 ) -> None:
     """Start an interactive chat session or ask a single question.
 
@@ -125,105 +418,148 @@ def chat(
         infra-rag chat                          # Interactive mode
         infra-rag chat "List all VMs"           # Single query
         infra-rag chat -s <sub-id> "List VMs"   # Filter by subscription
+        infra-rag chat --no-stream "List VMs" > answer.md
     """
     base_url = api_url or get_api_base_url()
 
     if query:
         # Single query mode
-        asyncio.run(_single_query(query, subscription, base_url))
+        asyncio.run(_single_query(query, subscription, base_url, stream=stream))
     else:
         # Interactive mode
         asyncio.run(_interactive_chat(subscription, base_url))
 
 
+def _new_conversation(subscription: str | None) -> tuple[str, dict[str, Any]]:
+    """Generate a conversation ID and the request that creates it with its first message.
+
+    Sending the creation request inline with the first message saves a
+    separate POST /conversations round-trip before the answer can start.
+
+    Returns:
+        Tuple of (conversation ID, ``conversation`` field for the message body)
+    """
+    metadata: dict[str, Any] = {}
+    if subscription:
+        metadata["subscription"] = subscription
+    return uuid.uuid4().hex, {"metadata": metadata or None}
+
+
+def _print_send_error(error: httpx.HTTPStatusError) -> None:
+    """Report a failed message request, with a login hint for auth failures."""
+    console.print(f"[red]Error sending message: {error.response.status_code}[/red]")
+    if error.response.status_code == 401:
+        console.print("[yellow]Try running 'az login' to authenticate.[/yellow]")
+
+
 async def _single_query(
     query: str,
     subscription: str | None,
     base_url: str,
+    stream: bool = True,
 ) -> None:
-    """Execute a single query and display the result."""
+    """Execute a single query and display the result.
+
+    With stream=False the complete response is fetched as one JSON document
+    and its content written to stdout as-is, skipping SSE parsing and Rich
+    rendering; this suits redirecting the answer to a file.
+    """
     token = await get_token()
-    headers = get_headers(token)
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        # Create conversation
-        try:
-            metadata: dict[str, Any] = {}
-            if subscription:
-                metadata["subscription"] = subscription
-
-            conv_resp = await client.post(
-                f"{base_url}/conversations",
-                headers=headers,
-                json={"metadata": metadata} if metadata else None,
-            )
-            conv_resp.raise_for_status()
-            conv_id = conv_resp.json()["id"]
-        except httpx.HTTPStatusError as e:
-            console.print(f"[red]Error creating conversation: {e.response.status_code}[/red]")
-            if e.response.status_code == 401:
-                console.print("[yellow]Try running 'az login' to authenticate.[/yellow]")
-            raise typer.Exit(1)
-        except httpx.ConnectError:
-            console.print(f"[red]Could not connect to API at {base_url}[/red]")
-            console.print("[yellow]Make sure the API server is running.[/yellow]")
-            raise typer.Exit(1)
+    # The conversation is created by the server along with the message
+    conv_id, conversation = _new_conversation(subscription)
+    url = f"{base_url}/conversations/{conv_id}/messages"
+
+    async with _create_client(CHAT_TIMEOUT_SECONDS, get_headers(token)) as client:
+        if not stream:
+            try:
+                response = await client.post(
+                    url,
+                    json={"content": query, "stream": False, "conversation": conversation},
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                _print_send_error(e)
+                raise typer.Exit(1)
+            except httpx.ConnectError:
+                console.print(f"[red]Could not connect to API at {base_url}[/red]")
+                console.print("[yellow]Make sure the API server is running.[/yellow]")
+                raise typer.Exit(1)
+
+            sys.stdout.write(response.json().get("content", "") + "\n")
+            return
 
         # Send message with streaming
         console.print()
         response_text = ""
         tool_calls_displayed: set[str] = set()
 
+        # Markdown is re-parsed from the full text on every render, so only
+        # rebuild it once per refresh interval rather than once per token
+        last_render = 0.0
+        rendered_text: str | None = None
+
         with Live(
             Spinner("dots", text="Thinking..."),
-            refresh_per_second=10,
+            refresh_per_second=LIVE_REFRESH_PER_SECOND,
             console=console,
         ) as live:
             try:
                 async with client.stream(
                     "POST",
-                    f"{base_url}/conversations/{conv_id}/messages",
-                    headers=headers,
-                    json={"content": query, "stream": True},
-                    timeout=120.0,
+                    url,
+                    json={"content": query, "stream": True, "conversation": conversation},
+                    timeout=CHAT_TIMEOUT_SECONDS,
                 ) as response:
                     response.raise_for_status()
 
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            try:
-                                data = json.loads(line[6:])
-                            except json.JSONDecodeError:
-                                continue
+                    async for data in _iter_sse_events(response):
+                        event_type = data.get("type")
 
-                            if data.get("type") == "token":
-                                response_text += data.get("content", "")
+                        if event_type == "token":
+                            response_text += data.get("content", "")
+                            now = time.monotonic()
+                            if now - last_render >= 1 / LIVE_REFRESH_PER_SECOND:
                                 live.update(Markdown(response_text))
-
-                            elif data.get("type") == "tool_call":
-                                tool_call = data.get("tool_call", {})
-                                tool_name = tool_call.get("name", "unknown")
-                                if tool_name not in tool_calls_displayed:
-                                    tool_calls_displayed.add(tool_name)
-                                    live.update(
-                                        Panel(
-                                            f"Using tool: [bold]{tool_name}[/bold]",
-                                            title="Tool",
-                                            border_style="yellow",
-                                        )
+                                last_render = now
+                                rendered_text = response_text
+
+                        elif event_type == "tool_call":
+                            tool_call = data.get("tool_call", {})
+                            tool_name = tool_call.get("name", "unknown")
+                            if tool_name not in tool_calls_displayed:
+                                tool_calls_displayed.add(tool_name)
+                                live.update(
+                                    Panel(
+                                        Text.assemble("Using tool: ", (tool_name, "bold")),
+                                        title="Tool",
+                                        border_style=_TOOL_STYLE,
                                     )
+                                )
 
-                            elif data.get("type") == "complete":
-                                live.update(Markdown(response_text))
+                        elif event_type == "complete":
+                            live.update(Markdown(response_text))
+                            rendered_text = response_text
 
-                            elif data.get("type") == "error":
-                                console.print(
-                                    f"[red]Error: {data.get('message', 'Unknown error')}[/red]"
-                                )
-                                raise typer.Exit(1)
+                        elif event_type == "error":
+                            console.print(
+                                f"Error: {data.get('message', 'Unknown error')}",
+                                style=_ERROR_STYLE,
+                                markup=False,
+                                highlight=False,
+                            )
+                            raise typer.Exit(1)
+
+                # Show any tokens that arrived after the last throttled render
+                if response_text and rendered_text != response_text:
+                    live.update(Markdown(response_text))
 
             except httpx.HTTPStatusError as e:
-                console.print(f"[red]Error sending message: {e.response.status_code}[/red]")
+                _print_send_error(e)
+                raise typer.Exit(1)
+            except httpx.ConnectError:
+                console.print(f"[red]Could not connect to API at {base_url}[/red]")
+                console.print("[yellow]Make sure the API server is running.[/yellow]")
                 raise typer.Exit(1)
 
         console.print()
@@ -247,10 +583,11 @@ async def _interactive_chat(
     )
 
     token = await get_token()
-    headers = get_headers(token)
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
+    async with _create_client(CHAT_TIMEOUT_SECONDS, get_headers(token)) as client:
         conv_id: str | None = None
+        # Creation request sent with messages until the conversation exists
+        conversation: dict[str, Any] | None = None
 
         while True:
             console.print()
@@ -274,79 +611,70 @@ async def _interactive_chat(
             if not query.strip():
                 continue
 
-            # Create conversation if needed
+            # Start a conversation if needed; the server creates it with the message
             if not conv_id:
-                try:
-                    metadata: dict[str, Any] = {}
-                    if subscription:
-                        metadata["subscription"] = subscription
-
-                    conv_resp = await client.post(
-                        f"{base_url}/conversations",
-                        headers=headers,
-                        json={"metadata": metadata} if metadata else None,
-                    )
-                    conv_resp.raise_for_status()
-                    conv_id = conv_resp.json()["id"]
-                except httpx.HTTPStatusError as e:
-                    console.print(
-                        f"[red]Error creating conversation: {e.response.status_code}[/red]"
-                    )
-                    if e.response.status_code == 401:
-                        console.print("[yellow]Try running 'az login' to authenticate.[/yellow]")
-                    continue
-                except httpx.ConnectError:
-                    console.print(f"[red]Could not connect to API at {base_url}[/red]")
-                    continue
+                conv_id, conversation = _new_conversation(subscription)
+
+            body: dict[str, Any] = {"content": query, "stream": True}
+            if conversation is not None:
+                body["conversation"] = conversation
 
             # Send message
             console.print()
             console.print("[bold purple]Assistant:[/bold purple]")
 
-            response_text = ""
+            tokens = _TokenWriter(console)
 
             try:
                 async with client.stream(
                     "POST",
                     f"{base_url}/conversations/{conv_id}/messages",
-                    headers=headers,
-                    json={"content": query, "stream": True},
-                    timeout=120.0,
+                    json=body,
+                    timeout=CHAT_TIMEOUT_SECONDS,
                 ) as response:
                     response.raise_for_status()
-
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            try:
-                                data = json.loads(line[6:])
-                            except json.JSONDecodeError:
-                                continue
-
-                            if data.get("type") == "token":
-                                content = data.get("content", "")
-                                console.print(content, end="")
-                                response_text += content
-
-                            elif data.get("type") == "tool_call":
-                                tool_call = data.get("tool_call", {})
-                                tool_name = tool_call.get("name", "unknown")
-                                console.print(
-                                    f"\n[yellow]-> Using: {tool_name}[/yellow]",
-                                    end="",
-                                )
-
-                            elif data.get("type") == "complete":
-                                console.print()  # Newline
-
-                            elif data.get("type") == "error":
-                                console.print(
-                                    f"\n[red]Error: {data.get('message', 'Unknown error')}[/red]"
-                                )
+                    conversation = None
+
+                    async for data in _iter_sse_events(response):
+                        event_type = data.get("type")
+
+                        if event_type == "token":
+                            tokens.write(data.get("content", ""))
+                            continue
+
+                        # Keep buffered answer text ahead of any status output
+                        tokens.flush()
+
+                        if event_type == "tool_call":
+                            tool_call = data.get("tool_call", {})
+                            tool_name = tool_call.get("name", "unknown")
+                            console.print(
+                                f"\n-> Using: {tool_name}",
+                                style=_TOOL_STYLE,
+                                markup=False,
+                                highlight=False,
+                                end="",
+                            )
+
+                        elif event_type == "complete":
+                            console.print()  # Newline
+
+                        elif event_type == "error":
+                            console.print(
+                                f"\nError: {data.get('message', 'Unknown error')}",
+                                style=_ERROR_STYLE,
+                                markup=False,
+                                highlight=False,
+                            )
 
             except httpx.HTTPStatusError as e:
                 console.print(f"\n[red]Error: {e.response.status_code}[/red]")
+                if e.response.status_code == 401:
+                    console.print("[yellow]Try running 'az login' to authenticate.[/yellow]")
             except httpx.ConnectError:
                 console.print(f"\n[red]Connection lost[/red]")
+            finally:
+                tokens.flush()
 
 
 @app.command()
@@ -398,21 +726,21 @@ async def _search(
 ) -> None:
     """Execute a direct search."""
     token = await get_token()
-    headers = get_headers(token)
 
     body: dict[str, Any] = {
         "query": query,
         "top": limit,
         "mode": mode,
+        # The server truncates long content so it isn't transferred in full
+        "snippet_length": SEARCH_SNIPPET_LENGTH,
     }
     if doc_type:
         body["doc_types"] = [doc_type]
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with _create_client(REQUEST_TIMEOUT_SECONDS, get_headers(token)) as client:
         try:
             response = await client.post(
                 f"{base_url}/search",
-                headers=headers,
                 json=body,
             )
             response.raise_for_status()
@@ -436,10 +764,8 @@ async def _search(
         return
 
     for i, result in enumerate(results, 1):
+        # Content arrives already truncated to SEARCH_SNIPPET_LENGTH
         content = result.get("content", "")
-        # Truncate long content
-        if len(content) > 500:
-            content = content[:500] + "..."
 
         doc_type_str = result.get("doc_type", "unknown")
         score = result.get("score", 0)
@@ -449,20 +775,18 @@ async def _search(
         resource_id = metadata.get("resource_id", "")
         address = metadata.get("address", "")
 
-        title_parts = [f"[{i}] {doc_type_str}"]
-        if score:
-            title_parts.append(f"Score: {score:.3f}")
-
         subtitle = resource_id or address or result.get("id", "")
 
-        panel_title = " | ".join(title_parts)
+        panel_title = Text(f"[{i}] {doc_type_str}")
+        if score:
+            panel_title.append(f" | Score: {score:.3f}", style=_SEARCH_SCORE_STYLE)
 
         console.print(
             Panel(
-                content,
+                Text(content),
                 title=panel_title,
-                subtitle=subtitle[:80] if subtitle else None,
-                border_style="green",
+                subtitle=Text(subtitle[:80]) if subtitle else None,
+                border_style=_SEARCH_BORDER_STYLE,
             )
         )
 
@@ -509,35 +833,57 @@ async def _resource_graph_query(
 ) -> None:
     """Execute Resource Graph query."""
     token = await get_token()
-    headers = get_headers(token)
 
     body: dict[str, Any] = {"query": kql}
     if subscriptions:
         body["subscriptions"] = subscriptions
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    # Rows are streamed as NDJSON; table output only keeps the rows it displays
+    keep_all = output_format == "json"
+    results: list[dict[str, Any]] = []
+    total = 0
+
+    async with _create_client(REQUEST_TIMEOUT_SECONDS, get_headers(token)) as client:
         try:
-            response = await client.post(
+            async with client.stream(
+                "POST",
                 f"{base_url}/resources/resource-graph/query",
-                headers=headers,
+                headers={"Accept": NDJSON_MEDIA_TYPE},
                 json=body,
-            )
-            response.raise_for_status()
-            data = response.json()
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for row in _iter_ndjson_rows(response):
+                    total += 1
+                    if output_format == "raw":
+                        # Output minimal format
+                        console.print(row)
+                    elif keep_all or total <= TABLE_MAX_ROWS:
+                        results.append(row)
         except httpx.HTTPStatusError as e:
             console.print(f"[red]Query failed: {e.response.status_code}[/red]")
             try:
                 error_detail = e.response.json().get("detail", "Unknown error")
-                console.print(f"[red]{error_detail}[/red]")
+                console.print(
+                    str(error_detail), style=_ERROR_STYLE, markup=False, highlight=False
+                )
             except Exception:
                 pass
             raise typer.Exit(1)
         except httpx.ConnectError:
             console.print(f"[red]Could not connect to API at {base_url}[/red]")
             raise typer.Exit(1)
-
-    results = data.get("results", [])
-    total = data.get("total_records", len(results))
+        except ValueError as e:
+            # The stream broke off; don't present the partial rows as a result
+            console.print(
+                f"Query failed after {total} row(s): {e}",
+                style=_ERROR_STYLE,
+                markup=False,
+                highlight=False,
+            )
+            raise typer.Exit(1) from e
 
     if output_format == "json":
         # Output raw JSON
@@ -545,9 +891,6 @@ async def _resource_graph_query(
         return
 
     if output_format == "raw":
-        # Output minimal format
-        for row in results:
-            console.print(row)
         return
 
     # Table output
@@ -561,30 +904,28 @@ async def _resource_graph_query(
     table = Table(show_header=True, header_style="bold cyan")
 
     # Get columns from first result
-    if results:
-        columns = list(results[0].keys())
-        for col in columns:
-            table.add_column(col)
-
-        # Add rows (limit display to 50)
-        display_results = results[:50]
-        for row in display_results:
-            values = []
-            for col in columns:
-                val = row.get(col, "")
-                # Truncate long values
-                str_val = str(val) if val is not None else ""
-                if len(str_val) > 50:
-                    str_val = str_val[:47] + "..."
-                values.append(str_val)
-            table.add_row(*values)
-
-        console.print(table)
-
-        if len(results) > 50:
-            console.print(f"\n[dim]Showing 50 of {total} results[/dim]")
-        else:
-            console.print(f"\n[dim]{total} result(s)[/dim]")
+    columns = tuple(results[0])
+    for col in columns:
+        table.add_column(col)
+
+    # Add rows (limited to TABLE_MAX_ROWS while streaming)
+    for row in results:
+        table.add_row(*[_format_cell(row.get(col)) for col in columns])
+
+    console.print(table)
+
+    if total > TABLE_MAX_ROWS:
+        console.print(f"\n[dim]Showing {TABLE_MAX_ROWS} of {total} results[/dim]")
+    else:
+        console.print(f"\n[dim]{total} result(s)[/dim]")
+
+
+def _format_cell(value: Any) -> str:
+    """Format a Resource Graph value for a table cell, truncating long values."""
+    text = "" if value is None else str(value)
+    if len(text) > TABLE_CELL_MAX_LENGTH:
+        return text[: TABLE_CELL_MAX_LENGTH - 3] + "..."
+    return text
 
 
 @app.command()
@@ -616,18 +957,12 @@ def config() -> None:
 
     # Check Azure CLI status
     try:
-        result = subprocess.run(
-            ["az", "account", "show", "--query", "name", "-o", "tsv"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            account = result.stdout.strip()
-            table.add_row("Azure Account", account, "az cli")
+        returncode, stdout = asyncio.run(_az("account", "show", "--query", "name", "-o", "tsv"))
+        if returncode == 0:
+            table.add_row("Azure Account", stdout.strip(), "az cli")
         else:
             table.add_row("Azure Account", "[yellow]Not logged in[/yellow]", "az cli")
-    except (FileNotFoundError, subprocess.TimeoutExpired):
+    except (TimeoutError, FileNotFoundError):
         table.add_row("Azure Account", "[red]CLI not available[/red]", "-")
 
     console.print(table)
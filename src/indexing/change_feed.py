@@ -2,21 +2,72 @@
 
 import asyncio
 import logging
+import random
+import time
+from collections import deque
 from datetime import UTC, datetime
 from typing import Any, Callable
 
+from azure.core import MatchConditions
 from azure.cosmos.aio import CosmosClient
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
 
 from src.indexing.orchestrator import IndexingOrchestrator, IndexingStats
 
 logger = logging.getLogger(__name__)
 
+# Change feed pages read ahead of the batches being indexed
+FETCH_QUEUE_SIZE = 2
+
+# Batches allowed in flight per concurrency slot. Bounds how far indexing runs
+# ahead of an earlier batch that keeps failing and holding back the checkpoint
+IN_FLIGHT_BATCHES_PER_SLOT = 2
+
+# A change feed page: changed documents and the continuation token after them
+_Page = tuple[list[dict[str, Any]], str | None]
+
+
+def _document_key(doc: dict[str, Any]) -> Any:
+    """Identify a document across its versions in the change feed.
+
+    The resource ID (_rid) is used where present since, unlike id, it is
+    unique across partitions.
+    """
+    return doc.get("_rid") or doc.get("id")
+
+
+def _latest_versions(changes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Drop all but the last version of each document in a change feed batch.
+
+    A document updated several times between reads can appear more than once
+    in a batch; only its latest version needs chunking and embedding.
+
+    Args:
+        changes: Changed documents in change feed order
+
+    Returns:
+        One version per document, in order of each document's first appearance
+    """
+    latest = {_document_key(doc): doc for doc in changes}
+    if len(latest) == len(changes):
+        return changes
+    return list(latest.values())
+
 
 class ChangeFeedProcessor:
     """Processes Cosmos DB change feed to trigger indexing of new/modified documents.
 
     The change feed provides a real-time stream of changes to documents in a
     Cosmos DB container, enabling incremental indexing as documents are ingested.
+
+    The Python Cosmos SDK has no push-based change feed processor, so the feed
+    is pulled here: non-empty pages are followed immediately by the next read,
+    and the processor only sleeps when the feed is drained.
     """
 
     def __init__(
@@ -29,6 +80,11 @@ class ChangeFeedProcessor:
         processor_name: str = "indexing-processor",
         max_items_per_batch: int = 100,
         poll_interval: float = 5.0,
+        min_poll_interval: float = 0.1,
+        max_poll_interval: float = 60.0,
+        max_concurrent_batches: int = 4,
+        checkpoint_every_batches: int = 8,
+        checkpoint_max_seconds: float = 5.0,
     ):
         """Initialize change feed processor.
 
@@ -40,7 +96,19 @@ class ChangeFeedProcessor:
             indexing_orchestrator: Orchestrator for processing documents
             processor_name: Unique name for this processor
             max_items_per_batch: Maximum documents to process in one batch
-            poll_interval: Seconds to wait between polls
+            poll_interval: Initial seconds to wait between polls of an idle feed
+            min_poll_interval: Lower bound for the adaptive poll interval
+            max_poll_interval: Upper bound for the adaptive poll interval
+            max_concurrent_batches: Maximum batches being indexed at once
+            checkpoint_every_batches: Save the continuation token after this
+                many batches
+            checkpoint_max_seconds: Save the continuation token once this many
+                seconds have passed since the last save, even if fewer batches
+                were processed
+
+        Checkpoints are coalesced, so after a crash up to
+        checkpoint_every_batches - 1 batches are read and indexed again. This
+        is safe because indexing is idempotent by document ID.
         """
         self.cosmos_client = cosmos_client
         self.database_name = database_name
@@ -50,6 +118,24 @@ class ChangeFeedProcessor:
         self.processor_name = processor_name
         self.max_items_per_batch = max_items_per_batch
         self.poll_interval = poll_interval
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.max_concurrent_batches = max_concurrent_batches
+        self.checkpoint_every_batches = checkpoint_every_batches
+        self.checkpoint_max_seconds = checkpoint_max_seconds
+
+        # Lease document fields that never change between checkpoints
+        self._lease_id = f"{processor_name}-continuation"
+        self._lease_base = {"id": self._lease_id, "processor_name": processor_name}
+
+        # ETag of the lease as last read or written by this processor; None
+        # until a lease exists
+        self._lease_etag: str | None = None
+
+        # Continuation token of the last indexed batch, not yet saved
+        self._pending_token: str | None = None
+        self._batches_since_checkpoint = 0
+        self._last_checkpoint = 0.0
 
         self.is_running = False
         self.total_processed = 0
@@ -69,7 +155,7 @@ class ChangeFeedProcessor:
             return
 
         self.is_running = True
-        logger.info(f"Starting change feed processor '{self.processor_name}'")
+        logger.info("Starting change feed processor '%s'", self.processor_name)
 
         database = self.cosmos_client.get_database_client(self.database_name)
         container = database.get_container_client(self.container_name)
@@ -77,65 +163,276 @@ class ChangeFeedProcessor:
 
         # Initialize continuation token storage
         continuation_token = await self._load_continuation_token(lease_container)
+        if not self.is_running:
+            # Stopped while the lease could not be read
+            return
+        self._last_checkpoint = time.monotonic()
+
+        # Reading the next page overlaps with indexing the current one; the
+        # bounded queue keeps the reader at most FETCH_QUEUE_SIZE pages ahead
+        queue: asyncio.Queue[_Page | None] = asyncio.Queue(maxsize=FETCH_QUEUE_SIZE)
+        await asyncio.gather(
+            self._fetch_loop(container, continuation_token, queue),
+            self._index_loop(lease_container, queue),
+        )
+
+        await self._checkpoint(lease_container)
+        logger.info("Change feed processor stopped")
+
+    async def _fetch_loop(
+        self,
+        container,
+        continuation_token: str | None,
+        queue: asyncio.Queue[_Page | None],
+    ):
+        """Read change feed pages onto the queue until the processor stops.
+
+        An empty page is queued as well so the indexer can checkpoint while the
+        feed is idle. None is queued last to end the index loop.
+
+        The wait between polls adapts to the feed: it doubles (up to
+        max_poll_interval) after each empty page or failed read and halves (down
+        to min_poll_interval) after each non-empty page. Pages with changes are
+        followed by the next read without waiting.
+
+        Args:
+            container: Source container
+            continuation_token: Token to resume reading from
+            queue: Queue of (changes, continuation token after them) pages
+        """
+        delay = self.poll_interval
 
         while self.is_running:
             try:
-                # Query change feed
-                response = container.query_items_change_feed(
-                    is_start_from_beginning=continuation_token is None,
-                    continuation=continuation_token,
-                    max_item_count=self.max_items_per_batch,
+                changes, continuation_token = await self._read_changes(
+                    container, continuation_token
                 )
-
-                # Process changes
-                changes = []
-                async for item in response:
-                    changes.append(item)
+                await queue.put((changes, continuation_token))
 
                 if changes:
-                    logger.info(f"Processing {len(changes)} changes from change feed")
+                    delay = max(self.min_poll_interval, delay / 2)
+                else:
+                    # Feed is drained, wait before polling again
+                    await asyncio.sleep(delay)
+                    delay = min(self.max_poll_interval, delay * 2)
 
-                    # Index the changed documents
-                    stats = await self.orchestrator.index_documents(changes)
+            except Exception as e:
+                self._record_error(e, "Error reading change feed")
 
-                    self.total_processed += stats.documents_processed
-                    self.total_errors += len(stats.errors)
+                # Wait before retrying
+                delay = min(self.max_poll_interval, delay * 2)
+                await asyncio.sleep(self._retry_delay(e, delay))
 
-                    logger.info(
-                        f"Batch complete: {stats.documents_processed} docs, "
-                        f"{stats.chunks_indexed} chunks indexed, "
-                        f"{len(stats.errors)} errors"
-                    )
+        await queue.put(None)
 
-                    # Invoke callback if registered
-                    if self.on_batch_processed:
-                        try:
-                            self.on_batch_processed(stats)
-                        except Exception as e:
-                            logger.error(f"Error in batch callback: {e}")
+    async def _index_loop(self, lease_container, queue: asyncio.Queue[_Page | None]):
+        """Index queued change feed pages and checkpoint progress.
 
-                    # Update continuation token
-                    continuation_token = response.headers.get("etag")
-                    await self._save_continuation_token(lease_container, continuation_token)
+        Up to max_concurrent_batches batches are indexed at once. A batch that
+        shares documents with one still in flight waits for it first, so an
+        older version can never overwrite a newer one in the index. The
+        checkpoint only advances past a batch once it and every batch read
+        before it have been indexed, and no new page is taken while
+        IN_FLIGHT_BATCHES_PER_SLOT * max_concurrent_batches batches are
+        waiting on it.
 
-                else:
-                    # No changes, wait before polling again
-                    await asyncio.sleep(self.poll_interval)
+        Args:
+            lease_container: Container for storing leases
+            queue: Queue of pages filled by _fetch_loop
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+        max_in_flight = IN_FLIGHT_BATCHES_PER_SLOT * self.max_concurrent_batches
+        # Batches in change feed order: (indexing task, document keys, token)
+        in_flight: deque[tuple[asyncio.Task[bool], set[Any], str | None]] = deque()
+
+        while (page := await queue.get()) is not None:
+            # Pages read ahead of a stop are left for the next run
+            if not self.is_running:
+                continue
+
+            changes, continuation_token = page
+            if not changes:
+                # Feed is drained: save progress while idle
+                await self._advance_checkpoint(lease_container, in_flight)
+                await self._checkpoint(lease_container)
+                continue
+
+            # The oldest batch is still being retried; wait for it rather than
+            # let later batches pile up behind the checkpoint
+            while len(in_flight) >= max_in_flight and self.is_running:
+                await asyncio.wait([in_flight[0][0]])
+                await self._advance_checkpoint(lease_container, in_flight)
+            if not self.is_running:
+                continue
+
+            keys = {_document_key(doc) for doc in changes}
+            overlapping = [task for task, batch_keys, _ in in_flight if batch_keys & keys]
+            if overlapping:
+                await asyncio.wait(overlapping)
+
+            await semaphore.acquire()
+            task = asyncio.create_task(self._index_batch_until_done(changes, semaphore))
+            in_flight.append((task, keys, continuation_token))
+            await self._advance_checkpoint(lease_container, in_flight)
+
+        if in_flight:
+            await asyncio.wait([task for task, _, _ in in_flight])
+            await self._advance_checkpoint(lease_container, in_flight)
+
+    async def _index_batch_until_done(
+        self, changes: list[dict[str, Any]], semaphore: asyncio.Semaphore
+    ) -> bool:
+        """Index a batch, retrying failures until it succeeds or the processor stops.
+
+        Args:
+            changes: Changed documents from the change feed
+            semaphore: Concurrency slot held by this batch, released when done
+
+        Returns:
+            True if the batch was indexed, False if the processor stopped first
+        """
+        try:
+            delay = self.poll_interval
+            while self.is_running:
+                try:
+                    await self._index_batch(changes)
+                    return True
+                except Exception as e:
+                    self._record_error(e, "Error indexing change feed batch")
+
+                    # Wait before retrying
+                    delay = min(self.max_poll_interval, delay * 2)
+                    await asyncio.sleep(self._retry_delay(e, delay))
+            return False
+        finally:
+            semaphore.release()
+
+    async def _advance_checkpoint(
+        self,
+        lease_container,
+        in_flight: deque[tuple[asyncio.Task[bool], set[Any], str | None]],
+    ):
+        """Move the pending checkpoint past the indexed prefix of in-flight batches.
+
+        Args:
+            lease_container: Container for storing leases
+            in_flight: Batches in change feed order; indexed ones at the front
+                are removed
+        """
+        while in_flight and in_flight[0][0].done():
+            task, _, continuation_token = in_flight[0]
+            # A batch abandoned at stop holds back everything after it
+            if not task.result():
+                break
 
+            in_flight.popleft()
+            self._pending_token = continuation_token
+            self._batches_since_checkpoint += 1
+
+        if (
+            self._batches_since_checkpoint >= self.checkpoint_every_batches
+            or time.monotonic() - self._last_checkpoint >= self.checkpoint_max_seconds
+        ):
+            await self._checkpoint(lease_container)
+
+    async def _index_batch(self, changes: list[dict[str, Any]]):
+        """Index one batch of changed documents and report its stats.
+
+        Args:
+            changes: Changed documents from the change feed
+        """
+        documents = _latest_versions(changes)
+        logger.info(
+            "Processing %d changes from change feed (%d superseded)",
+            len(documents),
+            len(changes) - len(documents),
+        )
+
+        # Index the changed documents
+        stats = await self.orchestrator.index_documents(documents)
+
+        self.total_processed += stats.documents_processed
+        self.total_errors += len(stats.errors)
+
+        logger.info(
+            "Batch complete: %d docs, %d chunks indexed, %d errors",
+            stats.documents_processed,
+            stats.chunks_indexed,
+            len(stats.errors),
+        )
+
+        # Invoke callback if registered
+        if self.on_batch_processed:
+            try:
+                self.on_batch_processed(stats)
             except Exception as e:
-                logger.error(f"Error processing change feed: {e}", exc_info=True)
-                self.total_errors += 1
+                logger.error("Error in batch callback: %s", e)
 
-                if self.on_error:
-                    try:
-                        self.on_error(e)
-                    except Exception as callback_error:
-                        logger.error(f"Error in error callback: {callback_error}")
+    @staticmethod
+    def _retry_delay(error: Exception, delay: float) -> float:
+        """Get the seconds to wait before retrying after an error.
 
-                # Wait before retrying
-                await asyncio.sleep(self.poll_interval * 2)
+        Throttled (429) Cosmos DB requests wait as long as the service asks;
+        anything else waits the backoff delay plus up to 50% random jitter so
+        that processors failing together don't retry in lockstep.
 
-        logger.info("Change feed processor stopped")
+        Args:
+            error: The exception raised
+            delay: Current backoff delay in seconds
+
+        Returns:
+            Seconds to wait
+        """
+        if isinstance(error, CosmosHttpResponseError) and error.status_code == 429:
+            retry_after_ms = error.headers.get("x-ms-retry-after-ms")
+            if retry_after_ms:
+                return float(retry_after_ms) / 1000
+        return delay + random.uniform(0, delay / 2)
+
+    def _record_error(self, error: Exception, message: str):
+        """Log and count a processing error and notify the error callback.
+
+        Args:
+            error: The exception raised
+            message: Log message describing what failed
+        """
+        logger.error("%s: %s", message, error, exc_info=True)
+        self.total_errors += 1
+
+        if self.on_error:
+            try:
+                self.on_error(error)
+            except Exception as callback_error:
+                logger.error("Error in error callback: %s", callback_error)
+
+    async def _read_changes(self, container, continuation_token: str | None) -> _Page:
+        """Read the next page of changes from the change feed.
+
+        Args:
+            container: Source container
+            continuation_token: Token from the previous read, or None to start
+                from the beginning
+
+        Returns:
+            Tuple of (changed documents, continuation token after this page)
+        """
+        # The paged response has no headers of its own. The continuation is the
+        # etag of this call's response, captured by the hook rather than read
+        # from the client connection, which lease writes and other requests share
+        page_etag: dict[str, str | None] = {}
+
+        def _capture_etag(headers, _result):
+            page_etag["etag"] = headers.get("etag")
+
+        response = container.query_items_change_feed(
+            is_start_from_beginning=continuation_token is None,
+            continuation=continuation_token,
+            max_item_count=self.max_items_per_batch,
+            response_hook=_capture_etag,
+        )
+        changes = [item async for item in response]
+
+        return changes, page_etag.get("etag") or continuation_token
 
     def stop(self):
         """Stop processing the change feed."""
@@ -145,42 +442,92 @@ class ChangeFeedProcessor:
     async def _load_continuation_token(self, lease_container) -> str | None:
         """Load continuation token from lease container.
 
+        The lease's ETag is kept so later saves only succeed while no other
+        processor has written the lease in between. Failed reads (throttling,
+        outages) are retried until the read succeeds or the processor stops;
+        only a missing lease starts the feed from the beginning.
+
         Args:
             lease_container: Container for storing leases
 
         Returns:
             Continuation token or None
         """
-        try:
-            lease_id = f"{self.processor_name}-continuation"
-            item = await lease_container.read_item(item=lease_id, partition_key=lease_id)
+        delay = self.poll_interval
+        while self.is_running:
+            try:
+                item = await lease_container.read_item(
+                    item=self._lease_id, partition_key=self._lease_id
+                )
+            except CosmosResourceNotFoundError:
+                self._lease_etag = None
+                logger.info("No existing continuation token, starting from beginning")
+                return None
+            except Exception as e:
+                self._record_error(e, "Error loading continuation token")
+
+                # Wait before retrying
+                delay = min(self.max_poll_interval, delay * 2)
+                await asyncio.sleep(self._retry_delay(e, delay))
+                continue
+
+            self._lease_etag = item.get("_etag")
             token = item.get("continuation_token")
-            logger.info(f"Loaded continuation token: {token[:20] if token else 'None'}")
+            # %.20s truncates the token only if the record is emitted
+            logger.info("Loaded continuation token: %.20s", token)
             return token
-        except Exception:
-            # No existing lease
-            logger.info("No existing continuation token, starting from beginning")
-            return None
+
+        return None
 
     async def _save_continuation_token(self, lease_container, token: str | None):
         """Save continuation token to lease container.
 
+        The write is conditional on the lease being unchanged since this
+        processor last read or wrote it. If another processor with the same
+        name has taken the lease over, this one stops instead of overwriting
+        its progress.
+
         Args:
             lease_container: Container for storing leases
             token: Continuation token to save
         """
+        lease = self._lease_base | {
+            "continuation_token": token,
+            "last_updated": datetime.now(UTC).isoformat(),
+        }
         try:
-            lease_id = f"{self.processor_name}-continuation"
-            await lease_container.upsert_item(
-                {
-                    "id": lease_id,
-                    "continuation_token": token,
-                    "processor_name": self.processor_name,
-                    "last_updated": datetime.now(UTC).isoformat(),
-                }
+            if self._lease_etag is None:
+                saved = await lease_container.create_item(body=lease)
+            else:
+                saved = await lease_container.replace_item(
+                    item=self._lease_id,
+                    body=lease,
+                    etag=self._lease_etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+            self._lease_etag = saved.get("_etag")
+        except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+            logger.error(
+                "Lease '%s' was updated by another processor; stopping change feed processor '%s'",
+                self._lease_id,
+                self.processor_name,
             )
+            self.stop()
         except Exception as e:
-            logger.error(f"Error saving continuation token: {e}")
+            logger.error("Error saving continuation token: %s", e)
+
+    async def _checkpoint(self, lease_container):
+        """Save the pending continuation token, if any batches are unsaved.
+
+        Args:
+            lease_container: Container for storing leases
+        """
+        if not self._batches_since_checkpoint:
+            return
+
+        await self._save_continuation_token(lease_container, self._pending_token)
+        self._batches_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
 
     def get_stats(self) -> dict[str, Any]:
         """Get processor statistics.
@@ -227,7 +574,7 @@ class ScheduledIndexRefresh:
             return
 
         self.is_running = True
-        logger.info(f"Starting scheduled refresh (every {self.refresh_interval_hours} hours)")
+        logger.info("Starting scheduled refresh (every %s hours)", self.refresh_interval_hours)
 
         while self.is_running:
             try:
@@ -239,10 +586,11 @@ class ScheduledIndexRefresh:
                 self.last_refresh = datetime.now(UTC)
 
                 logger.info(
-                    f"Scheduled refresh complete: {stats.documents_processed} docs, "
-                    f"{stats.chunks_indexed} chunks, "
-                    f"{len(stats.errors)} errors, "
-                    f"{stats.to_dict()['duration_seconds']}s"
+                    "Scheduled refresh complete: %d docs, %d chunks, %d errors, %ss",
+                    stats.documents_processed,
+                    stats.chunks_indexed,
+                    len(stats.errors),
+                    stats.to_dict()["duration_seconds"],
                 )
 
                 # Invoke callback if registered
@@ -250,13 +598,13 @@ class ScheduledIndexRefresh:
                     try:
                         self.on_refresh_complete(stats)
                     except Exception as e:
-                        logger.error(f"Error in refresh callback: {e}")
+                        logger.error("Error in refresh callback: %s", e)
 
                 # Wait for next refresh
                 await asyncio.sleep(self.refresh_interval_hours * 3600)
 
             except Exception as e:
-                logger.error(f"Error during scheduled refresh: {e}", exc_info=True)
+                logger.error("Error during scheduled refresh: %s", e, exc_info=True)
                 # Wait before retrying (shorter interval on error)
                 await asyncio.sleep(300)  # 5 minutes
 
@@ -218,6 +218,8 @@ class GraphBuilder:
                 - file_path: Path to .tf file
                 - repo_url: Git repository URL
                 - branch: Git branch
+                - line_number: Line number in file (optional)
+                - source_code: Resource source code (optional)
         """
         query = """
         g.V().has('terraform_resource', 'address', tf_addr).fold()
@@ -229,6 +231,8 @@ class GraphBuilder:
         .property('file_path', file_path)
         .property('repo_url', repo_url)
         .property('branch', branch)
+        .property('line_number', line_number)
+        .property('source_code', source_code)
         """
 
         try:
@@ -240,6 +244,8 @@ class GraphBuilder:
                     "file_path": tf_resource["file_path"],
                     "repo_url": tf_resource.get("repo_url", ""),
                     "branch": tf_resource.get("branch", ""),
+                    "line_number": tf_resource.get("line_number", 0),
+                    "source_code": tf_resource.get("source_code", ""),
                 },
             )
             logger.debug(f"Added/updated Terraform resource: {tf_resource['address']}")
@@ -308,13 +314,21 @@ class GraphBuilder:
             azure_id: Azure resource ID
 
         Returns:
-            List of Terraform resource info (address, file_path, repo_url)
+            List of Terraform resource info (address, type, file_path, line_number,
+            repo_url, branch, source_code). Vertices written before line_number and
+            source_code were stored project 0 and "" for those fields.
         """
         query = """
         g.V().has('azure_resource', 'id', azure_id)
         .inE('manages').outV()
-        .project('address', 'file_path', 'repo_url', 'branch')
-        .by('address').by('file_path').by('repo_url').by('branch')
+        .project('address', 'type', 'file_path', 'line_number', 'repo_url', 'branch', 'source_code')
+        .by('address')
+        .by(coalesce(values('type'), constant('')))
+        .by('file_path')
+        .by(coalesce(values('line_number'), constant(0)))
+        .by('repo_url')
+        .by('branch')
+        .by(coalesce(values('source_code'), constant('')))
         """
 
         try:
@@ -326,6 +340,45 @@ class GraphBuilder:
             logger.error(f"Failed to find Terraform for resource {azure_id}: {e}")
             raise
 
+    def find_terraform_for_resources(
+        self, azure_ids: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Find Terraform resources managing several Azure resources in one traversal.
+
+        Args:
+            azure_ids: Azure resource IDs
+
+        Returns:
+            Terraform resource info (as in find_terraform_for_resource) keyed by
+            Azure resource ID. IDs with no managing Terraform resource are omitted.
+        """
+        query = """
+        g.V().has('azure_resource', 'id', within(azure_ids)).as('azure')
+        .inE('manages').outV()
+        .project('azure_id', 'address', 'type', 'file_path', 'line_number', 'repo_url', 'branch', 'source_code')
+        .by(select('azure').id())
+        .by('address')
+        .by(coalesce(values('type'), constant('')))
+        .by('file_path')
+        .by(coalesce(values('line_number'), constant(0)))
+        .by('repo_url')
+        .by('branch')
+        .by(coalesce(values('source_code'), constant('')))
+        """
+
+        try:
+            results = self.client.submit(query, {"azure_ids": list(azure_ids)})
+            by_resource: dict[str, list[dict[str, Any]]] = {}
+            for row in results:
+                by_resource.setdefault(row.pop("azure_id"), []).append(row)
+            logger.debug(
+                f"Found Terraform for {len(by_resource)} of {len(azure_ids)} Azure resources"
+            )
+            return by_resource
+        except Exception as e:
+            logger.error(f"Failed to find Terraform for {len(azure_ids)} resources: {e}")
+            raise
+
     def find_resource_group_resources(self, rg_id: str) -> list[dict[str, Any]]:
         """Find all Azure resources in a resource group.
 
@@ -397,6 +397,8 @@ class IndexingOrchestrator:
                         "file_path": document.get("file_path", ""),
                         "repo_url": document.get("repo_url", ""),
                         "branch": document.get("branch", ""),
+                        "line_number": document.get("line_number", 0),
+                        "source_code": document.get("source_code", ""),
                     }
                 )
 
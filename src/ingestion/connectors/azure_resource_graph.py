@@ -76,12 +76,16 @@ class AzureResourceGraphConnector:
         self,
         query: str | None = None,
         resource_types: list[str] | None = None,
+        subscription_ids: list[str] | None = None,
     ) -> AsyncIterator[dict[str, Any]]:
         """Fetch all resources matching the query.
 
         Args:
             query: Custom KQL query (uses DEFAULT_QUERY if not provided)
             resource_types: Optional filter for specific resource types
+            subscription_ids: Subscriptions to query for this call only. If None,
+                uses the connector's subscription_ids; if empty, queries all
+                accessible subscriptions.
 
         Yields:
             Resource dictionaries from Azure Resource Graph
@@ -100,6 +104,9 @@ class AzureResourceGraphConnector:
             type_filter = " or ".join(f"type == '{t}'" for t in resource_types)
             query = query.replace("| order by id asc", f"| where {type_filter}\n| order by id asc")
 
+        if subscription_ids is None:
+            subscription_ids = self.subscription_ids
+
         skip_token = None
         page_count = 0
 
@@ -110,7 +117,7 @@ class AzureResourceGraphConnector:
             )
 
             request = QueryRequest(
-                subscriptions=self.subscription_ids if self.subscription_ids else None,
+                subscriptions=subscription_ids or None,
                 query=query,
                 options=options,
             )
@@ -179,9 +186,14 @@ class AzureResourceGraphConnector:
             return resource
         return None
 
-    async def fetch_resource_types(self) -> list[dict[str, Any]]:
+    async def fetch_resource_types(
+        self, subscription_ids: list[str] | None = None
+    ) -> list[dict[str, Any]]:
         """Fetch summary of all resource types and counts.
 
+        Args:
+            subscription_ids: Subscriptions to summarize (see fetch_all_resources)
+
         Returns:
             List of dictionaries with 'type' and 'count_' keys
         """
@@ -192,13 +204,20 @@ class AzureResourceGraphConnector:
         """
 
         types = []
-        async for row in self.fetch_all_resources(query=query):
+        async for row in self.fetch_all_resources(
+            query=query, subscription_ids=subscription_ids
+        ):
             types.append(row)
         return types
 
-    async def enumerate_subscriptions(self) -> list[dict[str, Any]]:
+    async def enumerate_subscriptions(
+        self, subscription_ids: list[str] | None = None
+    ) -> list[dict[str, Any]]:
         """Enumerate all accessible subscriptions.
 
+        Args:
+            subscription_ids: Subscriptions to look up (see fetch_all_resources)
+
         Returns:
             List of subscription dictionaries with id, name, and state
         """
@@ -209,7 +228,9 @@ class AzureResourceGraphConnector:
         """
 
         subscriptions = []
-        async for row in self.fetch_all_resources(query=query):
+        async for row in self.fetch_all_resources(
+            query=query, subscription_ids=subscription_ids
+        ):
             subscriptions.append(
                 {
                     "id": row.get("subscriptionId"),
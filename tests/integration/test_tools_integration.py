@@ -205,6 +205,9 @@ def mock_terraform_service():
         ],
     )
 
+    # get_and_analyze fetches and analyzes in a single call
+    mock.get_and_analyze.return_value = (mock.get_plan.return_value, mock.analyze_plan.return_value)
+
     return mock
 
 
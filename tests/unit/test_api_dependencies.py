@@ -9,6 +9,7 @@ from src.api.dependencies import (
     get_cosmos_client,
     get_graph_builder,
     get_search_engine,
+    get_services,
     get_settings,
     init_services,
     cleanup_services,
@@ -146,6 +147,38 @@ class TestServiceInitialization:
                 mock_search.assert_called_once()
                 mock_graph.assert_called_once()
 
+                # Cosmos DB client shares the tuned session without owning it
+                transport = mock_cosmos.call_args.kwargs["transport"]
+                assert transport.session is _services["cosmos_session"]
+                assert transport._session_owner is False
+                await _services["cosmos_session"].close()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_reads_documents_container(self):
+        """Test that prewarming reads the documents container properties."""
+        from src.api.dependencies import _prewarm_cosmos
+
+        cosmos_client = MagicMock()
+        container = cosmos_client.get_database_client.return_value.get_container_client.return_value
+        container.read = AsyncMock()
+        settings = MagicMock(cosmos_db_database="infra-rag", cosmos_db_container="documents")
+
+        await _prewarm_cosmos(cosmos_client, settings)
+
+        cosmos_client.get_database_client.assert_called_once_with("infra-rag")
+        container.read.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failure_is_not_fatal(self):
+        """Test that a failed prewarm does not abort startup."""
+        from src.api.dependencies import _prewarm_cosmos
+
+        cosmos_client = MagicMock()
+        container = cosmos_client.get_database_client.return_value.get_container_client.return_value
+        container.read = AsyncMock(side_effect=Exception("unreachable"))
+
+        await _prewarm_cosmos(cosmos_client, MagicMock())
+
     @pytest.mark.asyncio
     async def test_cleanup_services_closes_clients(self):
         """Test that cleanup_services closes all clients."""
@@ -161,6 +194,49 @@ class TestServiceInitialization:
         # Verify cosmos client was closed
         mock_cosmos.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_cosmos_session_pool_settings(self):
+        """Test that the Cosmos DB HTTP session keeps a larger, longer-lived pool."""
+        from src.api.dependencies import (
+            COSMOS_KEEPALIVE_SECONDS,
+            COSMOS_POOL_LIMIT,
+            COSMOS_POOL_LIMIT_PER_HOST,
+            _create_cosmos_session,
+        )
+
+        session = _create_cosmos_session()
+        try:
+            assert session.connector.limit == COSMOS_POOL_LIMIT
+            assert session.connector.limit_per_host == COSMOS_POOL_LIMIT_PER_HOST
+            assert session.connector._keepalive_timeout == COSMOS_KEEPALIVE_SECONDS
+        finally:
+            await session.close()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_services_closes_cosmos_session(self):
+        """Test that the Cosmos DB HTTP session is closed after the client."""
+        order = []
+        mock_cosmos = AsyncMock()
+        mock_cosmos.close.side_effect = lambda: order.append("client")
+        mock_session = AsyncMock()
+        mock_session.close.side_effect = lambda: order.append("session")
+        _services["cosmos_client"] = mock_cosmos
+        _services["cosmos_session"] = mock_session
+
+        await cleanup_services()
+
+        assert order == ["client", "session"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_services_closes_resource_graph_session(self):
+        """Test that cleanup_services closes the shared Resource Graph session."""
+        mock_resource_service = AsyncMock()
+        _services["resource_service"] = mock_resource_service
+
+        await cleanup_services()
+
+        mock_resource_service.close.assert_awaited_once()
+
         # Verify services were cleared
         assert len(_services) == 0
 
@@ -233,6 +309,18 @@ class TestDependencyGetters:
 
         assert result is mock_connector
 
+    def test_get_services_bundles_tool_services(self):
+        """Test that get_services bundles the services passed to it."""
+        search_engine, resource_service = MagicMock(), MagicMock()
+        terraform_service, git_service = MagicMock(), MagicMock()
+
+        services = get_services(search_engine, resource_service, terraform_service, git_service)
+
+        assert services.search_engine is search_engine
+        assert services.resource_service is resource_service
+        assert services.terraform_service is terraform_service
+        assert services.git_service is git_service
+
 
 @pytest.fixture(autouse=True)
 def cleanup_after_test():
@@ -113,6 +113,32 @@ class TestCORSMiddleware:
         assert "access-control-allow-methods" in response.headers
 
 
+class TestGZipMiddleware:
+    """Tests for response compression."""
+
+    def test_large_responses_are_compressed(self, client):
+        """Test that responses above the threshold are gzip-encoded."""
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "paths" in response.json()
+
+    def test_small_responses_are_not_compressed(self, client):
+        """Test that responses below the threshold are sent as-is."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_compression_options(self):
+        """Test that gzip uses a moderate compression level."""
+        from fastapi.middleware.gzip import GZipMiddleware
+
+        gzip = next(m for m in app.user_middleware if m.cls is GZipMiddleware)
+        assert gzip.kwargs == {"minimum_size": 1024, "compresslevel": 5}
+
+
 class TestAPIMetadata:
     """Tests for API metadata and configuration."""
 
@@ -242,6 +242,32 @@ class TestAzureResourceGraphConnector:
                 assert types[0]["type"] == "Microsoft.Compute/virtualMachines"
                 assert types[0]["count_"] == 10
 
+    @pytest.mark.asyncio
+    async def test_per_call_subscription_ids(self, connector):
+        """Test that per-call subscriptions override the connector's without mutating it."""
+        mock_response = MagicMock()
+        mock_response.data = []
+        mock_response.skip_token = None
+
+        with patch(
+            "src.ingestion.connectors.azure_resource_graph.ResourceGraphClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.resources = AsyncMock(return_value=mock_response)
+            mock_client.close = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            async with connector:
+                await connector.fetch_resource_types(subscription_ids=["sub-789"])
+                await connector.fetch_resource_types(subscription_ids=[])
+                await connector.fetch_resource_types()
+
+            requests = [call.args[0] for call in mock_client.resources.call_args_list]
+            assert requests[0].subscriptions == ["sub-789"]
+            assert requests[1].subscriptions is None
+            assert requests[2].subscriptions == ["sub-123", "sub-456"]
+            assert connector.subscription_ids == ["sub-123", "sub-456"]
+
     @pytest.mark.asyncio
     async def test_enumerate_subscriptions(self, connector):
         """Test enumerating subscriptions."""
@@ -0,0 +1,505 @@
+"""Unit tests for the Cosmos DB change feed processor."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosHttpResponseError,
+    CosmosResourceNotFoundError,
+)
+
+from src.indexing.change_feed import ChangeFeedProcessor, _latest_versions
+from src.indexing.orchestrator import IndexingStats
+
+
+def _stats(documents_processed):
+    """Build indexing stats for a batch."""
+    stats = IndexingStats()
+    stats.documents_processed = documents_processed
+    return stats
+
+
+def _feed(container, pages):
+    """Serve change feed pages from a mock container, one per query.
+
+    Each page is a (documents, etag) pair; the etag is passed to the query's
+    response hook along with the page, as the SDK does.
+    """
+    pages = iter(pages)
+
+    def _query(**kwargs):
+        items, etag = next(pages, ([], None))
+
+        async def _iter():
+            kwargs["response_hook"]({"etag": etag} if etag else {}, items)
+            for item in items:
+                yield item
+
+        return _iter()
+
+    container.query_items_change_feed = Mock(side_effect=_query)
+
+
+@pytest.fixture
+def source_container():
+    """Mock source container."""
+    return Mock()
+
+
+@pytest.fixture
+def lease_container():
+    """Mock lease container with no stored lease."""
+    container = Mock()
+    container.read_item = AsyncMock(
+        side_effect=CosmosResourceNotFoundError(status_code=404, message="not found")
+    )
+    container.create_item = AsyncMock(return_value={"_etag": "lease-1"})
+    container.replace_item = AsyncMock(return_value={"_etag": "lease-2"})
+    return container
+
+
+def _saved_tokens(lease_container):
+    """Continuation tokens written to the lease, in order."""
+    calls = lease_container.create_item.call_args_list + lease_container.replace_item.call_args_list
+    return [call.kwargs["body"]["continuation_token"] for call in calls]
+
+
+@pytest.fixture
+def orchestrator():
+    """Mock indexing orchestrator."""
+    orchestrator = Mock()
+    orchestrator.index_documents = AsyncMock(side_effect=lambda docs: _stats(len(docs)))
+    return orchestrator
+
+
+@pytest.fixture
+def processor(source_container, lease_container, orchestrator):
+    """Change feed processor wired to mock containers."""
+    database = Mock()
+    database.get_container_client.side_effect = lambda name: (
+        lease_container if name == "leases" else source_container
+    )
+    cosmos_client = Mock()
+    cosmos_client.get_database_client.return_value = database
+
+    return ChangeFeedProcessor(
+        cosmos_client=cosmos_client,
+        database_name="db",
+        container_name="documents",
+        lease_container_name="leases",
+        indexing_orchestrator=orchestrator,
+        poll_interval=0,
+        min_poll_interval=0,
+    )
+
+
+def _stop_after(processor, orchestrator, batches):
+    """Stop the processor once the orchestrator has indexed the given number of batches."""
+    index = orchestrator.index_documents.side_effect
+
+    async def _index(docs):
+        stats = index(docs)
+        if orchestrator.index_documents.await_count >= batches:
+            processor.stop()
+        return stats
+
+    orchestrator.index_documents.side_effect = _index
+
+
+class TestChangeFeedProcessor:
+    """Tests for ChangeFeedProcessor.start."""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_continuation_from_response_headers(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that each batch checkpoints the etag published for its page."""
+        processor.max_concurrent_batches = 1
+        processor.checkpoint_every_batches = 1
+        _feed(source_container, [([{"id": "a"}], "token-1"), ([{"id": "b"}], "token-2")])
+        _stop_after(processor, orchestrator, 2)
+
+        await processor.start()
+
+        assert _saved_tokens(lease_container) == ["token-1", "token-2"]
+        second_query = source_container.query_items_change_feed.call_args_list[1].kwargs
+        assert second_query["continuation"] == "token-1"
+        assert second_query["is_start_from_beginning"] is False
+        assert processor.get_stats()["total_processed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_continuation_not_read_from_shared_connection(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that another request's headers on the shared connection are ignored."""
+        processor.checkpoint_every_batches = 1
+        source_container.client_connection.last_response_headers = {"etag": "lease-etag"}
+        _feed(source_container, [([{"id": "a"}], "token-1")])
+        _stop_after(processor, orchestrator, 1)
+
+        await processor.start()
+
+        assert _saved_tokens(lease_container) == ["token-1"]
+
+    @pytest.mark.asyncio
+    async def test_coalesces_checkpoints(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that checkpoints are written every N batches and flushed on stop."""
+        processor.max_concurrent_batches = 1
+        processor.checkpoint_every_batches = 2
+        processor.checkpoint_max_seconds = 3600
+        _feed(source_container, [([{"id": str(i)}], f"token-{i}") for i in range(1, 6)])
+        _stop_after(processor, orchestrator, 5)
+
+        await processor.start()
+
+        assert _saved_tokens(lease_container) == ["token-2", "token-4", "token-5"]
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_when_feed_drains(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that pending progress is saved once the feed has no more changes."""
+        processor.checkpoint_max_seconds = 3600
+        _feed(source_container, [([{"id": "a"}], "token-1")])
+        # Stop while idling on the empty page that follows the batch
+        def _create(body):
+            processor.stop()
+            return {"_etag": "lease-1"}
+
+        lease_container.create_item = AsyncMock(side_effect=_create)
+
+        await processor.start()
+
+        assert _saved_tokens(lease_container) == ["token-1"]
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_stored_lease(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that a stored continuation token is used for the first read."""
+        lease_container.read_item = AsyncMock(return_value={"continuation_token": "stored"})
+        _feed(source_container, [([{"id": "a"}], "token-1")])
+        _stop_after(processor, orchestrator, 1)
+
+        await processor.start()
+
+        first_query = source_container.query_items_change_feed.call_args_list[0].kwargs
+        assert first_query["continuation"] == "stored"
+        assert first_query["is_start_from_beginning"] is False
+
+    @pytest.mark.asyncio
+    async def test_reads_ahead_while_indexing(self, processor, source_container, orchestrator):
+        """Test that the next page is read while the current batch is being indexed."""
+        processor.max_concurrent_batches = 1
+        _feed(source_container, [([{"id": "a"}], "token-1"), ([{"id": "b"}], "token-2")])
+        reads_during_first_batch = []
+
+        async def _index(docs):
+            if docs[0]["id"] == "a":
+                await asyncio.sleep(0.01)
+                reads_during_first_batch.append(
+                    source_container.query_items_change_feed.call_count
+                )
+            else:
+                processor.stop()
+            return _stats(len(docs))
+
+        orchestrator.index_documents.side_effect = _index
+
+        await processor.start()
+
+        assert reads_during_first_batch[0] >= 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_retried_before_checkpoint(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that a batch that fails to index is retried rather than skipped."""
+        processor.checkpoint_every_batches = 1
+        processor.on_error = Mock()
+        _feed(source_container, [([{"id": "a"}], "token-1")])
+        attempts = []
+
+        async def _index(docs):
+            attempts.append(docs)
+            if len(attempts) == 1:
+                raise RuntimeError("search unavailable")
+            processor.stop()
+            return _stats(len(docs))
+
+        orchestrator.index_documents.side_effect = _index
+
+        await processor.start()
+
+        assert attempts == [[{"id": "a"}], [{"id": "a"}]]
+        assert isinstance(processor.on_error.call_args.args[0], RuntimeError)
+        assert _saved_tokens(lease_container) == ["token-1"]
+
+    @pytest.mark.asyncio
+    async def test_batch_callback_invoked(self, processor, source_container, orchestrator):
+        """Test that the batch callback receives each batch's stats."""
+        _feed(source_container, [([{"id": "a"}, {"id": "b"}], "token-1")])
+        _stop_after(processor, orchestrator, 1)
+        processor.on_batch_processed = Mock()
+
+        await processor.start()
+
+        stats = processor.on_batch_processed.call_args.args[0]
+        assert stats.documents_processed == 2
+
+
+class TestLeaseOwnership:
+    """Tests for conditional continuation token writes."""
+
+    @pytest.mark.asyncio
+    async def test_existing_lease_replaced_with_etag(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that saves are conditional on the ETag of the lease last seen."""
+        processor.max_concurrent_batches = 1
+        processor.checkpoint_every_batches = 1
+        lease_container.read_item = AsyncMock(
+            return_value={"continuation_token": "stored", "_etag": "lease-0"}
+        )
+        _feed(source_container, [([{"id": "a"}], "token-1"), ([{"id": "b"}], "token-2")])
+        _stop_after(processor, orchestrator, 2)
+
+        await processor.start()
+
+        lease = lease_container.replace_item.call_args.kwargs["body"]
+        assert lease["id"] == "indexing-processor-continuation"
+        assert lease["processor_name"] == "indexing-processor"
+        assert lease["continuation_token"] == "token-2"
+        etags = [call.kwargs["etag"] for call in lease_container.replace_item.call_args_list]
+        assert etags == ["lease-0", "lease-2"]
+        assert lease_container.replace_item.call_args.kwargs["match_condition"] == (
+            MatchConditions.IfNotModified
+        )
+        lease_container.create_item.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stops_when_lease_taken_over(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that losing the lease to another processor stops this one."""
+        processor.checkpoint_every_batches = 1
+        lease_container.read_item = AsyncMock(
+            return_value={"continuation_token": "stored", "_etag": "lease-0"}
+        )
+        lease_container.replace_item = AsyncMock(
+            side_effect=CosmosAccessConditionFailedError(status_code=412, message="etag mismatch")
+        )
+        _feed(source_container, [([{"id": str(i)}], f"token-{i}") for i in range(10)])
+
+        await processor.start()
+
+        assert not processor.is_running
+        assert orchestrator.index_documents.await_count < 10
+
+    @pytest.mark.asyncio
+    async def test_lease_read_failure_retried(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that a failed lease read is retried instead of treated as no lease."""
+        processor.checkpoint_every_batches = 1
+        processor.on_error = Mock()
+        lease_container.read_item = AsyncMock(
+            side_effect=[
+                CosmosHttpResponseError(status_code=503, message="unavailable"),
+                {"continuation_token": "stored", "_etag": "lease-0"},
+            ]
+        )
+        _feed(source_container, [([{"id": "a"}], "token-1")])
+        _stop_after(processor, orchestrator, 1)
+
+        await processor.start()
+
+        assert lease_container.read_item.await_count == 2
+        first_query = source_container.query_items_change_feed.call_args_list[0].kwargs
+        assert first_query["continuation"] == "stored"
+        assert lease_container.replace_item.call_args.kwargs["etag"] == "lease-0"
+        lease_container.create_item.assert_not_called()
+
+
+class TestConcurrentIndexing:
+    """Tests for indexing several change feed batches at once."""
+
+    @pytest.mark.asyncio
+    async def test_independent_batches_indexed_concurrently(
+        self, processor, source_container, orchestrator
+    ):
+        """Test that batches without shared documents overlap, up to the limit."""
+        processor.max_concurrent_batches = 2
+        _feed(source_container, [([{"id": str(i)}], f"token-{i}") for i in range(4)])
+        active = []
+        peak = []
+
+        async def _index(docs):
+            active.append(docs)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(docs)
+            if orchestrator.index_documents.await_count >= 4:
+                processor.stop()
+            return _stats(len(docs))
+
+        orchestrator.index_documents.side_effect = _index
+
+        await processor.start()
+
+        assert max(peak) == 2
+
+    @pytest.mark.asyncio
+    async def test_batches_sharing_documents_are_serialized(
+        self, processor, source_container, orchestrator
+    ):
+        """Test that a newer version of a document is not indexed before an older one."""
+        _feed(
+            source_container,
+            [([{"id": "a", "v": 1}], "token-1"), ([{"id": "a", "v": 2}], "token-2")],
+        )
+        indexed = []
+
+        async def _index(docs):
+            # The older version takes longer to index
+            await asyncio.sleep(0.02 if docs[0]["v"] == 1 else 0)
+            indexed.append(docs[0]["v"])
+            if len(indexed) == 2:
+                processor.stop()
+            return _stats(len(docs))
+
+        orchestrator.index_documents.side_effect = _index
+
+        await processor.start()
+
+        assert indexed == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_waits_for_earlier_batches(
+        self, processor, source_container, lease_container, orchestrator
+    ):
+        """Test that a batch finishing early does not checkpoint past a slower earlier one."""
+        processor.checkpoint_every_batches = 1
+        _feed(source_container, [([{"id": "a"}], "token-1"), ([{"id": "b"}], "token-2")])
+        saved_when_second_done = []
+
+        async def _index(docs):
+            if docs[0]["id"] == "a":
+                await asyncio.sleep(0.02)
+                processor.stop()
+            else:
+                saved_when_second_done.extend(_saved_tokens(lease_container))
+            return _stats(len(docs))
+
+        orchestrator.index_documents.side_effect = _index
+
+        await processor.start()
+
+        assert saved_when_second_done == []
+        assert _saved_tokens(lease_container)[-1] == "token-2"
+
+    @pytest.mark.asyncio
+    async def test_read_ahead_bounded_while_batch_fails(
+        self, processor, source_container, orchestrator
+    ):
+        """Test that later batches stop piling up behind one that keeps failing."""
+        processor.max_concurrent_batches = 2
+        processor.on_error = Mock()
+        _feed(source_container, [([{"id": str(i)}], f"token-{i}") for i in range(20)])
+        indexed = set()
+        failures = []
+
+        async def _index(docs):
+            await asyncio.sleep(0.001)
+            if docs[0]["id"] == "0":
+                failures.append(docs)
+                if len(failures) == 20:
+                    processor.stop()
+                raise RuntimeError("search unavailable")
+            indexed.add(docs[0]["id"])
+            return _stats(len(docs))
+
+        orchestrator.index_documents.side_effect = _index
+
+        await processor.start()
+
+        # Two batches per slot: the failing one and the three read after it
+        assert indexed == {"1", "2", "3"}
+
+
+class TestLatestVersions:
+    """Tests for collapsing repeated documents within a batch."""
+
+    def test_keeps_last_version_of_each_document(self):
+        """Test that later versions replace earlier ones in first-seen order."""
+        changes = [
+            {"id": "a", "_rid": "r1", "v": 1},
+            {"id": "b", "_rid": "r2", "v": 1},
+            {"id": "a", "_rid": "r1", "v": 2},
+        ]
+
+        assert _latest_versions(changes) == [
+            {"id": "a", "_rid": "r1", "v": 2},
+            {"id": "b", "_rid": "r2", "v": 1},
+        ]
+
+    def test_same_id_in_different_partitions_kept(self):
+        """Test that documents sharing an id but not a resource ID are both kept."""
+        changes = [{"id": "a", "_rid": "r1"}, {"id": "a", "_rid": "r2"}]
+
+        assert _latest_versions(changes) == changes
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_receives_deduplicated_batch(
+        self, processor, source_container, orchestrator
+    ):
+        """Test that only the latest version of each document is indexed."""
+        _feed(source_container, [([{"id": "a", "v": 1}, {"id": "a", "v": 2}], "token-1")])
+        _stop_after(processor, orchestrator, 1)
+
+        await processor.start()
+
+        orchestrator.index_documents.assert_awaited_once_with([{"id": "a", "v": 2}])
+
+
+class TestPollBackoff:
+    """Tests for the adaptive change feed poll interval."""
+
+    @pytest.mark.asyncio
+    async def test_idle_polls_back_off_and_changes_speed_up(self, processor, source_container):
+        """Test that empty pages double the wait and non-empty pages halve it."""
+        processor.poll_interval = 1.0
+        processor.max_poll_interval = 4.0
+        _feed(
+            source_container,
+            [([], None), ([], None), ([], None), ([], None), ([{"id": "a"}], "t"), ([], None)],
+        )
+        delays = []
+
+        async def _sleep(delay):
+            delays.append(delay)
+            if len(delays) == 5:
+                processor.stop()
+
+        with patch("src.indexing.change_feed.asyncio.sleep", _sleep):
+            await processor.start()
+
+        assert delays == [1.0, 2.0, 4.0, 4.0, 2.0]
+
+    def test_throttled_read_waits_as_requested(self):
+        """Test that a 429 honors the service's retry-after header."""
+        error = CosmosHttpResponseError(status_code=429, message="throttled")
+        error.headers = {"x-ms-retry-after-ms": "250"}
+
+        assert ChangeFeedProcessor._retry_delay(error, 8.0) == 0.25
+
+    def test_other_errors_add_jitter(self):
+        """Test that other errors wait the backoff delay plus bounded jitter."""
+        delay = ChangeFeedProcessor._retry_delay(RuntimeError("boom"), 2.0)
+
+        assert 2.0 <= delay <= 3.0
@@ -4,10 +4,14 @@ Tests the CLI commands, argument parsing, and output formatting.
 """
 
 import json
+import os
 import subprocess
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import typer
+from rich.markdown import Markdown
 from typer.testing import CliRunner
 
 from src.cli.main import (
@@ -16,11 +20,50 @@ from src.cli.main import (
     get_headers,
     get_token,
     DEFAULT_API_BASE_URL,
+    HTTP_LIMITS,
+    REQUEST_TIMEOUT_SECONDS,
+    SEARCH_SNIPPET_LENGTH,
+    TOKEN_RESOURCE,
+    _create_client,
+    _format_cell,
+    _iter_sse_events,
+    _new_conversation,
+    _search,
+    _single_query,
+    _TokenWriter,
+    TABLE_MAX_ROWS,
+    _resource_graph_query,
 )
 
 runner = CliRunner()
 
 
+def _mock_process(returncode: int, stdout: str) -> MagicMock:
+    """Build a mock asyncio subprocess that exits with the given output."""
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.communicate = AsyncMock(return_value=(stdout.encode(), b""))
+    proc.wait = AsyncMock(return_value=returncode)
+    return proc
+
+
+@pytest.fixture(autouse=True)
+def token_cache_path(tmp_path, monkeypatch):
+    """Keep the Azure CLI token cache out of the user's home directory."""
+    path = tmp_path / "token.json"
+    monkeypatch.setattr("src.cli.main.TOKEN_CACHE_PATH", path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def azure_profile_path(tmp_path, monkeypatch):
+    """Point the Azure CLI profile at a temporary file."""
+    path = tmp_path / "azureProfile.json"
+    path.write_text("{}")
+    monkeypatch.setattr("src.cli.main.AZURE_PROFILE_PATH", path)
+    return path
+
+
 class TestConfiguration:
     """Tests for configuration helpers."""
 
@@ -54,45 +97,434 @@ class TestConfiguration:
         assert "Authorization" not in headers
 
 
+class TestCreateClient:
+    """Tests for the shared HTTP client factory."""
+
+    def test_client_uses_timeout_and_keepalive_pool(self):
+        """Should build a client with the requested timeout and keep-alive limits."""
+        with patch("src.cli.main.httpx.AsyncClient") as mock_client:
+            _create_client(REQUEST_TIMEOUT_SECONDS)
+
+        mock_client.assert_called_once_with(
+            timeout=REQUEST_TIMEOUT_SECONDS, limits=HTTP_LIMITS, headers=None
+        )
+
+    def test_client_sends_headers_with_every_request(self):
+        """Should attach the auth headers to the client rather than to each request."""
+        client = _create_client(REQUEST_TIMEOUT_SECONDS, get_headers("test-token"))
+
+        request = client.build_request("POST", "http://api/search", json={})
+        assert request.headers["Authorization"] == "Bearer test-token"
+
+
+class TestIterSseEvents:
+    """Tests for SSE frame parsing."""
+
+    @staticmethod
+    def _response(*chunks: bytes) -> MagicMock:
+        async def _bytes():
+            for chunk in chunks:
+                yield chunk
+
+        response = MagicMock()
+        response.aiter_bytes = _bytes
+        return response
+
+    @pytest.mark.asyncio
+    async def test_yields_data_frames_only(self):
+        """Should decode data frames and skip blanks, other fields and bad JSON."""
+        response = self._response(
+            b'data: {"type": "token", "content": "Hi"}\n\n'
+            b"event: ping\n"
+            b"data: not-json\n\n"
+            b'data: {"type": "complete"}\n\n'
+        )
+
+        events = [event async for event in _iter_sse_events(response)]
+
+        assert events == [{"type": "token", "content": "Hi"}, {"type": "complete"}]
+
+    @pytest.mark.asyncio
+    async def test_reassembles_frames_split_across_chunks(self):
+        """Should handle frames and multi-byte characters split between chunks."""
+        payload = 'data: {"type": "token", "content": "caf\u00e9"}\r\n\r\n'.encode()
+        split = payload.index(b"\xa9")
+        response = self._response(payload[:split], payload[split:], b'data: {"type": "complete"}')
+
+        events = [event async for event in _iter_sse_events(response)]
+
+        assert events == [{"type": "token", "content": "caf\u00e9"}, {"type": "complete"}]
+
+
+def _mock_api_client(sse: bytes) -> MagicMock:
+    """Build a mock httpx client that streams the given SSE body."""
+
+    async def _bytes():
+        yield sse
+
+    stream_resp = MagicMock()
+    stream_resp.aiter_bytes = _bytes
+    stream_ctx = MagicMock()
+    stream_ctx.__aenter__ = AsyncMock(return_value=stream_resp)
+    stream_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    client = MagicMock()
+    client.post = AsyncMock()
+    client.stream = MagicMock(return_value=stream_ctx)
+    client_ctx = MagicMock()
+    client_ctx.__aenter__ = AsyncMock(return_value=client)
+    client_ctx.__aexit__ = AsyncMock(return_value=False)
+    return client_ctx
+
+
+class TestConversationCreation:
+    """Tests for creating conversations inline with the first message."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_sends_one_request(self):
+        """Should create the conversation with the message instead of a separate POST."""
+        client_ctx = _mock_api_client(b'data: {"type": "complete"}\n\n')
+        client = await client_ctx.__aenter__()
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=client_ctx),
+        ):
+            await _single_query("hi", "sub-1", "http://api")
+
+        client.post.assert_not_called()
+        method, url = client.stream.call_args.args
+        assert method == "POST"
+        assert url.startswith("http://api/conversations/")
+        assert url.endswith("/messages")
+        assert client.stream.call_args.kwargs["json"] == {
+            "content": "hi",
+            "stream": True,
+            "conversation": {"metadata": {"subscription": "sub-1"}},
+        }
+
+    def test_new_conversation_ids_are_unique(self):
+        """Should generate a fresh ID for every new conversation."""
+        first_id, first = _new_conversation(None)
+        second_id, _ = _new_conversation(None)
+
+        assert first_id != second_id
+        assert first == {"metadata": None}
+
+
+class TestTokenWriter:
+    """Tests for batched interactive token output."""
+
+    def test_batches_tokens_until_threshold(self):
+        """Should coalesce small tokens into one plain-text write."""
+        console = MagicMock()
+        writer = _TokenWriter(console, max_chars=10, max_delay=3600)
+
+        writer.write("[bold]")
+        writer.write("hi")
+        console.print.assert_not_called()
+
+        writer.write(" there")
+        console.print.assert_called_once_with(
+            "[bold]hi there", end="", markup=False, highlight=False
+        )
+
+    def test_flush_writes_remaining_tokens_once(self):
+        """Should write pending text on flush and skip empty flushes."""
+        console = MagicMock()
+        writer = _TokenWriter(console, max_chars=100, max_delay=3600)
+
+        writer.write("done")
+        writer.flush()
+        writer.flush()
+
+        console.print.assert_called_once_with("done", end="", markup=False, highlight=False)
+
+
+class TestSingleQuery:
+    """Tests for single-query chat streaming."""
+
+    @pytest.mark.asyncio
+    async def test_markdown_rendered_once_per_refresh_interval(self):
+        """Should not re-parse Markdown for every token within one refresh interval."""
+        sse = b"".join(
+            b'data: {"type": "token", "content": "word "}\n\n' for _ in range(50)
+        ) + b'data: {"type": "complete"}\n\n'
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=_mock_api_client(sse)),
+            patch("src.cli.main.Markdown", wraps=Markdown) as mock_markdown,
+        ):
+            await _single_query("hi", None, "http://api")
+
+        rendered = [call.args[0] for call in mock_markdown.call_args_list]
+        assert len(rendered) < 50
+        assert rendered[-1] == "word " * 50
+
+    @pytest.mark.asyncio
+    async def test_error_message_printed_without_markup(self):
+        """Should print server error text literally so brackets in it are preserved."""
+        sse = b'data: {"type": "error", "message": "bad filter [/x]"}\n\n'
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=_mock_api_client(sse)),
+            patch("src.cli.main.console.print") as mock_print,
+            pytest.raises(typer.Exit),
+        ):
+            await _single_query("hi", None, "http://api")
+
+        [call] = [c for c in mock_print.call_args_list if c.args[:1] == ("Error: bad filter [/x]",)]
+        assert call.kwargs["markup"] is False
+
+    @pytest.mark.asyncio
+    async def test_no_stream_prints_raw_content(self, capsys):
+        """Should fetch one JSON response and write its content without Rich rendering."""
+        client_ctx = _mock_api_client(b"")
+        client = await client_ctx.__aenter__()
+        message_resp = MagicMock()
+        message_resp.json.return_value = {"content": "# VMs\n- [vm1]"}
+        client.post.return_value = message_resp
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=client_ctx),
+            patch("src.cli.main.Markdown") as mock_markdown,
+        ):
+            await _single_query("hi", None, "http://api", stream=False)
+
+        assert capsys.readouterr().out == "# VMs\n- [vm1]\n"
+        assert client.post.call_args.kwargs["json"]["stream"] is False
+        client.post.assert_called_once()
+        client.stream.assert_not_called()
+        mock_markdown.assert_not_called()
+
+
+def _mock_query_client(ndjson: bytes) -> tuple[MagicMock, MagicMock]:
+    """Build a mock httpx client whose streamed response carries the given NDJSON body."""
+
+    async def _bytes():
+        yield ndjson
+
+    stream_resp = MagicMock()
+    stream_resp.is_error = False
+    stream_resp.aiter_bytes = _bytes
+    stream_ctx = MagicMock()
+    stream_ctx.__aenter__ = AsyncMock(return_value=stream_resp)
+    stream_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    client = MagicMock()
+    client.stream = MagicMock(return_value=stream_ctx)
+    client_ctx = MagicMock()
+    client_ctx.__aenter__ = AsyncMock(return_value=client)
+    client_ctx.__aexit__ = AsyncMock(return_value=False)
+    return client_ctx, client
+
+
+class TestSearch:
+    """Tests for search result rendering."""
+
+    @pytest.mark.asyncio
+    async def test_result_content_is_not_markup(self):
+        """Should render result content and subtitles literally rather than as Rich markup."""
+        response = MagicMock()
+        response.json.return_value = {
+            "total_count": 1,
+            "results": [
+                {
+                    "id": "doc-1",
+                    "doc_type": "terraform_resource",
+                    "score": 0.5,
+                    "content": "tags = [bold]",
+                    "metadata": {"address": "module.x[0]"},
+                }
+            ],
+        }
+        client = MagicMock()
+        client.post = AsyncMock(return_value=response)
+        client_ctx = MagicMock()
+        client_ctx.__aenter__ = AsyncMock(return_value=client)
+        client_ctx.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=client_ctx),
+            patch("src.cli.main.console") as mock_console,
+        ):
+            await _search("tags", None, 10, "hybrid", "http://api")
+
+        panel = mock_console.print.call_args_list[-1].args[0]
+        assert panel.renderable.plain == "tags = [bold]"
+        assert panel.title.plain == "[1] terraform_resource | Score: 0.500"
+        assert panel.subtitle.plain == "module.x[0]"
+        assert client.post.call_args.kwargs["json"]["snippet_length"] == SEARCH_SNIPPET_LENGTH
+
+
+class TestResourceGraphQuery:
+    """Tests for streamed Resource Graph query output."""
+
+    @pytest.mark.asyncio
+    async def test_table_keeps_only_displayed_rows(self):
+        """Should request NDJSON and count every row while showing only the first page."""
+        ndjson = b"".join(b'{"name": "vm%d"}\n' % i for i in range(TABLE_MAX_ROWS + 5))
+        client_ctx, client = _mock_query_client(ndjson)
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=client_ctx),
+            patch("src.cli.main.console") as mock_console,
+        ):
+            await _resource_graph_query("Resources", None, "table", "http://api")
+
+        assert client.stream.call_args.kwargs["headers"]["Accept"] == "application/x-ndjson"
+        table = mock_console.print.call_args_list[-2].args[0]
+        assert table.row_count == TABLE_MAX_ROWS
+        assert f"Showing {TABLE_MAX_ROWS} of {TABLE_MAX_ROWS + 5}" in (
+            mock_console.print.call_args_list[-1].args[0]
+        )
+
+    @pytest.mark.asyncio
+    async def test_json_output_keeps_all_rows(self):
+        """Should print every streamed row for JSON output."""
+        client_ctx, _ = _mock_query_client(b'{"name": "vm1"}\n{"name": "vm2"}\n')
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=client_ctx),
+            patch("src.cli.main.console") as mock_console,
+        ):
+            await _resource_graph_query("Resources", None, "json", "http://api")
+
+        printed = mock_console.print.call_args.args[0]
+        assert json.loads(printed) == [{"name": "vm1"}, {"name": "vm2"}]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "trailer",
+        [b'{"error": "Query execution failed: timeout"}\n', b"not-json\n"],
+    )
+    async def test_broken_stream_exits_nonzero(self, trailer):
+        """Should fail rather than print partial rows when the stream breaks off."""
+        client_ctx, _ = _mock_query_client(b'{"name": "vm1"}\n' + trailer)
+
+        with (
+            patch("src.cli.main.get_token", AsyncMock(return_value="")),
+            patch("src.cli.main._create_client", return_value=client_ctx),
+            patch("src.cli.main.console") as mock_console,
+        ):
+            with pytest.raises(typer.Exit) as exc_info:
+                await _resource_graph_query("Resources", None, "table", "http://api")
+
+        assert exc_info.value.exit_code == 1
+        assert "Query failed after 1 row(s)" in mock_console.print.call_args.args[0]
+
+    def test_format_cell(self):
+        """Should blank out nulls and truncate long values."""
+        assert _format_cell(None) == ""
+        assert _format_cell(3) == "3"
+        assert _format_cell("x" * 50) == "x" * 50
+        assert _format_cell("x" * 51) == "x" * 47 + "..."
+
+
 class TestGetToken:
     """Tests for Azure CLI token retrieval."""
 
     @pytest.mark.asyncio
     async def test_get_token_success(self):
         """Should return token when Azure CLI succeeds."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "test-access-token\n"
+        proc = _mock_process(
+            0, json.dumps({"accessToken": "test-access-token", "expires_on": time.time() + 3600})
+        )
 
-        with patch("subprocess.run", return_value=mock_result):
+        with patch("asyncio.create_subprocess_exec", return_value=proc):
             token = await get_token()
             assert token == "test-access-token"
 
+    @pytest.mark.asyncio
+    async def test_get_token_cached_between_calls(self, token_cache_path):
+        """Should reuse a cached token instead of running Azure CLI again."""
+        proc = _mock_process(
+            0,
+            json.dumps({"accessToken": "test-access-token", "expires_on": int(time.time()) + 3600}),
+        )
+
+        with patch("asyncio.create_subprocess_exec", return_value=proc) as mock_exec:
+            assert await get_token() == "test-access-token"
+            assert await get_token() == "test-access-token"
+
+        mock_exec.assert_called_once()
+        assert token_cache_path.stat().st_mode & 0o777 == 0o600
+
+    @pytest.mark.asyncio
+    async def test_get_token_refreshes_after_profile_change(self, azure_profile_path):
+        """Should ignore the cached token after az login/logout or an account switch."""
+        proc = _mock_process(
+            0,
+            json.dumps({"accessToken": "test-access-token", "expires_on": int(time.time()) + 3600}),
+        )
+
+        with patch("asyncio.create_subprocess_exec", return_value=proc) as mock_exec:
+            await get_token()
+            stat = azure_profile_path.stat()
+            os.utime(azure_profile_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            await get_token()
+
+        assert mock_exec.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_token_refreshes_expiring_token(self, token_cache_path):
+        """Should ignore a cached token that is about to expire."""
+        token_cache_path.write_text(
+            json.dumps(
+                {
+                    "resource": TOKEN_RESOURCE,
+                    "token": "stale-token",
+                    "expires_on": time.time() + 10,
+                }
+            )
+        )
+        proc = _mock_process(
+            0, json.dumps({"accessToken": "fresh-token", "expiresOn": "2999-01-01 00:00:00.000000"})
+        )
+
+        with patch("asyncio.create_subprocess_exec", return_value=proc):
+            assert await get_token() == "fresh-token"
+
+        assert json.loads(token_cache_path.read_text())["token"] == "fresh-token"
+
+    @pytest.mark.asyncio
+    async def test_get_token_unparseable_output(self):
+        """Should return empty string when Azure CLI output is not JSON."""
+        with patch("asyncio.create_subprocess_exec", return_value=_mock_process(0, "not-json")):
+            assert await get_token() == ""
+
     @pytest.mark.asyncio
     async def test_get_token_cli_not_logged_in(self):
         """Should return empty string when not logged in."""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-
-        with patch("subprocess.run", return_value=mock_result):
+        with patch("asyncio.create_subprocess_exec", return_value=_mock_process(1, "")):
             token = await get_token()
             assert token == ""
 
     @pytest.mark.asyncio
     async def test_get_token_cli_not_found(self):
         """Should return empty string when Azure CLI not installed."""
-        with patch("subprocess.run", side_effect=FileNotFoundError()):
+        with patch("asyncio.create_subprocess_exec", side_effect=FileNotFoundError()):
             token = await get_token()
             assert token == ""
 
     @pytest.mark.asyncio
     async def test_get_token_timeout(self):
         """Should return empty string on timeout."""
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("az", 30)):
+        proc = _mock_process(0, "")
+        proc.communicate.side_effect = TimeoutError()
+
+        with patch("asyncio.create_subprocess_exec", return_value=proc):
             token = await get_token()
             assert token == ""
 
+        proc.kill.assert_called_once()
+
 
 class TestVersionCommand:
     """Tests for the version command."""
@@ -110,22 +542,28 @@ class TestConfigCommand:
 
     def test_config_shows_api_url(self):
         """Should display API URL configuration."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=1, stdout="")
+        with patch("asyncio.create_subprocess_exec", return_value=_mock_process(1, "")):
             result = runner.invoke(app, ["config"])
             assert result.exit_code == 0
             assert "API URL" in result.stdout
 
     def test_config_shows_azure_account(self):
         """Should show Azure account when logged in."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "My Test Subscription\n"
+        proc = _mock_process(0, "My Test Subscription\n")
 
-        with patch("subprocess.run", return_value=mock_result):
+        with patch("asyncio.create_subprocess_exec", return_value=proc) as mock_exec:
             result = runner.invoke(app, ["config"])
             assert result.exit_code == 0
             assert "Azure Account" in result.stdout
+            assert "My Test Subscription" in result.stdout
+            assert mock_exec.call_args.args[:3] == ("az", "account", "show")
+
+    def test_config_cli_not_found(self):
+        """Should report a missing Azure CLI."""
+        with patch("asyncio.create_subprocess_exec", side_effect=FileNotFoundError()):
+            result = runner.invoke(app, ["config"])
+            assert result.exit_code == 0
+            assert "CLI not available" in result.stdout
 
 
 class TestSearchCommand:
@@ -269,6 +707,20 @@ class TestAppStructure:
         assert result.exit_code in (0, 2)
         assert "Usage" in result.stdout or "chat" in result.stdout
 
+    def test_package_exports_app_lazily(self):
+        """Importing src.cli should not load the CLI module until app is accessed."""
+        import sys
+
+        code = (
+            "import sys, src.cli; "
+            "assert 'src.cli.main' not in sys.modules; "
+            "from src.cli import app; "
+            "assert 'src.cli.main' in sys.modules; "
+            "assert app is sys.modules['src.cli.main'].app"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
 
 class TestEnvironmentVariables:
     """Tests for environment variable handling."""
@@ -266,6 +266,55 @@ class TestSendMessage:
 
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_send_message_creates_conversation(self, app, mock_conversation_manager):
+        """Test that a message carrying a conversation request creates it under the path ID."""
+        mock_conversation_manager.get_conversation.return_value = None
+        mock_conversation_manager.load_conversation = AsyncMock(return_value=None)
+
+        async def mock_send_message(conv_id, content, stream=True):
+            yield AssistantResponse(content="Created", tool_calls_made=[], sources=[])
+
+        mock_conversation_manager.send_message = mock_send_message
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test"
+        ) as client:
+            response = await client.post(
+                "/conversations/new-conv/messages",
+                json={
+                    "content": "Hello",
+                    "stream": False,
+                    "conversation": {"metadata": {"subscription": "sub-1"}},
+                },
+            )
+
+        assert response.status_code == 200
+        kwargs = mock_conversation_manager.create_conversation.call_args.kwargs
+        assert kwargs["conversation_id"] == "new-conv"
+        assert kwargs["user_context"]["user_id"] == "anonymous"
+        assert kwargs["user_context"]["subscription"] == "sub-1"
+
+    def test_send_message_existing_conversation_not_recreated(
+        self, app, mock_conversation_manager
+    ):
+        """Test that an existing conversation is reused even if creation is requested."""
+
+        async def mock_send_message(conv_id, content, stream=True):
+            yield AssistantResponse(content="Hi", tool_calls_made=[], sources=[])
+
+        mock_conversation_manager.send_message = mock_send_message
+        client = TestClient(app)
+
+        response = client.post(
+            "/conversations/test-conv-123/messages",
+            json={"content": "Hello", "stream": False, "conversation": {}},
+        )
+
+        assert response.status_code == 200
+        mock_conversation_manager.create_conversation.assert_not_called()
+
     def test_send_message_empty_content(self, app):
         """Test sending message with empty content."""
         client = TestClient(app)
@@ -0,0 +1,340 @@
+"""Unit tests for GitService."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from src.api.models.git import GitCommit
+from src.api.services.git_service import GitService, _filter_diff
+
+
+def _query_result(items):
+    """Build an async iterator over Cosmos query results."""
+
+    async def _iter():
+        for item in items:
+            yield item
+
+    return _iter()
+
+
+@pytest.fixture
+def cosmos_client():
+    """Create a mock Cosmos client."""
+    return MagicMock()
+
+
+@pytest.fixture
+def container(cosmos_client):
+    """Mock Cosmos container returned by the client."""
+    return cosmos_client.get_database_client.return_value.get_container_client.return_value
+
+
+@pytest.fixture
+def git_service(cosmos_client):
+    """Create a GitService backed by a mock Cosmos client."""
+    return GitService(
+        cosmos_client=cosmos_client,
+        database_name="test-db",
+        container_name="test-container",
+    )
+
+
+class TestContainerCaching:
+    """Tests for container proxy reuse."""
+
+    @pytest.mark.asyncio
+    async def test_container_resolved_once(self, git_service, cosmos_client, container):
+        """Test that repeated queries reuse the same container proxy."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await git_service.list_commits()
+        await git_service.list_commits(author="alice")
+
+        cosmos_client.get_database_client.assert_called_once_with("test-db")
+        assert git_service._get_container() is container
+
+
+class TestGetCommit:
+    """Tests for GitService.get_commit."""
+
+    @pytest.mark.asyncio
+    async def test_full_sha_scoped_to_id_partition(self, git_service, container):
+        """Test that a full SHA lets the lookup target the commit's partition."""
+        git_service.partition_key_path = "/id"
+        container.query_items = Mock(return_value=_query_result([]))
+        sha = "a" * 40
+
+        await git_service.get_commit(sha, "https://github.com/org/repo")
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["partition_key"] == f"https://github.com/org/repo:{sha}"
+
+    @pytest.mark.asyncio
+    async def test_short_sha_falls_back_to_cross_partition(self, git_service, container):
+        """Test that a short SHA cannot derive the ID partition key."""
+        git_service.partition_key_path = "/id"
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await git_service.get_commit("abc1234", "https://github.com/org/repo")
+
+        assert container.query_items.call_args.kwargs["enable_cross_partition_query"] is True
+
+
+class TestPartitionScoping:
+    """Tests for partition-scoped commit queries."""
+
+    @pytest.mark.asyncio
+    async def test_list_commits_scoped_by_repo(self, git_service, container):
+        """Test that a repo_url filter scopes list_commits to one partition."""
+        git_service.partition_key_path = "/repo_url"
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await git_service.list_commits(repo_url="https://github.com/org/repo")
+
+        assert container.query_items.call_args.kwargs["partition_key"] == "https://github.com/org/repo"
+
+    @pytest.mark.asyncio
+    async def test_get_diff_scoped_by_id(self, git_service, container):
+        """Test that get_diff derives the ID partition key for full SHAs."""
+        git_service.partition_key_path = "/id"
+        container.query_items = Mock(return_value=_query_result([]))
+        sha = "b" * 40
+
+        await git_service.get_diff(sha, "https://github.com/org/repo")
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["partition_key"] == f"https://github.com/org/repo:{sha}"
+
+
+class TestListCommits:
+    """Tests for GitService.list_commits."""
+
+    @pytest.mark.asyncio
+    async def test_no_filters(self, git_service, container):
+        """Test the query shape with no filters set."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await git_service.list_commits()
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["query"].endswith(
+            "FROM c WHERE c.doc_type = 'git_commit' ORDER BY c.commit_date DESC"
+        )
+        assert kwargs["parameters"] == []
+
+    @pytest.mark.asyncio
+    async def test_projects_mapped_fields_only(self, git_service, container):
+        """Test that list_commits selects the mapped fields rather than whole documents."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await git_service.list_commits()
+
+        query = container.query_items.call_args.kwargs["query"]
+        assert "SELECT *" not in query
+        assert "c.commit_date" in query.split(" FROM ")[0]
+        assert "c.diff" not in query
+
+    @pytest.mark.asyncio
+    async def test_filters_bind_parameters(self, git_service, container):
+        """Test that each active filter adds its clause and parameter."""
+        container.query_items = Mock(return_value=_query_result([]))
+        since = datetime(2024, 1, 1, tzinfo=UTC)
+
+        await git_service.list_commits(
+            repo_url="https://github.com/org/repo",
+            since=since,
+            terraform_only=True,
+        )
+
+        kwargs = container.query_items.call_args.kwargs
+        assert "c.repo_url = @repo_url" in kwargs["query"]
+        assert "c.commit_date >= @since" in kwargs["query"]
+        assert "c.has_terraform_changes = true" in kwargs["query"]
+        assert "@author" not in kwargs["query"]
+        assert "@until" not in kwargs["query"]
+        assert kwargs["parameters"] == [
+            {"name": "@repo_url", "value": "https://github.com/org/repo"},
+            {"name": "@since", "value": since.isoformat()},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_query_template_reused(self, git_service, container):
+        """Test that the same filter combination reuses the cached query text."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await git_service.list_commits(author="alice")
+        first = container.query_items.call_args.kwargs["query"]
+        await git_service.list_commits(author="bob")
+        second = container.query_items.call_args.kwargs["query"]
+
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_stops_streaming_at_limit(self, git_service, container):
+        """Test that iteration stops once the limit is reached."""
+        consumed = []
+
+        async def _rows():
+            for i in range(5):
+                doc = {
+                    "sha": f"{i:040d}",
+                    "repo_url": "https://github.com/org/repo",
+                    "commit_date": "2024-01-15T10:30:00Z",
+                }
+                consumed.append(doc)
+                yield doc
+
+        container.query_items = Mock(return_value=_rows())
+
+        commits = await git_service.list_commits(limit=2)
+
+        assert len(commits) == 2
+        assert len(consumed) == 2
+        assert container.query_items.call_args.kwargs["max_item_count"] == 2
+
+
+class TestFilterDiff:
+    """Tests for per-file diff filtering."""
+
+    DIFF = (
+        "diff --git a/main.tf b/main.tf\n"
+        "--- a/main.tf\n"
+        "+++ b/main.tf\n"
+        "+resource \"azurerm_resource_group\" \"rg\" {}\n"
+        "diff --git a/README.md b/README.md\n"
+        "+docs\n"
+        "diff --git a/modules/main.tf b/modules/main.tf\n"
+        "+module\n"
+    )
+
+    def test_extracts_matching_sections(self):
+        """Test that every section whose header names the file is kept."""
+        result = _filter_diff(self.DIFF, "main.tf")
+
+        assert result.startswith("diff --git a/main.tf b/main.tf\n")
+        assert "README.md" not in result
+        assert result.endswith("diff --git a/modules/main.tf b/modules/main.tf\n+module\n")
+
+    def test_single_section(self):
+        """Test that a section is sliced up to the next header."""
+        assert _filter_diff(self.DIFF, "README.md") == (
+            "diff --git a/README.md b/README.md\n+docs\n"
+        )
+
+    def test_no_match(self):
+        """Test that an unmatched file yields an empty diff."""
+        assert _filter_diff(self.DIFF, "variables.tf") == ""
+
+    def test_ignores_paths_in_hunk_bodies(self):
+        """Test that a path mentioned only inside a hunk does not select the section."""
+        diff = (
+            "diff --git a/README.md b/README.md\n"
+            "+see main.tf for details\n"
+            "diff --git a/main.tf b/main.tf\n"
+            "+x\n"
+        )
+
+        assert _filter_diff(diff, "main.tf") == "diff --git a/main.tf b/main.tf\n+x\n"
+
+    def test_header_without_trailing_newline(self):
+        """Test a diff whose last section has no trailing newline."""
+        assert _filter_diff("diff --git a/main.tf b/main.tf", "main.tf") == (
+            "diff --git a/main.tf b/main.tf"
+        )
+
+
+class TestMapToCommit:
+    """Tests for mapping Cosmos documents to GitCommit."""
+
+    def test_parses_utc_designator(self, git_service):
+        """Test that a trailing Z is parsed as UTC."""
+        commit = git_service._map_to_commit(
+            {
+                "sha": "a" * 40,
+                "repo_url": "https://github.com/org/repo",
+                "commit_date": "2024-01-15T10:30:00Z",
+            }
+        )
+
+        assert commit.commit_date == datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+        assert commit.short_sha == "aaaaaaa"
+        assert commit.files_changed == []
+
+    def test_maps_file_changes(self, git_service):
+        """Test that file changes are mapped and serialize like validated models."""
+        commit = git_service._map_to_commit(
+            {
+                "sha": "a" * 40,
+                "repo_url": "https://github.com/org/repo",
+                "commit_date": "2024-01-15T10:30:00Z",
+                "files_changed": [{"path": "main.tf", "change_type": "modify", "additions": 2}],
+                "has_terraform_changes": True,
+            }
+        )
+
+        assert commit.files_changed[0].path == "main.tf"
+        assert commit.files_changed[0].deletions == 0
+        assert commit.model_dump(mode="json") == GitCommit.model_validate(
+            commit.model_dump()
+        ).model_dump(mode="json")
+
+
+class TestGetCommits:
+    """Tests for GitService.get_commits."""
+
+    @pytest.mark.asyncio
+    async def test_keys_results_by_requested_sha(self, git_service, container):
+        """Test that commits are keyed by whichever SHA form was requested."""
+        full_sha = "a" * 40
+        container.query_items = Mock(
+            return_value=_query_result(
+                [
+                    {
+                        "sha": full_sha,
+                        "short_sha": "aaaaaaa",
+                        "repo_url": "https://github.com/org/repo",
+                        "commit_date": "2024-01-15T10:30:00Z",
+                    }
+                ]
+            )
+        )
+
+        result = await git_service.get_commits(["aaaaaaa", "bbbbbbb"], "https://github.com/org/repo")
+
+        assert list(result) == ["aaaaaaa"]
+        assert result["aaaaaaa"].sha == full_sha
+        kwargs = container.query_items.call_args.kwargs
+        assert "ARRAY_CONTAINS(@shas, c.sha)" in kwargs["query"]
+        assert {"name": "@repo_url", "value": "https://github.com/org/repo"} in kwargs["parameters"]
+
+
+class TestGetDiff:
+    """Tests for GitService.get_diff."""
+
+    @pytest.mark.asyncio
+    async def test_single_query(self, git_service, container):
+        """Test that the diff is fetched without a separate commit lookup."""
+        container.query_items = Mock(
+            return_value=_query_result([{"diff": "diff --git a/main.tf b/main.tf\n+x\n"}])
+        )
+
+        diff = await git_service.get_diff("abc1234", "https://github.com/org/repo")
+
+        assert diff.startswith("diff --git a/main.tf")
+        container.query_items.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_commit_without_stored_diff(self, git_service, container):
+        """Test that a commit with no stored diff yields an empty string."""
+        container.query_items = Mock(return_value=_query_result([{}]))
+
+        assert await git_service.get_diff("abc1234", "https://github.com/org/repo") == ""
+
+    @pytest.mark.asyncio
+    async def test_missing_commit(self, git_service, container):
+        """Test that a missing commit yields None."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await git_service.get_diff("abc1234", "https://github.com/org/repo") is None
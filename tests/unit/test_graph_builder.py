@@ -173,6 +173,8 @@ class TestGraphBuilder:
         assert bindings["tf_addr"] == "azurerm_resource_group.main"
         assert bindings["tf_type"] == "azurerm_resource_group"
         assert bindings["file_path"] == "main.tf"
+        assert bindings["line_number"] == 0
+        assert bindings["source_code"] == ""
 
     def test_link_terraform_to_azure(self, graph_builder, mock_gremlin_client):
         """Test linking Terraform resource to Azure resource."""
@@ -265,6 +267,33 @@ class TestGraphBuilder:
         assert "manages" in query
         assert "inE" in query
         assert "project" in query
+        assert "'line_number'" in query
+        assert "'source_code'" in query
+
+    def test_find_terraform_for_resources(self, graph_builder, mock_gremlin_client):
+        """Test finding Terraform for several Azure resources in one traversal."""
+        mock_gremlin_client.submit = Mock(
+            return_value=[
+                {"azure_id": "/subscriptions/sub-123/rg-a", "address": "azurerm_resource_group.a"},
+                {"azure_id": "/subscriptions/sub-123/rg-a", "address": "azurerm_resource_group.a2"},
+                {"azure_id": "/subscriptions/sub-123/rg-b", "address": "azurerm_resource_group.b"},
+            ]
+        )
+
+        results = graph_builder.find_terraform_for_resources(
+            ["/subscriptions/sub-123/rg-a", "/subscriptions/sub-123/rg-b", "/subscriptions/sub-123/rg-c"]
+        )
+
+        assert [r["address"] for r in results["/subscriptions/sub-123/rg-a"]] == [
+            "azurerm_resource_group.a",
+            "azurerm_resource_group.a2",
+        ]
+        assert "azure_id" not in results["/subscriptions/sub-123/rg-b"][0]
+        assert "/subscriptions/sub-123/rg-c" not in results
+        query, bindings = mock_gremlin_client.submit.call_args[0]
+        assert "within(azure_ids)" in query
+        mock_gremlin_client.submit.assert_called_once()
+        assert len(bindings["azure_ids"]) == 3
 
     def test_find_resource_group_resources(self, graph_builder, mock_gremlin_client):
         """Test finding all resources in a resource group."""
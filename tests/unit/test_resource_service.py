@@ -0,0 +1,646 @@
+"""Unit tests for ResourceService."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from src.api.services.resource_service import (
+    TERRAFORM_LOOKUP_BATCH_SIZE,
+    ResourceService,
+    _normalize_kql,
+)
+
+
+def _query_result(items):
+    """Build an async iterator over Cosmos query results."""
+
+    async def _iter():
+        for item in items:
+            yield item
+
+    return _iter()
+
+
+@pytest.fixture
+def cosmos_client():
+    """Create a mock Cosmos client."""
+    return MagicMock()
+
+
+@pytest.fixture
+def container(cosmos_client):
+    """Mock Cosmos container returned by the client."""
+    return cosmos_client.get_database_client.return_value.get_container_client.return_value
+
+
+@pytest.fixture
+def resource_service(cosmos_client):
+    """Create a ResourceService backed by a mock Cosmos client."""
+    return ResourceService(
+        cosmos_client=cosmos_client,
+        database_name="test-db",
+        container_name="test-container",
+        arg_connector=MagicMock(),
+    )
+
+
+@pytest.fixture
+def resource_doc():
+    """Sample Azure resource document as stored in Cosmos DB."""
+    return {
+        "id": "/subscriptions/sub-1/resourceGroups/rg-1/providers/Microsoft.Compute/virtualMachines/vm-1",
+        "doc_type": "azure_resource",
+        "name": "vm-1",
+        "type": "Microsoft.Compute/virtualMachines",
+        "resource_group": "rg-1",
+        "subscription_id": "sub-1",
+        "location": "eastus",
+    }
+
+
+class TestContainerCaching:
+    """Tests for container proxy reuse."""
+
+    @pytest.mark.asyncio
+    async def test_container_resolved_once(self, resource_service, cosmos_client, container, resource_doc):
+        """Test that repeated lookups reuse the same container proxy."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([resource_doc]))
+
+        await resource_service.get_resource(resource_doc["id"])
+        await resource_service.get_resource(resource_doc["id"])
+        await resource_service.get_terraform_resource("azurerm_virtual_machine.vm")
+
+        cosmos_client.get_database_client.assert_called_once_with("test-db")
+        cosmos_client.get_database_client.return_value.get_container_client.assert_called_once_with(
+            "test-container"
+        )
+
+
+class TestGetResource:
+    """Tests for ResourceService.get_resource."""
+
+    @pytest.mark.asyncio
+    async def test_stops_after_first_row(self, resource_service, container, resource_doc):
+        """Test that only the first row is consumed and the page size is capped."""
+        consumed = []
+
+        async def _rows():
+            for doc in (resource_doc, {**resource_doc, "name": "vm-2"}):
+                consumed.append(doc)
+                yield doc
+
+        container.query_items = Mock(return_value=_rows())
+
+        result = await resource_service.get_resource(resource_doc["id"])
+
+        assert result.name == "vm-1"
+        assert len(consumed) == 1
+        assert container.query_items.call_args.kwargs["max_item_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_projects_mapped_fields_only(self, resource_service, container):
+        """Test that the lookup selects only the fields AzureResource needs."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await resource_service.get_resource("/subscriptions/sub-1")
+
+        query = container.query_items.call_args.kwargs["query"]
+        assert "SELECT *" not in query
+        assert "c.properties" in query
+        assert "c.searchable_text" not in query
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, resource_service, container):
+        """Test that an empty result returns None."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await resource_service.get_resource("/subscriptions/missing") is None
+
+
+class TestLookupCache:
+    """Tests for cached point lookups."""
+
+    @pytest.mark.asyncio
+    async def test_found_resource_cached(self, resource_service, container, resource_doc):
+        """Test that a repeated lookup is served without querying again."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([resource_doc]))
+
+        first = await resource_service.get_resource(resource_doc["id"])
+        first.tags["mutated"] = "yes"
+        second = await resource_service.get_resource(resource_doc["id"])
+
+        # Callers get their own copy, so mutations don't leak into the cache
+        assert second is not first
+        assert "mutated" not in second.tags
+        container.query_items.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_misses_not_cached(self, resource_service, container):
+        """Test that a not-found result is looked up again on the next call."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await resource_service.get_resource("/subscriptions/missing")
+        await resource_service.get_resource("/subscriptions/missing")
+
+        assert container.query_items.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_terraform_links_cached_separately(self, resource_service, container):
+        """Test that Terraform links are cached by address."""
+        container.query_items = Mock(
+            side_effect=lambda **_: _query_result([{"address": "azurerm_virtual_machine.vm"}])
+        )
+
+        await resource_service.get_terraform_resource("azurerm_virtual_machine.vm")
+        await resource_service.get_terraform_resource("azurerm_virtual_machine.vm")
+        await resource_service.get_resource("azurerm_virtual_machine.vm")
+
+        assert container.query_items.call_count == 2
+
+
+class TestGetTerraformResource:
+    """Tests for ResourceService.get_terraform_resource."""
+
+    @pytest.mark.asyncio
+    async def test_returns_first_match(self, resource_service, container):
+        """Test that the first matching document is mapped to a TerraformLink."""
+        container.query_items = Mock(
+            return_value=_query_result(
+                [{"address": "azurerm_virtual_machine.vm", "type": "azurerm_virtual_machine"}]
+            )
+        )
+
+        result = await resource_service.get_terraform_resource("azurerm_virtual_machine.vm")
+
+        assert result.address == "azurerm_virtual_machine.vm"
+        assert result.branch == "main"
+        assert container.query_items.call_args.kwargs["max_item_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, resource_service, container):
+        """Test that an empty result returns None."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await resource_service.get_terraform_resource("missing.address") is None
+
+
+class TestPartitionScoping:
+    """Tests for single-partition lookups."""
+
+    @pytest.mark.asyncio
+    async def test_cross_partition_without_partition_key(self, resource_service, container):
+        """Test that lookups fan out when the partition key is unknown."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await resource_service.get_resource("/subscriptions/sub-1")
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["enable_cross_partition_query"] is True
+        assert "partition_key" not in kwargs
+
+    @pytest.mark.asyncio
+    async def test_scoped_to_partition_when_key_derivable(self, resource_service, container):
+        """Test that lookups target one partition when the key is derivable."""
+        resource_service.partition_key_path = "/doc_type"
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await resource_service.get_resource("/subscriptions/sub-1")
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["partition_key"] == "azure_resource"
+        assert "enable_cross_partition_query" not in kwargs
+
+
+class TestGetResources:
+    """Tests for ResourceService.get_resources."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_all_ids_in_one_query(self, resource_service, container, resource_doc):
+        """Test that several IDs are looked up with a single ARRAY_CONTAINS query."""
+        container.query_items = Mock(return_value=_query_result([resource_doc]))
+
+        result = await resource_service.get_resources([resource_doc["id"], "/subscriptions/missing"])
+
+        assert list(result) == [resource_doc["id"]]
+        assert result[resource_doc["id"]].name == "vm-1"
+        kwargs = container.query_items.call_args.kwargs
+        assert "ARRAY_CONTAINS(@resource_ids, c.id)" in kwargs["query"]
+        assert kwargs["parameters"] == [
+            {"name": "@resource_ids", "value": [resource_doc["id"], "/subscriptions/missing"]}
+        ]
+        container.query_items.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_ids_skip_query(self, resource_service, container):
+        """Test that no query is issued for an empty ID list."""
+        container.query_items = Mock()
+
+        assert await resource_service.get_resources([]) == {}
+        container.query_items.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_shares_lookup_cache(self, resource_service, container, resource_doc):
+        """Test that IDs cached by get_resource are not queried again, and vice versa."""
+        other_doc = {**resource_doc, "id": "/subscriptions/sub-1/vm-2", "name": "vm-2"}
+        container.query_items = Mock(side_effect=lambda **_: _query_result([resource_doc]))
+        await resource_service.get_resource(resource_doc["id"])
+
+        container.query_items = Mock(return_value=_query_result([other_doc]))
+        result = await resource_service.get_resources([resource_doc["id"], other_doc["id"]])
+
+        assert set(result) == {resource_doc["id"], other_doc["id"]}
+        assert container.query_items.call_args.kwargs["parameters"] == [
+            {"name": "@resource_ids", "value": [other_doc["id"]]}
+        ]
+        assert (await resource_service.get_resource(other_doc["id"])).name == "vm-2"
+        container.query_items.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_query_failure_raises(self, resource_service, container):
+        """Test that a Cosmos DB failure is raised rather than reported as not found."""
+        container.query_items = Mock(side_effect=Exception("Service unavailable"))
+
+        with pytest.raises(Exception, match="Service unavailable"):
+            await resource_service.get_resources(["/subscriptions/sub-1/vm-1"])
+
+
+class TestInventoryCaching:
+    """Tests for cached subscription and resource type lookups."""
+
+    @pytest.mark.asyncio
+    async def test_list_subscriptions_cached(self, resource_service):
+        """Test that subscriptions are fetched once within the TTL."""
+        resource_service.arg_connector.enumerate_subscriptions = AsyncMock(
+            return_value=[{"id": "sub-1"}]
+        )
+
+        first = await resource_service.list_subscriptions()
+        second = await resource_service.list_subscriptions()
+
+        assert first == second == [{"id": "sub-1"}]
+        resource_service.arg_connector.enumerate_subscriptions.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self, resource_service):
+        """Test that concurrent callers on a cold cache share one fetch."""
+        resource_service.arg_connector.enumerate_subscriptions = AsyncMock(
+            return_value=[{"id": "sub-1"}]
+        )
+
+        results = await asyncio.gather(
+            *(resource_service.list_subscriptions() for _ in range(5))
+        )
+
+        assert all(r == [{"id": "sub-1"}] for r in results)
+        resource_service.arg_connector.enumerate_subscriptions.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, resource_service):
+        """Test that a failed fetch is retried on the next call."""
+        resource_service.arg_connector.enumerate_subscriptions = AsyncMock(
+            side_effect=[Exception("ARG unavailable"), [{"id": "sub-1"}]]
+        )
+
+        assert await resource_service.list_subscriptions() == []
+        assert await resource_service.list_subscriptions() == [{"id": "sub-1"}]
+
+    @pytest.mark.asyncio
+    async def test_resource_types_cached_per_subscription(self, resource_service):
+        """Test that resource type summaries are cached per subscription."""
+        resource_service.arg_connector.fetch_resource_types = AsyncMock(
+            return_value=[{"type": "Microsoft.Compute/virtualMachines", "count_": 3}]
+        )
+
+        await resource_service.get_resource_types_summary("sub-1")
+        await resource_service.get_resource_types_summary("sub-1")
+        await resource_service.get_resource_types_summary("sub-2")
+
+        assert resource_service.arg_connector.fetch_resource_types.await_count == 2
+
+
+class TestResourceGraphSession:
+    """Tests for the shared Resource Graph connector session."""
+
+    @pytest.mark.asyncio
+    async def test_session_opened_once(self, resource_service):
+        """Test that the connector is entered once and reused across calls."""
+        connector = resource_service.arg_connector
+        connector.enumerate_subscriptions = AsyncMock(return_value=[])
+        connector.fetch_resource_types = AsyncMock(return_value=[])
+
+        await resource_service.list_subscriptions()
+        await resource_service.get_resource_types_summary("sub-1")
+        await resource_service.get_resource_types_summaries(["sub-2", "sub-3"])
+
+        connector.__aenter__.assert_awaited_once()
+        connector.__aexit__.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_close(self, resource_service):
+        """Test that close() exits an open session once and is a no-op otherwise."""
+        connector = resource_service.arg_connector
+        await resource_service.close()
+        connector.__aexit__.assert_not_awaited()
+
+        await resource_service._get_arg_connector()
+        await resource_service.close()
+        await resource_service.close()
+
+        connector.__aexit__.assert_awaited_once()
+
+
+class TestExecuteResourceGraphQuery:
+    """Tests for ResourceService.execute_resource_graph_query."""
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_passed_per_call(self, resource_service):
+        """Test that subscriptions are scoped to the call, not stored on the connector."""
+        connector = resource_service.arg_connector
+        connector.subscription_ids = []
+        calls = []
+
+        async def _fetch(query, subscription_ids=None):
+            calls.append(subscription_ids)
+            yield {"id": "r1"}
+
+        connector.fetch_all_resources = _fetch
+
+        results = await resource_service.execute_resource_graph_query(
+            "Resources | take 1", subscriptions=["sub-1"]
+        )
+        await resource_service.execute_resource_graph_query("Resources | take 1")
+
+        assert results == [{"id": "r1"}]
+        assert calls == [["sub-1"], None]
+        assert connector.subscription_ids == []
+
+    @pytest.mark.asyncio
+    async def test_truncates_at_max_results(self, resource_service, caplog):
+        """Test that collection stops at max_results and logs the truncation."""
+        consumed = []
+
+        async def _fetch(query, subscription_ids=None):
+            for i in range(10):
+                consumed.append(i)
+                yield {"id": f"r{i}"}
+
+        resource_service.arg_connector.fetch_all_resources = _fetch
+
+        results = await resource_service.execute_resource_graph_query(
+            "Resources", max_results=3
+        )
+
+        assert [r["id"] for r in results] == ["r0", "r1", "r2"]
+        assert len(consumed) == 4
+        assert "truncated at 3 results" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_without_caching(self, resource_service):
+        """Test that the streaming variant yields every row and bypasses the cache."""
+
+        async def _fetch(query, subscription_ids=None):
+            for i in range(3):
+                yield {"id": f"r{i}"}
+
+        resource_service.arg_connector.fetch_all_resources = _fetch
+
+        rows = [row async for row in resource_service.stream_resource_graph_query("Resources")]
+
+        assert [r["id"] for r in rows] == ["r0", "r1", "r2"]
+        assert len(resource_service._kql_cache) == 0
+
+
+class TestKqlCache:
+    """Tests for cached Resource Graph query results."""
+
+    @pytest.fixture
+    def fetch_calls(self, resource_service):
+        calls = []
+
+        async def _fetch(query, subscription_ids=None):
+            calls.append(query)
+            yield {"id": "r1"}
+
+        resource_service.arg_connector.fetch_all_resources = _fetch
+        return calls
+
+    def test_normalize_collapses_whitespace_outside_literals(self):
+        """Test that only whitespace outside string literals is collapsed."""
+        assert _normalize_kql("  Resources\n|   where name == 'a  b'\n") == (
+            "Resources | where name == 'a  b'"
+        )
+
+    def test_normalize_drops_line_comments(self):
+        """Test that a comment can't swallow clauses once line breaks are collapsed."""
+        filtered = _normalize_kql('Resources // recent\n| where type == "x"')
+        commented_out = _normalize_kql('Resources // recent | where type == "x"')
+
+        assert filtered == 'Resources | where type == "x"'
+        assert commented_out == "Resources"
+        assert _normalize_kql("Resources | where url == 'https://x'") == (
+            "Resources | where url == 'https://x'"
+        )
+
+    @pytest.mark.asyncio
+    async def test_results_copied_out_of_cache(self, resource_service, fetch_calls):
+        """Test that mutating returned rows does not change what later callers get."""
+        first = await resource_service.execute_resource_graph_query("Resources | take 1")
+        first[0]["id"] = "mutated"
+        first.append({"id": "extra"})
+
+        again = await resource_service.execute_resource_graph_query("Resources | take 1")
+
+        assert again == [{"id": "r1"}]
+        assert len(fetch_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_whitespace_variants_share_results(self, resource_service, fetch_calls):
+        """Test that queries differing only in layout are served from the cache."""
+        await resource_service.execute_resource_graph_query(
+            "Resources | take 1", subscriptions=["sub-2", "sub-1"]
+        )
+        result = await resource_service.execute_resource_graph_query(
+            "Resources\n    | take 1", subscriptions=["sub-1", "sub-2"]
+        )
+
+        assert result == [{"id": "r1"}]
+        assert len(fetch_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_scope_not_shared(self, resource_service, fetch_calls):
+        """Test that literals and subscriptions are part of the cache key."""
+        await resource_service.execute_resource_graph_query("Resources | where name == 'a b'")
+        await resource_service.execute_resource_graph_query("Resources | where name == 'a  b'")
+        await resource_service.execute_resource_graph_query(
+            "Resources | where name == 'a b'", subscriptions=["sub-1"]
+        )
+
+        assert len(fetch_calls) == 3
+
+
+class TestResourceTypesSummaries:
+    """Tests for ResourceService.get_resource_types_summaries."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_misses_concurrently(self, resource_service):
+        """Test that uncached subscriptions are fetched in parallel, one request each."""
+        in_flight = 0
+        peak = 0
+
+        async def _fetch(subscription_ids):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return [{"type": f"types-for-{subscription_ids[0]}", "count_": 1}]
+
+        resource_service.arg_connector.fetch_resource_types = AsyncMock(side_effect=_fetch)
+        await resource_service.get_resource_types_summary("sub-1")
+
+        result = await resource_service.get_resource_types_summaries(["sub-1", "sub-2", "sub-3"])
+
+        assert result["sub-2"] == [{"type": "types-for-sub-2", "count_": 1}]
+        assert list(result) == ["sub-1", "sub-2", "sub-3"]
+        assert resource_service.arg_connector.fetch_resource_types.await_count == 3
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self, resource_service):
+        """Test that a failed subscription yields an empty list and is retried later."""
+        resource_service.arg_connector.fetch_resource_types = AsyncMock(
+            side_effect=[Exception("throttled"), [{"type": "t", "count_": 1}]]
+        )
+
+        assert await resource_service.get_resource_types_summaries(["sub-1"]) == {"sub-1": []}
+        assert await resource_service.get_resource_types_summaries(["sub-1"]) == {
+            "sub-1": [{"type": "t", "count_": 1}]
+        }
+
+
+class TestGetTerraformForResources:
+    """Tests for ResourceService.get_terraform_for_resources."""
+
+    @pytest.mark.asyncio
+    async def test_groups_links_by_resource(self, resource_service, container):
+        """Test that one query resolves several IDs and results are grouped per ID."""
+        resource_service.graph_builder = None
+        container.query_items = Mock(
+            return_value=_query_result(
+                [
+                    {"azure_resource_id": "/subscriptions/sub-1/vm-1", "address": "azurerm_virtual_machine.a"},
+                    {"azure_resource_id": "/subscriptions/sub-1/vm-1", "address": "azurerm_network_interface.a"},
+                ]
+            )
+        )
+
+        result = await resource_service.get_terraform_for_resources(
+            ["/subscriptions/sub-1/vm-1", "/subscriptions/sub-1/vm-2"]
+        )
+
+        assert [link.address for link in result["/subscriptions/sub-1/vm-1"]] == [
+            "azurerm_virtual_machine.a",
+            "azurerm_network_interface.a",
+        ]
+        assert "/subscriptions/sub-1/vm-2" not in result
+        kwargs = container.query_items.call_args.kwargs
+        assert "ARRAY_CONTAINS(@resource_ids, c.azure_resource_id)" in kwargs["query"]
+        container.query_items.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_chunks_large_id_lists(self, resource_service, container):
+        """Test that IDs are split across queries of at most the batch size."""
+        resource_service.graph_builder = None
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+        ids = [f"/subscriptions/sub-1/vm-{i}" for i in range(TERRAFORM_LOOKUP_BATCH_SIZE + 1)]
+
+        await resource_service.get_terraform_for_resources(ids + ids[:5])
+
+        chunks = [c.kwargs["parameters"][0]["value"] for c in container.query_items.call_args_list]
+        assert [len(chunk) for chunk in chunks] == [TERRAFORM_LOOKUP_BATCH_SIZE, 1]
+
+    @pytest.mark.asyncio
+    async def test_single_lookup_delegates(self, resource_service, container):
+        """Test that get_terraform_for_resource returns an empty list for unmanaged IDs."""
+        resource_service.graph_builder = None
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await resource_service.get_terraform_for_resource("/subscriptions/sub-1/vm-1") == []
+
+
+class TestGetDependencies:
+    """Tests for ResourceService.get_dependencies."""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_paths_emit_each_vertex_once(self, resource_service):
+        """Test that vertices shared by several paths are returned once, minus the root."""
+        root = {"id": "/subscriptions/sub-1/vm-1", "name": "vm-1"}
+        nic = {"id": "/subscriptions/sub-1/nic-1", "name": "nic-1", "type": "nic"}
+        vnet = {"id": "/subscriptions/sub-1/vnet-1", "name": "vnet-1", "type": "vnet"}
+        resource_service.graph_builder = MagicMock()
+        resource_service.graph_builder.find_dependencies.return_value = [
+            [root, {"label": "depends_on"}, nic],
+            [root, nic, vnet],
+            vnet,
+        ]
+
+        deps = await resource_service.get_dependencies(root["id"], direction="out")
+
+        assert [d.id for d in deps] == [nic["id"], vnet["id"]]
+        assert {d.direction for d in deps} == {"upstream"}
+
+    @pytest.mark.asyncio
+    async def test_bare_vertices_are_bidirectional(self, resource_service):
+        """Test that vertices not wrapped in a path are labelled as both directions."""
+        resource_service.graph_builder = MagicMock()
+        resource_service.graph_builder.find_dependencies.return_value = [
+            {"id": "/subscriptions/sub-1/nic-1"},
+            "not-a-vertex",
+        ]
+
+        deps = await resource_service.get_dependencies("/subscriptions/sub-1/vm-1")
+
+        assert len(deps) == 1
+        assert deps[0].direction == "both"
+
+
+class TestGraphCache:
+    """Tests for cached graph traversals."""
+
+    @pytest.fixture
+    def graph_builder(self, resource_service):
+        resource_service.graph_builder = MagicMock()
+        return resource_service.graph_builder
+
+    @pytest.mark.asyncio
+    async def test_dependencies_cached_per_arguments(self, resource_service, graph_builder):
+        """Test that repeated traversals with the same arguments hit the cache."""
+        graph_builder.find_dependencies.return_value = [[{"id": "/subscriptions/sub-1/nic-1"}]]
+
+        first = await resource_service.get_dependencies("/subscriptions/sub-1/vm-1")
+        second = await resource_service.get_dependencies("/subscriptions/sub-1/vm-1")
+        await resource_service.get_dependencies("/subscriptions/sub-1/vm-1", depth=3)
+
+        assert first == second
+        assert graph_builder.find_dependencies.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_terraform_bulk_traversal_for_uncached_ids(self, resource_service, graph_builder):
+        """Test that uncached IDs share one traversal and unmanaged IDs are cached too."""
+        graph_builder.find_terraform_for_resources.return_value = {
+            "/subscriptions/sub-1/vm-1": [{"address": "azurerm_virtual_machine.a"}],
+        }
+
+        result = await resource_service.get_terraform_for_resources(
+            ["/subscriptions/sub-1/vm-1", "/subscriptions/sub-1/vm-2"]
+        )
+        again = await resource_service.get_terraform_for_resources(
+            ["/subscriptions/sub-1/vm-1", "/subscriptions/sub-1/vm-2"]
+        )
+
+        assert list(result) == list(again) == ["/subscriptions/sub-1/vm-1"]
+        graph_builder.find_terraform_for_resources.assert_called_once_with(
+            ["/subscriptions/sub-1/vm-1", "/subscriptions/sub-1/vm-2"]
+        )
+        graph_builder.find_terraform_for_resource.assert_not_called()
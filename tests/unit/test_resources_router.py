@@ -112,6 +112,49 @@ class TestGetResourceEndpoint:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
+    def test_get_resource_etag(self, client, mock_resource_service, sample_azure_resource):
+        """Test that resource responses carry an ETag honored by If-None-Match."""
+        mock_resource_service.get_resource.return_value = sample_azure_resource
+
+        resource_id = "/subscriptions/sub-123/resourceGroups/test-rg/providers/Microsoft.Compute/virtualMachines/test-vm"
+        response = client.get(f"/api/v1/resources{resource_id}")
+        assert response.status_code == 200
+        assert "etag" in response.headers
+
+        response = client.get(
+            f"/api/v1/resources{resource_id}",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+
+    def test_get_resource_by_query_parameter(self, client, mock_resource_service, sample_azure_resource):
+        """Test fetching a resource with the ID passed as ?id=."""
+        mock_resource_service.get_resource.return_value = sample_azure_resource
+
+        resource_id = "/subscriptions/sub-123/resourceGroups/test-rg/providers/Microsoft.Compute/virtualMachines/test-vm"
+        response = client.get("/api/v1/resources", params={"id": resource_id})
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "test-vm"
+        mock_resource_service.get_resource.assert_called_once_with(resource_id)
+
+    def test_get_resource_by_query_parameter_not_found(self, client, mock_resource_service):
+        """Test 404 for an unknown ID passed as ?id=."""
+        mock_resource_service.get_resource.return_value = None
+
+        response = client.get("/api/v1/resources", params={"id": "/subscriptions/missing"})
+
+        assert response.status_code == 404
+
+    def test_greedy_route_isolated_from_specific_routes(self):
+        """Test that only the greedy router holds the catch-all path route."""
+        from src.api.routers.resources import greedy_router, specific_router
+
+        assert [route.path for route in greedy_router.routes] == ["/resources/{resource_id:path}"]
+        assert "/resources/{resource_id:path}" not in [
+            route.path for route in specific_router.routes
+        ]
+
     def test_get_resource_url_decoding(self, client, mock_resource_service, sample_azure_resource):
         """Test that resource IDs are properly URL decoded."""
         mock_resource_service.get_resource.return_value = sample_azure_resource
@@ -126,6 +169,14 @@ class TestGetResourceEndpoint:
         call_args = mock_resource_service.get_resource.call_args[0]
         assert "/" in call_args[0]  # Should contain decoded slashes
 
+    def test_decode_resource_id_skips_unescaped_ids(self):
+        """Test that IDs without percent-escapes are returned unchanged."""
+        from src.api.routers.resources import _decode_resource_id
+
+        resource_id = "/subscriptions/sub-123/resourceGroups/test-rg"
+        assert _decode_resource_id(resource_id) is resource_id
+        assert _decode_resource_id("%2Fsubscriptions%2Fsub-123") == "/subscriptions/sub-123"
+
 
 class TestGetTerraformForResourceEndpoint:
     """Tests for GET /resources/{resource_id}/terraform endpoint."""
@@ -159,6 +210,32 @@ class TestGetTerraformForResourceEndpoint:
         assert data[0]["file_path"] == "infrastructure/compute.tf"
         assert data[0]["line_number"] == 42
 
+    def test_get_terraform_links_from_graph_projection(
+        self, client, mock_resource_service, mock_graph_builder
+    ):
+        """Test that fully projected graph links skip the Cosmos DB lookup."""
+        mock_graph_builder.find_terraform_for_resource.return_value = [
+            {
+                "address": "azurerm_virtual_machine.test_vm",
+                "type": "azurerm_virtual_machine",
+                "file_path": "infrastructure/compute.tf",
+                "line_number": 42,
+                "repo_url": "https://github.com/org/repo",
+                "branch": "main",
+                "source_code": 'resource "azurerm_virtual_machine" "test_vm" {}',
+            }
+        ]
+
+        resource_id = "/subscriptions/sub-123/resourceGroups/test-rg/providers/Microsoft.Compute/virtualMachines/test-vm"
+        response = client.get(f"/api/v1/resources{resource_id}/terraform")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["line_number"] == 42
+        assert data[0]["type"] == "azurerm_virtual_machine"
+        mock_resource_service.get_terraform_resource.assert_not_called()
+
     def test_get_terraform_links_empty(self, client, mock_graph_builder, mock_resource_service):
         """Test when no Terraform links are found."""
         mock_graph_builder.find_terraform_for_resource.return_value = []
@@ -416,6 +493,65 @@ class TestResourceGraphQueryEndpoint:
 
         assert response.status_code == 422  # Validation error
 
+    def test_query_streams_ndjson(self, client, mock_resource_service):
+        """Test that an NDJSON Accept header streams one row per line."""
+
+        async def _rows(query, subscriptions):
+            yield {"name": "vm1"}
+            yield {"name": "vm2"}
+
+        mock_resource_service.stream_resource_graph_query = MagicMock(side_effect=_rows)
+
+        response = client.post(
+            "/api/v1/resources/resource-graph/query",
+            json={"query": "Resources | limit 10"},
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.text == '{"name": "vm1"}\n{"name": "vm2"}\n'
+        mock_resource_service.execute_resource_graph_query.assert_not_called()
+
+    def test_query_stream_failure_before_first_row(self, client, mock_resource_service):
+        """Test that a query failing before any row is returned as a 500."""
+
+        async def _rows(query, subscriptions):
+            raise Exception("Query timeout")
+            yield
+
+        mock_resource_service.stream_resource_graph_query = MagicMock(side_effect=_rows)
+
+        response = client.post(
+            "/api/v1/resources/resource-graph/query",
+            json={"query": "Resources | limit 10"},
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 500
+        assert "Query execution failed" in response.json()["detail"]
+
+    def test_query_stream_failure_mid_stream(self, client, mock_resource_service):
+        """Test that a failure after the first row ends the stream with an error line."""
+
+        async def _rows(query, subscriptions):
+            yield {"name": "vm1"}
+            raise Exception("Query timeout")
+
+        mock_resource_service.stream_resource_graph_query = MagicMock(side_effect=_rows)
+
+        response = client.post(
+            "/api/v1/resources/resource-graph/query",
+            json={"query": "Resources | limit 10"},
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.text.splitlines() == [
+            '{"name": "vm1"}',
+            '{"error": "Query execution failed: Query timeout"}',
+        ]
+
 
 class TestResourceRouterIntegration:
     """Integration tests for resources router."""
@@ -183,6 +183,20 @@ class TestSearchEndpoint:
         assert response.status_code == 200
         assert mock_search_engine.search.call_args.kwargs["top"] == 25
 
+    def test_search_with_snippet_length(self, client, mock_search_engine, sample_search_results):
+        """Test that snippet_length truncates long content without touching engine results."""
+        mock_search_engine.search.return_value = sample_search_results
+
+        response = client.post(
+            "/api/v1/search",
+            json={"query": "test", "snippet_length": 9},
+        )
+
+        assert response.status_code == 200
+        contents = [r["content"] for r in response.json()["results"]]
+        assert contents == ["This is a...", "This is a..."]
+        assert sample_search_results.results[0].content == "This is a test Azure resource"
+
     def test_search_with_facets(self, client, mock_search_engine, sample_search_results):
         """Test search with facets included."""
         mock_search_engine.search.return_value = sample_search_results
@@ -434,6 +448,21 @@ class TestSearchRouterIntegration:
         assert data["total_count"] == 100
         assert len(data["results"]) == 100
 
+    def test_streamed_body_matches_response_model(self, client, mock_search_engine, sample_search_results):
+        """Test that the streamed body is a valid SearchResponse."""
+        from src.api.models.search import SearchResponse
+
+        mock_search_engine.search.return_value = sample_search_results
+
+        response = client.post("/api/v1/search", json={"query": "test"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        parsed = SearchResponse.model_validate_json(response.content)
+        assert [r.id for r in parsed.results] == ["test-1", "test-2"]
+        assert parsed.results[1].highlights is None
+        assert parsed.facets == sample_search_results.facets
+
     def test_complex_filters_and_facets(self, client, mock_search_engine, sample_search_results):
         """Test search with complex filters and facets."""
         response = client.post(
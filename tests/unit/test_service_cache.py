@@ -0,0 +1,64 @@
+"""Unit tests for the service-layer TTL cache."""
+
+from unittest.mock import patch
+
+from src.api.services.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_and_set(self):
+        """Test basic storage and retrieval."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.get("missing", "default") == "default"
+        assert "a" in cache
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        """Test that entries are dropped once their TTL elapses."""
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        with patch("src.api.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("src.api.services.cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") == 1
+        with patch("src.api.services.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
+
+    def test_caches_falsy_values(self):
+        """Test that falsy values are distinguishable from misses."""
+        cache = TTLCache()
+        cache.set("empty", [])
+
+        assert "empty" in cache
+        assert cache.get("empty", "miss") == []
+
+    def test_copy_isolates_callers(self):
+        """Test that copy=True hands out values callers cannot mutate in place."""
+        cache = TTLCache(copy=True)
+        value = {"tags": ["a"]}
+        cache.set("k", value)
+
+        value["tags"].append("b")
+        cache.get("k")["tags"].append("c")
+
+        assert cache.get("k") == {"tags": ["a"]}
@@ -0,0 +1,78 @@
+"""Unit tests for the shared Cosmos DB query helpers."""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from src.api.services.cosmos import partition_query_options, query_documents, query_first
+
+
+def _query_result(items):
+    """Build an async iterator over Cosmos query results."""
+
+    async def _iter():
+        for item in items:
+            yield item
+
+    return _iter()
+
+
+class TestPartitionQueryOptions:
+    """Tests for partition_query_options."""
+
+    def test_scopes_to_known_partition(self):
+        """Test that a pinned partition key field targets one partition."""
+        assert partition_query_options("/doc_type", {"doc_type": "terraform_resource"}) == {
+            "partition_key": "terraform_resource"
+        }
+
+    @pytest.mark.parametrize("path", [None, "/repo_url"])
+    def test_falls_back_to_cross_partition(self, path):
+        """Test that an unknown or unpinned partition key fans out."""
+        assert partition_query_options(path, {"doc_type": "terraform_resource"}) == {
+            "enable_cross_partition_query": True
+        }
+
+
+class TestQueryDocuments:
+    """Tests for query_documents."""
+
+    def test_passes_query_and_options(self):
+        """Test that the query, parameters and options reach query_items."""
+        container = MagicMock()
+        parameters = [{"name": "@address", "value": "a.b"}]
+
+        query_documents(
+            container, "SELECT * FROM c", parameters, "/doc_type", {"doc_type": "x"},
+            max_item_count=5,
+        )
+
+        container.query_items.assert_called_once_with(
+            query="SELECT * FROM c",
+            parameters=parameters,
+            partition_key="x",
+            max_item_count=5,
+        )
+
+
+class TestQueryFirst:
+    """Tests for query_first."""
+
+    @pytest.mark.asyncio
+    async def test_returns_first_document(self):
+        """Test that only the first matching document is returned."""
+        container = MagicMock()
+        container.query_items = Mock(return_value=_query_result([{"id": "1"}, {"id": "2"}]))
+
+        doc = await query_first(container, "SELECT * FROM c", [], None, {})
+
+        assert doc == {"id": "1"}
+        assert container.query_items.call_args.kwargs["max_item_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_match(self):
+        """Test that an empty result yields None."""
+        container = MagicMock()
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await query_first(container, "SELECT * FROM c", [], None, {}) is None
@@ -22,8 +22,9 @@ def mock_terraform_service():
     """Create a mock Terraform service."""
     from unittest.mock import MagicMock
     mock = AsyncMock()
-    # parse_plan is synchronous, not async
+    # parse_plan is synchronous, not async; parse_plan_async delegates to it
     mock.parse_plan = MagicMock()
+    mock.parse_plan_async = AsyncMock(side_effect=lambda plan_json: mock.parse_plan(plan_json))
     return mock
 
 
@@ -328,19 +329,40 @@ class TestGetTerraformPlan:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
+    def test_get_plan_etag_revalidation(self, client, mock_terraform_service, sample_terraform_plan):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        mock_terraform_service.get_plan.return_value = sample_terraform_plan
+
+        response = client.get("/api/v1/terraform/plans/plan-123")
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "private, max-age=30"
+
+        revalidated = client.get(
+            "/api/v1/terraform/plans/plan-123", headers={"If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
+        stale = client.get(
+            "/api/v1/terraform/plans/plan-123", headers={"If-None-Match": '"stale"'}
+        )
+        assert stale.status_code == 200
+        assert stale.json()["id"] == "plan-123"
+
 
 class TestAnalyzeTerraformPlan:
     """Tests for POST /terraform/plans/{plan_id}/analyze endpoint."""
 
     def test_analyze_plan_success(self, client, mock_terraform_service, sample_terraform_plan):
         """Test successful plan analysis."""
-        mock_terraform_service.get_plan.return_value = sample_terraform_plan
-        mock_terraform_service.analyze_plan.return_value = PlanAnalysis(
+        analysis = PlanAnalysis(
             summary="Plan will add 5, change 3, and destroy 1 resources.",
             risk_level="medium",
             key_changes=["CREATE: azurerm_virtual_machine.new_vm"],
             recommendations=["Review all resources marked for destruction carefully"],
         )
+        mock_terraform_service.get_and_analyze.return_value = (sample_terraform_plan, analysis)
 
         response = client.post("/api/v1/terraform/plans/plan-123/analyze")
 
@@ -353,13 +375,12 @@ class TestAnalyzeTerraformPlan:
         assert len(data["key_changes"]) > 0
         assert len(data["recommendations"]) > 0
 
-        # Verify service was called
-        mock_terraform_service.get_plan.assert_called_once_with("plan-123")
-        mock_terraform_service.analyze_plan.assert_called_once()
+        # Verify fetch and analysis happen in a single service call
+        mock_terraform_service.get_and_analyze.assert_called_once_with("plan-123")
 
     def test_analyze_plan_not_found(self, client, mock_terraform_service):
         """Test analyzing non-existent plan."""
-        mock_terraform_service.get_plan.return_value = None
+        mock_terraform_service.get_and_analyze.return_value = (None, None)
 
         response = client.post("/api/v1/terraform/plans/nonexistent/analyze")
 
@@ -380,13 +401,13 @@ class TestAnalyzeTerraformPlan:
             changes=[],
         )
 
-        mock_terraform_service.get_plan.return_value = high_risk_plan
-        mock_terraform_service.analyze_plan.return_value = PlanAnalysis(
+        analysis = PlanAnalysis(
             summary="Plan will destroy 10 resources.",
             risk_level="high",
             key_changes=["DESTROY: multiple resources"],
             recommendations=["Review all resources marked for destruction carefully"],
         )
+        mock_terraform_service.get_and_analyze.return_value = (high_risk_plan, analysis)
 
         response = client.post("/api/v1/terraform/plans/plan-456/analyze")
 
@@ -524,11 +545,14 @@ class TestTerraformRouterIntegration:
         # Setup mocks
         mock_terraform_service.list_resources.return_value = [sample_terraform_resource]
         mock_terraform_service.get_plan.return_value = sample_terraform_plan
-        mock_terraform_service.analyze_plan.return_value = PlanAnalysis(
-            summary="Test summary",
-            risk_level="low",
-            key_changes=["CREATE: test"],
-            recommendations=["Test recommendation"],
+        mock_terraform_service.get_and_analyze.return_value = (
+            sample_terraform_plan,
+            PlanAnalysis(
+                summary="Test summary",
+                risk_level="low",
+                key_changes=["CREATE: test"],
+                recommendations=["Test recommendation"],
+            ),
         )
 
         # 1. List resources
@@ -0,0 +1,564 @@
+"""Unit tests for TerraformService."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from azure.cosmos import exceptions as cosmos_exceptions
+
+from src.api.models.terraform import PlannedChange, TerraformPlan
+from src.api.services.terraform_service import (
+    MAX_PLAN_LIMIT,
+    MAX_RESOURCE_LIMIT,
+    PARSE_PLAN_THREAD_THRESHOLD,
+    TerraformService,
+    _changed_attributes,
+)
+
+
+def _query_result(items):
+    """Build an async iterator over Cosmos query results."""
+
+    async def _iter():
+        for item in items:
+            yield item
+
+    return _iter()
+
+
+@pytest.fixture
+def container():
+    """Create a mock Cosmos container."""
+    return MagicMock()
+
+
+@pytest.fixture
+def terraform_service(container):
+    """Create a TerraformService backed by a mock container."""
+    cosmos_client = MagicMock()
+    cosmos_client.get_database_client.return_value.get_container_client.return_value = container
+    return TerraformService(
+        cosmos_client=cosmos_client,
+        database_name="test-db",
+        container_name="test-container",
+    )
+
+
+@pytest.fixture
+def terraform_resource_doc():
+    """Sample Terraform resource document as stored in Cosmos DB."""
+    return {
+        "id": "tf-1",
+        "doc_type": "terraform_resource",
+        "address": "azurerm_virtual_machine.example",
+        "type": "azurerm_virtual_machine",
+        "name": "example",
+        "file_path": "infrastructure/compute.tf",
+        "line_number": 10,
+        "repo_url": "https://github.com/org/repo",
+        "branch": "main",
+        "provider": "azurerm",
+        "source_code": 'resource "azurerm_virtual_machine" "example" {}',
+    }
+
+
+class TestContainerCaching:
+    """Tests for container proxy reuse."""
+
+    @pytest.mark.asyncio
+    async def test_container_resolved_once(self, terraform_service, container):
+        """Test that repeated queries reuse the same container proxy."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await terraform_service.list_resources()
+        await terraform_service.list_plans()
+        await terraform_service.get_plan("plan-1")
+
+        terraform_service.cosmos_client.get_database_client.assert_called_once_with("test-db")
+
+
+class TestListResources:
+    """Tests for TerraformService.list_resources."""
+
+    @pytest.mark.asyncio
+    async def test_pushes_limit_into_query(self, terraform_service, container, terraform_resource_doc):
+        """Test that the limit is bound as TOP rather than applied in Python."""
+        container.query_items = Mock(return_value=_query_result([terraform_resource_doc]))
+
+        result = await terraform_service.list_resources(limit=25)
+
+        assert len(result) == 1
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["query"].startswith("SELECT TOP @limit")
+        assert {"name": "@limit", "value": 25} in kwargs["parameters"]
+        assert kwargs["max_item_count"] == 25
+
+    @pytest.mark.asyncio
+    async def test_filters_follow_composite_index_order(self, terraform_service, container):
+        """Test that filter predicates are emitted as repo_url, type, then file_path."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await terraform_service.list_resources(
+            repo_url="https://github.com/org/repo",
+            resource_type="azurerm_virtual_machine",
+            file_path="main.tf",
+        )
+
+        query = container.query_items.call_args.kwargs["query"]
+        where = query.split(" WHERE ", 1)[1]
+        assert where.index("c.repo_url") < where.index("c.type") < where.index("c.file_path =")
+        assert query.endswith("ORDER BY c.file_path")
+
+    @pytest.mark.asyncio
+    async def test_query_template_reused(self, terraform_service, container):
+        """Test that the same filter combination reuses the cached query text."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await terraform_service.list_resources(resource_type="azurerm_virtual_network")
+        first = container.query_items.call_args.kwargs["query"]
+        await terraform_service.list_resources(resource_type="azurerm_subnet")
+        second = container.query_items.call_args.kwargs["query"]
+
+        assert first is second
+        assert "@repo_url" not in first
+
+    @pytest.mark.asyncio
+    async def test_clamps_limit(self, terraform_service, container):
+        """Test that oversized limits are clamped server-side."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await terraform_service.list_resources(limit=10_000)
+
+        parameters = container.query_items.call_args.kwargs["parameters"]
+        assert {"name": "@limit", "value": MAX_RESOURCE_LIMIT} in parameters
+
+
+class TestGetResource:
+    """Tests for TerraformService.get_resource."""
+
+    @pytest.mark.asyncio
+    async def test_stops_after_first_row(self, terraform_service, container, terraform_resource_doc):
+        """Test that the first row is mapped without draining the query."""
+        consumed = []
+
+        async def _rows():
+            for doc in (terraform_resource_doc, {**terraform_resource_doc, "id": "tf-2"}):
+                consumed.append(doc)
+                yield doc
+
+        container.query_items = Mock(return_value=_rows())
+
+        result = await terraform_service.get_resource(
+            "azurerm_virtual_machine.example", "https://github.com/org/repo"
+        )
+
+        assert result.address == "azurerm_virtual_machine.example"
+        assert len(consumed) == 1
+        assert container.query_items.call_args.kwargs["max_item_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_found(self, terraform_service, container):
+        """Test that an empty result returns None."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await terraform_service.get_resource("missing", "https://github.com/org/repo") is None
+
+    @pytest.mark.asyncio
+    async def test_projects_mapped_fields_only(self, terraform_service, container):
+        """Test that the lookup selects one row and only the fields the model needs."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await terraform_service.get_resource("missing", "https://github.com/org/repo")
+
+        query = container.query_items.call_args.kwargs["query"]
+        assert query.startswith("SELECT TOP 1 c.address")
+        assert "*" not in query
+        assert "c.azure_resource_id" in query
+
+
+class TestListPartitionScoping:
+    """Tests for partition-scoped list queries."""
+
+    @pytest.mark.asyncio
+    async def test_repo_filter_targets_partition(self, terraform_service, container):
+        """Test that a repo_url filter scopes the query when repo_url is the partition key."""
+        terraform_service.partition_key_path = "/repo_url"
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await terraform_service.list_resources(repo_url="https://github.com/org/repo")
+        await terraform_service.list_plans(repo_url="https://github.com/org/repo")
+
+        for call in container.query_items.call_args_list:
+            assert call.kwargs["partition_key"] == "https://github.com/org/repo"
+            assert "enable_cross_partition_query" not in call.kwargs
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_fans_out(self, terraform_service, container):
+        """Test that a query without the partition key filter stays cross-partition."""
+        terraform_service.partition_key_path = "/repo_url"
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await terraform_service.list_resources()
+
+        assert container.query_items.call_args.kwargs["enable_cross_partition_query"] is True
+
+
+class TestListPlans:
+    """Tests for TerraformService.list_plans."""
+
+    @pytest.mark.asyncio
+    async def test_binds_filters_and_limit_as_parameters(self, terraform_service, container):
+        """Test that since/limit are pushed into the query instead of sliced in Python."""
+        container.query_items = Mock(return_value=_query_result([]))
+        since = datetime(2024, 1, 1, tzinfo=UTC)
+
+        await terraform_service.list_plans(
+            repo_url="https://github.com/org/repo", since=since, limit=5
+        )
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["query"].startswith("SELECT TOP @limit")
+        assert "OFFSET" not in kwargs["query"]
+        assert kwargs["query"].endswith("ORDER BY c.timestamp DESC")
+        assert "*" not in kwargs["query"]
+        assert "c.changes" in kwargs["query"]
+        assert {"name": "@limit", "value": 5} in kwargs["parameters"]
+        assert {"name": "@since", "value": since.isoformat()} in kwargs["parameters"]
+        assert kwargs["max_item_count"] == 5
+
+    @pytest.mark.asyncio
+    async def test_clamps_limit(self, terraform_service, container):
+        """Test that oversized limits are clamped server-side."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await terraform_service.list_plans(limit=500)
+
+        parameters = container.query_items.call_args.kwargs["parameters"]
+        assert {"name": "@limit", "value": MAX_PLAN_LIMIT} in parameters
+
+
+class TestGetAndAnalyze:
+    """Tests for TerraformService.get_and_analyze."""
+
+    @pytest.mark.asyncio
+    async def test_returns_plan_and_analysis(self, terraform_service, container):
+        """Test that a found plan is analyzed in the same call."""
+        container.query_items = Mock(
+            return_value=_query_result(
+                [
+                    {
+                        "id": "plan-1",
+                        "doc_type": "terraform_plan",
+                        "repo_url": "https://github.com/org/repo",
+                        "commit_sha": "abc123",
+                        "timestamp": "2024-01-15T10:30:00Z",
+                        "add": 1,
+                        "change": 0,
+                        "destroy": 0,
+                        "changes": [],
+                    }
+                ]
+            )
+        )
+
+        plan, analysis = await terraform_service.get_and_analyze("plan-1")
+
+        assert plan.id == "plan-1"
+        assert analysis.risk_level == "low"
+
+    @pytest.mark.asyncio
+    async def test_missing_plan(self, terraform_service, container):
+        """Test that a missing plan yields (None, None)."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        assert await terraform_service.get_and_analyze("missing") == (None, None)
+
+
+class TestGetPlanCache:
+    """Tests for cached plan lookups."""
+
+    @pytest.fixture
+    def plan_doc(self):
+        return {
+            "id": "plan-1",
+            "doc_type": "terraform_plan",
+            "repo_url": "https://github.com/org/repo",
+            "commit_sha": "abc123",
+            "timestamp": "2024-01-15T10:30:00Z",
+            "changes": [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_found_plan_cached(self, terraform_service, container, plan_doc):
+        """Test that a repeated lookup is served without querying again."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([plan_doc]))
+
+        first = await terraform_service.get_plan("plan-1")
+        second = await terraform_service.get_plan("plan-1")
+
+        assert first == second
+        assert first is not second
+        container.query_items.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_plan_not_cached(self, terraform_service, container):
+        """Test that a not-found result is looked up again on the next call."""
+        container.query_items = Mock(side_effect=lambda **_: _query_result([]))
+
+        await terraform_service.get_plan("missing")
+        await terraform_service.get_plan("missing")
+
+        assert container.query_items.call_count == 2
+
+
+class TestGetPlanPointRead:
+    """Tests for point-read plan lookups."""
+
+    @pytest.mark.asyncio
+    async def test_point_read_when_partition_key_derivable(self, terraform_service, container):
+        """Test that a derivable partition key turns the lookup into read_item."""
+        terraform_service.partition_key_path = "/doc_type"
+        container.read_item = AsyncMock(
+            return_value={
+                "id": "plan-1",
+                "doc_type": "terraform_plan",
+                "timestamp": "2024-01-15T10:30:00Z",
+            }
+        )
+        container.query_items = Mock()
+
+        plan = await terraform_service.get_plan("plan-1")
+
+        assert plan.id == "plan-1"
+        container.read_item.assert_awaited_once_with(item="plan-1", partition_key="terraform_plan")
+        container.query_items.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_point_read_not_found(self, terraform_service, container):
+        """Test that a missing item yields None."""
+        terraform_service.partition_key_path = "/id"
+        container.read_item = AsyncMock(
+            side_effect=cosmos_exceptions.CosmosResourceNotFoundError(message="missing")
+        )
+
+        assert await terraform_service.get_plan("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_point_read_rejects_other_doc_types(self, terraform_service, container):
+        """Test that an item with the same ID but another doc_type is ignored."""
+        terraform_service.partition_key_path = "/id"
+        container.read_item = AsyncMock(return_value={"id": "plan-1", "doc_type": "git_commit"})
+
+        assert await terraform_service.get_plan("plan-1") is None
+
+    @pytest.mark.asyncio
+    async def test_query_without_partition_key(self, terraform_service, container):
+        """Test that the lookup falls back to a cross-partition query."""
+        container.query_items = Mock(return_value=_query_result([]))
+
+        await terraform_service.get_plan("plan-1")
+
+        kwargs = container.query_items.call_args.kwargs
+        assert kwargs["enable_cross_partition_query"] is True
+        assert kwargs["max_item_count"] == 1
+
+
+class TestAnalyzePlan:
+    """Tests for TerraformService.analyze_plan."""
+
+    @pytest.fixture
+    def plan(self):
+        return TerraformPlan(
+            id="plan-1",
+            repo_url="https://github.com/org/repo",
+            branch="main",
+            commit_sha="abc123",
+            timestamp=datetime(2024, 1, 15, tzinfo=UTC),
+            add=1,
+            change=0,
+            destroy=0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_empty_plan(self, terraform_service, plan):
+        """Test that an empty plan yields a low-risk analysis with nothing to review."""
+        analysis = await terraform_service.analyze_plan(plan.model_copy(update={"add": 0}))
+
+        assert analysis.summary == "Plan will add 0, change 0, and destroy 0 resources."
+        assert analysis.risk_level == "low"
+        assert analysis.key_changes == []
+        assert analysis.recommendations == []
+
+    @pytest.mark.asyncio
+    async def test_key_change_labels(self, terraform_service, plan):
+        """Test that key changes use upper-case action labels, including unknown actions."""
+        plan = plan.model_copy(
+            update={
+                "changes": [
+                    PlannedChange(address="a.b", action="replace", resource_type="a", summary=""),
+                    PlannedChange(address="c.d", action="import", resource_type="c", summary=""),
+                ]
+            }
+        )
+
+        analysis = await terraform_service.analyze_plan(plan)
+
+        assert analysis.key_changes == ["REPLACE: a.b", "IMPORT: c.d"]
+
+    @pytest.mark.asyncio
+    async def test_risk_follows_plan_content(self, terraform_service, plan):
+        """Test that risk level is derived from the plan's change counts."""
+        first = await terraform_service.analyze_plan(plan)
+        second = await terraform_service.analyze_plan(plan.model_copy(update={"destroy": 3}))
+
+        assert first.risk_level == "low"
+        assert second.risk_level == "high"
+
+
+class TestChangedAttributes:
+    """Tests for before/after attribute diffing."""
+
+    def test_changed_added_and_removed_keys(self):
+        """Test that changed, added and removed keys are all reported in order."""
+        before = {"name": "vm", "size": "B1s", "zone": "1", "tags": {"a": 1}}
+        after = {"name": "vm", "size": "B2s", "tags": {"a": 1}, "sku": "Standard"}
+
+        assert _changed_attributes(before, after) == ["size", "sku", "zone"]
+
+    def test_missing_key_equals_none(self):
+        """Test that a key missing on one side matches an explicit None."""
+        assert _changed_attributes({"a": None}, {"b": None}) == []
+
+    def test_parse_plan_uses_diff(self, terraform_service):
+        """Test that parse_plan reports changed attributes for updates only."""
+        plan = terraform_service.parse_plan(
+            {
+                "resource_changes": [
+                    {
+                        "address": "azurerm_storage_account.sa",
+                        "type": "azurerm_storage_account",
+                        "change": {
+                            "actions": ["update"],
+                            "before": {"tier": "Standard", "name": "sa"},
+                            "after": {"tier": "Premium", "name": "sa"},
+                        },
+                    },
+                    {
+                        "address": "azurerm_resource_group.rg",
+                        "type": "azurerm_resource_group",
+                        "change": {"actions": ["create"], "before": None, "after": {"name": "rg"}},
+                    },
+                ]
+            }
+        )
+
+        assert plan.changes[0].changed_attributes == ["tier"]
+        assert plan.changes[0].summary == "Update azurerm_storage_account resource (changing: tier)"
+        assert plan.changes[1].changed_attributes == []
+
+
+class TestParsePlanActions:
+    """Tests for parse_plan action classification."""
+
+    @pytest.mark.parametrize(
+        "actions, expected, counts",
+        [
+            (["create"], "create", (1, 0, 0)),
+            (["update"], "update", (0, 1, 0)),
+            (["delete"], "delete", (0, 0, 1)),
+            (["delete", "create"], "replace", (1, 0, 1)),
+            (["create", "delete"], "replace", (1, 0, 1)),
+        ],
+    )
+    def test_classifies_actions(self, terraform_service, actions, expected, counts):
+        """Test that each Terraform action list maps to one action and its counts."""
+        plan = terraform_service.parse_plan(
+            {"resource_changes": [{"address": "a.b", "type": "a", "change": {"actions": actions}}]}
+        )
+
+        assert plan.changes[0].action == expected
+        assert (plan.add, plan.change, plan.destroy) == counts
+
+    @pytest.mark.parametrize("actions", [["no-op"], ["read"], []])
+    def test_skips_non_changes(self, terraform_service, actions):
+        """Test that no-op and read entries are left out of the parsed plan."""
+        plan = terraform_service.parse_plan(
+            {"resource_changes": [{"address": "a.b", "type": "a", "change": {"actions": actions}}]}
+        )
+
+        assert plan.changes == []
+        assert (plan.add, plan.change, plan.destroy) == (0, 0, 0)
+
+
+class TestParsePlanAsync:
+    """Tests for TerraformService.parse_plan_async."""
+
+    @staticmethod
+    def _plan(count):
+        return {
+            "resource_changes": [
+                {"address": f"a.b{i}", "type": "a", "change": {"actions": ["create"]}}
+                for i in range(count)
+            ]
+        }
+
+    @pytest.mark.asyncio
+    async def test_small_plan_parsed_inline(self, terraform_service):
+        """Test that small plans skip the threadpool hand-off."""
+        with patch("src.api.services.terraform_service.asyncio.to_thread") as to_thread:
+            plan = await terraform_service.parse_plan_async(self._plan(2))
+
+        to_thread.assert_not_called()
+        assert plan.add == 2
+
+    @pytest.mark.asyncio
+    async def test_large_plan_parsed_on_thread(self, terraform_service):
+        """Test that large plans are parsed off the event loop."""
+        plan_json = self._plan(PARSE_PLAN_THREAD_THRESHOLD)
+        with patch(
+            "src.api.services.terraform_service.asyncio.to_thread",
+            new=AsyncMock(side_effect=lambda fn, *args: fn(*args)),
+        ) as to_thread:
+            plan = await terraform_service.parse_plan_async(plan_json)
+
+        to_thread.assert_awaited_once_with(terraform_service.parse_plan, plan_json)
+        assert plan.add == PARSE_PLAN_THREAD_THRESHOLD
+
+    @pytest.mark.asyncio
+    async def test_invalid_plan_raises_value_error(self, terraform_service):
+        """Test that parse errors surface the same way as parse_plan."""
+        with pytest.raises(ValueError):
+            await terraform_service.parse_plan_async({"resource_changes": [None]})
+
+
+class TestMapping:
+    """Tests for mapping Cosmos documents to models."""
+
+    def test_resource_matches_validated_model(self, terraform_service, terraform_resource_doc):
+        """Test that mapped resources serialize like validated models."""
+        resource = terraform_service._map_to_terraform_resource(terraform_resource_doc)
+
+        assert resource.module_path is None
+        assert resource.dependencies == []
+        assert resource.model_dump(mode="json") == type(resource).model_validate(
+            resource.model_dump()
+        ).model_dump(mode="json")
+
+    def test_plan_matches_validated_model(self, terraform_service):
+        """Test that mapped plans and their changes serialize like validated models."""
+        plan = terraform_service._map_to_terraform_plan(
+            {
+                "id": "plan-1",
+                "repo_url": "https://github.com/org/repo",
+                "commit_sha": "abc123",
+                "timestamp": "2024-01-15T10:30:00Z",
+                "add": 1,
+                "changes": [{"address": "a.b", "action": "create", "resource_type": "a"}],
+            }
+        )
+
+        assert plan.timestamp == datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+        assert plan.changes[0].changed_attributes == []
+        assert plan.model_dump(mode="json") == TerraformPlan.model_validate(
+            plan.model_dump()
+        ).model_dump(mode="json")
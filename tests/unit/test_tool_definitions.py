@@ -4,6 +4,7 @@ import pytest
 from src.api.tools.definitions import (
     TOOL_DEFINITIONS,
     get_tool_definitions,
+    get_tool_definitions_json,
     get_tool_by_name,
     list_tool_names,
     validate_tool_call,
@@ -48,6 +49,12 @@ class TestToolDefinitions:
                     f"Required param '{param}' not in properties for tool '{tool['name']}'"
                 )
 
+    def test_identical_parameter_schemas_are_shared(self):
+        """Test that repeated parameter schemas reuse one object."""
+        terraform = get_tool_by_name("get_terraform_resource")["parameters"]["properties"]
+        commit = get_tool_by_name("get_commit_details")["parameters"]["properties"]
+        assert terraform["repo_url"] is commit["repo_url"]
+
     def test_parameter_descriptions_exist(self):
         """Test that all parameters have descriptions."""
         for tool in TOOL_DEFINITIONS:
@@ -75,6 +82,14 @@ class TestGetToolDefinitions:
         """Test that get_tool_definitions returns TOOL_DEFINITIONS."""
         assert get_tool_definitions() == TOOL_DEFINITIONS
 
+    def test_json_payload_matches_definitions(self):
+        """Test that the pre-serialized payload decodes to TOOL_DEFINITIONS."""
+        import json
+
+        payload = get_tool_definitions_json()
+        assert json.loads(payload) == TOOL_DEFINITIONS
+        assert payload is get_tool_definitions_json()
+
 
 class TestGetToolByName:
     """Tests for get_tool_by_name function."""
@@ -158,6 +173,12 @@ class TestValidateToolCall:
         assert error is not None
         assert "query" in error.lower()
 
+    def test_validate_reports_first_missing_param_in_schema_order(self):
+        """Test that the first missing required parameter is reported deterministically."""
+        is_valid, error = validate_tool_call("get_commit_details", {})
+        assert is_valid is False
+        assert error == "Missing required parameter: sha"
+
     def test_validate_unknown_tool(self):
         """Test validating a call to an unknown tool."""
         is_valid, error = validate_tool_call(
@@ -199,6 +220,53 @@ class TestValidateToolCall:
         assert is_valid is True
         assert error is None
 
+    @pytest.mark.parametrize(
+        "name, arguments, error",
+        [
+            (
+                "search_infrastructure",
+                {"query": 42},
+                "Invalid type for parameter query: expected string",
+            ),
+            (
+                "search_infrastructure",
+                {"query": "vms", "top": True},
+                "Invalid type for parameter top: expected integer",
+            ),
+            (
+                "get_resource_dependencies",
+                {"resource_id": "/subscriptions/xxx", "direction": "sideways"},
+                "Invalid value for parameter direction: must be one of in, out, both",
+            ),
+            (
+                "query_resource_graph",
+                {"query": "Resources", "subscriptions": "sub-1"},
+                "Invalid type for parameter subscriptions: expected array",
+            ),
+            (
+                "query_resource_graph",
+                {"query": "Resources", "subscriptions": ["sub-1", 2]},
+                "Invalid item in parameter subscriptions: expected string",
+            ),
+        ],
+    )
+    def test_validate_rejects_schema_violations(self, name, arguments, error):
+        """Test that argument types, enums and array items are checked against the schema."""
+        assert validate_tool_call(name, arguments) == (False, error)
+
+    def test_validate_accepts_typed_arguments(self):
+        """Test that well-typed optional arguments pass validation."""
+        assert validate_tool_call(
+            "get_git_history",
+            {"repo_url": "https://github.com/org/repo", "terraform_only": True, "limit": 5},
+        ) == (True, None)
+
+    def test_validate_unexpected_parameter_without_required(self):
+        """Test that tools with no required parameters still reject unknown ones."""
+        is_valid, error = validate_tool_call("list_subscriptions", {"bogus": 1})
+        assert is_valid is False
+        assert error == "Unexpected parameters: bogus"
+
 
 class TestToolCoverage:
     """Tests to verify tool coverage matches API endpoints."""
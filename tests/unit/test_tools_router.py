@@ -104,6 +104,18 @@ class TestListTools:
         assert "get_terraform_plan" in tool_names
         assert "get_git_history" in tool_names
 
+    def test_list_tools_etag_revalidation(self, client):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        response = client.get("/api/v1/tools")
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "public, max-age=3600"
+
+        revalidated = client.get("/api/v1/tools", headers={"If-None-Match": etag})
+
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+
 
 class TestExecuteSearchInfrastructure:
     """Tests for executing search_infrastructure tool."""
@@ -372,7 +384,7 @@ class TestExecuteTerraformTools:
         """Test executing analyze_terraform_plan tool."""
         from datetime import datetime, timezone
 
-        mock_terraform_service.get_plan.return_value = TerraformPlan(
+        plan = TerraformPlan(
             id="plan-123",
             repo_url="https://github.com/example/infra",
             branch="main",
@@ -384,12 +396,13 @@ class TestExecuteTerraformTools:
             changes=[],
         )
 
-        mock_terraform_service.analyze_plan.return_value = PlanAnalysis(
+        analysis = PlanAnalysis(
             summary="Plan will create 5 resources",
             risk_level="medium",
             key_changes=["Create VMs", "Update networking"],
             recommendations=["Review VM sizes", "Check network security groups"],
         )
+        mock_terraform_service.get_and_analyze.return_value = (plan, analysis)
 
         response = client.post(
             "/api/v1/tools/execute",
@@ -421,7 +434,7 @@ class TestExecuteGitTools:
                 message="Update networking",
                 author_name="John Doe",
                 author_email="john@example.com",
-                commit_date=datetime.now(timezone.utc),
+                commit_date=datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc),
                 files_changed=[],
                 terraform_files=[],
                 has_terraform_changes=False,
@@ -440,6 +453,8 @@ class TestExecuteGitTools:
         data = response.json()
         assert data["error"] is None
         assert isinstance(data["result"], list)
+        assert data["result"][0]["sha"] == "abc123def456"
+        assert data["result"][0]["commit_date"] == "2024-01-15T10:30:00Z"
 
     def test_execute_get_commit_details(self, client, mock_git_service):
         """Test executing get_commit_details tool."""
@@ -483,6 +498,49 @@ class TestExecuteGitTools:
         assert data["result"]["sha"] == "abc123def456"
 
 
+class TestToolResultSerialization:
+    """Tests that tool results are left for the response model to serialize."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "tool_name,service_attr,method,arguments",
+        [
+            ("get_git_history", "git_service", "list_commits", {}),
+            ("get_resource_terraform", "resource_service", "get_terraform_for_resource", {"resource_id": "x"}),
+            ("get_resource_dependencies", "resource_service", "get_dependencies", {"resource_id": "x"}),
+            ("list_terraform_resources", "terraform_service", "list_resources", {}),
+        ],
+    )
+    async def test_list_results_not_dumped_per_item(
+        self,
+        tool_name,
+        service_attr,
+        method,
+        arguments,
+        mock_search_engine,
+        mock_resource_service,
+        mock_terraform_service,
+        mock_git_service,
+    ):
+        """Test that list-returning handlers pass the service result through unchanged."""
+        from src.api.dependencies import Services
+        from src.api.routers.tools import _execute_tool
+
+        services = Services(
+            search_engine=mock_search_engine,
+            resource_service=mock_resource_service,
+            terraform_service=mock_terraform_service,
+            git_service=mock_git_service,
+        )
+        items = [MagicMock()]
+        getattr(getattr(services, service_attr), method).return_value = items
+
+        result = await _execute_tool(tool_name, arguments, services)
+
+        assert result is items
+        items[0].model_dump.assert_not_called()
+
+
 class TestToolValidation:
     """Tests for tool call validation."""
 
@@ -532,6 +590,239 @@ class TestToolValidation:
         assert data["error"] is not None
         assert "unexpected" in data["error"].lower()
 
+    def test_every_defined_tool_has_handler(self):
+        """Test that the dispatch table covers every tool definition."""
+        from src.api.routers.tools import _HANDLERS
+        from src.api.tools.definitions import TOOL_DEFINITIONS
+
+        assert set(_HANDLERS) == {tool["name"] for tool in TOOL_DEFINITIONS}
+
+
+class TestExecuteBatch:
+    """Tests for POST /tools/execute_batch endpoint."""
+
+    @staticmethod
+    def _resource(resource_id):
+        return AzureResource(
+            id=resource_id,
+            name=resource_id.rsplit("/", 1)[-1],
+            type="Microsoft.Compute/virtualMachines",
+            resource_group="rg",
+            subscription_id="xxx",
+            subscription_name="Production",
+            location="canadaeast",
+        )
+
+    def test_results_in_request_order(self, client, mock_resource_service, mock_terraform_service):
+        """Test that mixed calls run and come back in request order."""
+        mock_resource_service.list_subscriptions.return_value = [{"id": "sub-1"}]
+        mock_terraform_service.get_plan.return_value = None
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_terraform_plan", "arguments": {"plan_id": "missing"}},
+                    {"name": "list_subscriptions", "arguments": {}},
+                    {"name": "unknown_tool", "arguments": {}},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["name"] for r in results] == [
+            "get_terraform_plan",
+            "list_subscriptions",
+            "unknown_tool",
+        ]
+        assert results[0]["error"] == "Plan not found: missing"
+        assert results[1]["result"] == {"subscriptions": [{"id": "sub-1"}]}
+        assert "unknown tool" in results[2]["error"].lower()
+
+    def test_coalesces_resource_details(self, client, mock_resource_service):
+        """Test that a burst of resource lookups is served by one batched query."""
+        mock_resource_service.get_resources.return_value = {
+            "/subscriptions/xxx/vm-1": self._resource("/subscriptions/xxx/vm-1"),
+        }
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_resource_details", "arguments": {"resource_id": "/subscriptions/xxx/vm-1"}},
+                    {"name": "get_resource_details", "arguments": {"resource_id": "/subscriptions/xxx/vm-2"}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert results[0]["result"]["name"] == "vm-1"
+        assert results[1]["error"] == "Resource not found: /subscriptions/xxx/vm-2"
+        mock_resource_service.get_resources.assert_awaited_once_with(
+            ["/subscriptions/xxx/vm-1", "/subscriptions/xxx/vm-2"]
+        )
+        mock_resource_service.get_resource.assert_not_called()
+
+    def test_coalesces_resource_terraform(self, client, mock_resource_service):
+        """Test that a burst of Terraform lookups is served by one batched call."""
+        mock_resource_service.get_terraform_for_resources.return_value = {
+            "/subscriptions/xxx/vm-1": [
+                TerraformLink(
+                    address="azurerm_virtual_machine.vm1",
+                    type="azurerm_virtual_machine",
+                    file_path="main.tf",
+                    line_number=1,
+                    repo_url="https://github.com/example/infra",
+                    branch="main",
+                    source_code="resource \"azurerm_virtual_machine\" \"vm1\" {}",
+                )
+            ],
+        }
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_resource_terraform", "arguments": {"resource_id": "/subscriptions/xxx/vm-1"}},
+                    {"name": "get_resource_terraform", "arguments": {"resource_id": "/subscriptions/xxx/vm-2"}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert results[0]["result"][0]["address"] == "azurerm_virtual_machine.vm1"
+        assert results[1]["result"] == []
+        mock_resource_service.get_terraform_for_resources.assert_awaited_once()
+        mock_resource_service.get_terraform_for_resource.assert_not_called()
+
+    def test_coalesces_resource_types_summary(self, client, mock_resource_service):
+        """Test that summaries for several subscriptions are fetched in one call."""
+        mock_resource_service.get_resource_types_summaries.return_value = {
+            "sub-1": [{"type": "Microsoft.Compute/virtualMachines", "count_": 2}],
+            None: [],
+        }
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_resource_types_summary", "arguments": {"subscription_id": "sub-1"}},
+                    {"name": "get_resource_types_summary", "arguments": {}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert results[0]["result"]["resource_types"][0]["count_"] == 2
+        assert results[1]["result"] == {"resource_types": []}
+        mock_resource_service.get_resource_types_summaries.assert_awaited_once_with(["sub-1", None])
+        mock_resource_service.get_resource_types_summary.assert_not_called()
+
+    def test_coalesces_commit_details_per_repo(self, client, mock_git_service):
+        """Test that commit lookups are grouped into one query per repository."""
+        from datetime import datetime, timezone
+
+        commit = GitCommit(
+            sha="abc123def456",
+            short_sha="abc123d",
+            repo_url="https://github.com/example/infra",
+            branch="main",
+            message="Update networking",
+            author_name="John Doe",
+            author_email="john@example.com",
+            commit_date=datetime(2024, 1, 15, tzinfo=timezone.utc),
+        )
+        mock_git_service.get_commits.side_effect = lambda shas, repo_url: (
+            {"abc123d": commit} if repo_url == "https://github.com/example/infra" else {}
+        )
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_commit_details", "arguments": {"sha": "abc123d", "repo_url": "https://github.com/example/infra"}},
+                    {"name": "get_commit_details", "arguments": {"sha": "fff0000", "repo_url": "https://github.com/example/infra"}},
+                    {"name": "get_commit_details", "arguments": {"sha": "abc123d", "repo_url": "https://github.com/example/other"}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert results[0]["result"]["sha"] == "abc123def456"
+        assert results[1]["error"] == "Commit not found: fff0000 in https://github.com/example/infra"
+        assert results[2]["error"] == "Commit not found: abc123d in https://github.com/example/other"
+        assert mock_git_service.get_commits.call_count == 2
+
+    def test_batched_lookup_failure_reported_per_call(self, client, mock_resource_service):
+        """Test that a failed batched query surfaces as an error on each call."""
+        mock_resource_service.get_resources.side_effect = Exception("Database error")
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_resource_details", "arguments": {"resource_id": "a"}},
+                    {"name": "get_resource_details", "arguments": {"resource_id": "b"}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert all("Database error" in r["error"] for r in results)
+
+    def test_identical_calls_execute_once(self, client, mock_terraform_service):
+        """Test that duplicate calls in a batch share one execution."""
+        mock_terraform_service.get_plan.return_value = None
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_terraform_plan", "arguments": {"plan_id": "plan-1"}},
+                    {"name": "list_subscriptions", "arguments": {}},
+                    {"name": "get_terraform_plan", "arguments": {"plan_id": "plan-1"}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert results[0] == results[2]
+        assert results[0]["error"] == "Plan not found: plan-1"
+        mock_terraform_service.get_plan.assert_awaited_once_with("plan-1")
+
+    def test_duplicate_lookups_not_coalesced_twice(self, client, mock_resource_service):
+        """Test that duplicate IDs are deduplicated before batching."""
+        mock_resource_service.get_resource.return_value = self._resource("/subscriptions/xxx/vm-1")
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [
+                    {"name": "get_resource_details", "arguments": {"resource_id": "/subscriptions/xxx/vm-1"}},
+                    {"name": "get_resource_details", "arguments": {"resource_id": "/subscriptions/xxx/vm-1"}},
+                ]
+            },
+        )
+
+        results = response.json()["results"]
+        assert results[0]["result"]["name"] == results[1]["result"]["name"] == "vm-1"
+        mock_resource_service.get_resource.assert_awaited_once()
+        mock_resource_service.get_resources.assert_not_called()
+
+    def test_rejects_oversized_batch(self, client):
+        """Test that batches above the limit are rejected."""
+        from src.api.routers.tools import MAX_BATCH_SIZE
+
+        response = client.post(
+            "/api/v1/tools/execute_batch",
+            json={
+                "calls": [{"name": "list_subscriptions", "arguments": {}}] * (MAX_BATCH_SIZE + 1)
+            },
+        )
+
+        assert response.status_code == 422
+
 
 class TestErrorHandling:
     """Tests for error handling."""